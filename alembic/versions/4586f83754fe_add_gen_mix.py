@@ -0,0 +1,72 @@
+"""Add gen_mix
+
+Revision ID: 4586f83754fe
+Revises: 0fc409310dd0
+Create Date: 2026-10-18 09:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4586f83754fe'
+down_revision: Union[str, Sequence[str], None] = '0fc409310dd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Source columns as of this revision
+SOURCE_NAMES = ['coal', 'hydro', 'natural_gas', 'nuclear', 'other', 'power_storage', 'solar', 'wind']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('gen_mix',
+    sa.Column('timestamp', sa.String(), nullable=False),
+    *[sa.Column(name, sa.Float(), nullable=False) for name in SOURCE_NAMES],
+    sa.Column('gen_total', sa.Float(), nullable=False),
+    sa.Column('gen_renewables', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_gen_mix_id'), 'gen_mix', ['id'], unique=False)
+    op.create_index(op.f('ix_gen_mix_timestamp'), 'gen_mix', ['timestamp'], unique=True)
+
+    # Backfill: pivot gen_source rows into one row per gen_instant
+    gen_instant = sa.table('gen_instant', sa.column('id'), sa.column('timestamp'))
+    gen_source = sa.table('gen_source', sa.column('gen'), sa.column('source_id'), sa.column('gen_instant_id'))
+    source = sa.table('source', sa.column('id'), sa.column('name'), sa.column('renewable'))
+    gen_mix = sa.table('gen_mix', sa.column('timestamp'), *[sa.column(name) for name in SOURCE_NAMES],
+                       sa.column('gen_total'), sa.column('gen_renewables'),
+                       sa.column('created_at'), sa.column('updated_at'))
+
+    pivot = (
+        sa.select(
+            gen_instant.c.timestamp,
+            *[sa.func.coalesce(sa.func.sum(sa.case((source.c.name == name, gen_source.c.gen), else_=0.0)), 0.0)
+              for name in SOURCE_NAMES],
+            sa.func.coalesce(sa.func.sum(gen_source.c.gen), 0.0),
+            sa.func.coalesce(sa.func.sum(sa.case((source.c.renewable, gen_source.c.gen), else_=0.0)), 0.0),
+            sa.func.current_timestamp(),
+            sa.func.current_timestamp(),
+        )
+        .select_from(
+            gen_instant
+            .join(gen_source, gen_source.c.gen_instant_id == gen_instant.c.id)
+            .join(source, source.c.id == gen_source.c.source_id)
+        )
+        .group_by(gen_instant.c.timestamp)
+    )
+    op.execute(gen_mix.insert().from_select(
+        ['timestamp', *SOURCE_NAMES, 'gen_total', 'gen_renewables', 'created_at', 'updated_at'], pivot
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_gen_mix_timestamp'), table_name='gen_mix')
+    op.drop_index(op.f('ix_gen_mix_id'), table_name='gen_mix')
+    op.drop_table('gen_mix')
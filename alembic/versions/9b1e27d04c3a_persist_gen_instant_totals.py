@@ -0,0 +1,63 @@
+"""Persist gen_instant totals
+
+Revision ID: 9b1e27d04c3a
+Revises: 4586f83754fe
+Create Date: 2026-10-18 10:03:47.102594
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e27d04c3a'
+down_revision: Union[str, Sequence[str], None] = '4586f83754fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('gen_instant', sa.Column('gen_total', sa.Float(), nullable=True))
+    op.add_column('gen_instant', sa.Column('gen_renewables', sa.Float(), nullable=True))
+    op.add_column('gen_instant', sa.Column('percentage_renewable', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_gen_instant_gen_total'), 'gen_instant', ['gen_total'], unique=False)
+    op.create_index(op.f('ix_gen_instant_gen_renewables'), 'gen_instant', ['gen_renewables'], unique=False)
+    op.create_index(op.f('ix_gen_instant_percentage_renewable'), 'gen_instant', ['percentage_renewable'], unique=False)
+
+    # Backfill from gen_source
+    gen_instant = sa.table('gen_instant', sa.column('id'), sa.column('gen_total'), sa.column('gen_renewables'),
+                           sa.column('percentage_renewable'))
+    gen_source = sa.table('gen_source', sa.column('gen'), sa.column('source_id'), sa.column('gen_instant_id'))
+    source = sa.table('source', sa.column('id'), sa.column('renewable'))
+
+    gen_total = (
+        sa.select(sa.func.coalesce(sa.func.sum(gen_source.c.gen), 0.0))
+        .where(gen_source.c.gen_instant_id == gen_instant.c.id)
+        .scalar_subquery()
+    )
+    gen_renewables = (
+        sa.select(sa.func.coalesce(sa.func.sum(gen_source.c.gen), 0.0))
+        .select_from(gen_source.join(source, source.c.id == gen_source.c.source_id))
+        .where(gen_source.c.gen_instant_id == gen_instant.c.id, source.c.renewable)
+        .scalar_subquery()
+    )
+    op.execute(gen_instant.update().values(gen_total=gen_total, gen_renewables=gen_renewables))
+    op.execute(gen_instant.update().values(
+        percentage_renewable=sa.case(
+            (gen_instant.c.gen_total != 0, gen_instant.c.gen_renewables / gen_instant.c.gen_total * 100),
+            else_=0.0,
+        )
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_gen_instant_percentage_renewable'), table_name='gen_instant')
+    op.drop_index(op.f('ix_gen_instant_gen_renewables'), table_name='gen_instant')
+    op.drop_index(op.f('ix_gen_instant_gen_total'), table_name='gen_instant')
+    with op.batch_alter_table('gen_instant') as batch_op:
+        batch_op.drop_column('percentage_renewable')
+        batch_op.drop_column('gen_renewables')
+        batch_op.drop_column('gen_total')
@@ -0,0 +1,34 @@
+"""Add app_state for cross-process coordination
+
+Revision ID: a3d9e6c1b7f4
+Revises: f2b7c4e9a013
+Create Date: 2026-10-18 15:02:31.518204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6c1b7f4'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c4e9a013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'app_state',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('owner', sa.String(), nullable=True),
+        sa.Column('expires_at', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('app_state')
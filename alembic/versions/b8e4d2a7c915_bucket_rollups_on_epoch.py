@@ -0,0 +1,91 @@
+"""Bucket gen rollups on UTC epoch periods
+
+Revision ID: b8e4d2a7c915
+Revises: a3d9e6c1b7f4
+Create Date: 2026-10-18 16:48:02.113870
+
+"""
+from datetime import datetime, UTC
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2a7c915'
+down_revision: Union[str, Sequence[str], None] = 'a3d9e6c1b7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Source columns as of this revision
+SOURCE_NAMES = ['coal', 'hydro', 'natural_gas', 'nuclear', 'other', 'power_storage', 'solar', 'wind']
+ROLLUP_STATS = ['sum', 'min', 'max']
+
+# Table name -> (bucket seconds, length of the timestamp prefix previously used as bucket)
+ROLLUPS = {'gen_rollup_hourly': (3600, 13), 'gen_rollup_daily': (86400, 10)}
+
+gen_mix = sa.table('gen_mix', sa.column('timestamp'), sa.column('epoch'), sa.column('gen_total'),
+                   sa.column('gen_renewables'), *[sa.column(name) for name in SOURCE_NAMES])
+
+
+def _aggregates() -> dict:
+    aggregates = {
+        'count': sa.func.count(),
+        'gen_total_sum': sa.func.sum(gen_mix.c.gen_total),
+        'gen_renewables_sum': sa.func.sum(gen_mix.c.gen_renewables),
+    }
+    for name in SOURCE_NAMES:
+        for stat in ROLLUP_STATS:
+            aggregates[f'{name}_{stat}'] = getattr(sa.func, stat)(gen_mix.c[name])
+    return aggregates
+
+
+def _rollup_table(table_name: str, keys) -> sa.TableClause:
+    return sa.table(table_name, *[sa.column(key) for key in dict.fromkeys(('bucket', 'last_timestamp', 'created_at', *keys))])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    latest = gen_mix.alias('latest')
+    for table_name, (seconds, _) in ROLLUPS.items():
+        start = gen_mix.c.epoch - gen_mix.c.epoch % seconds
+        aggregates = _aggregates()
+        grouped = sa.select(
+            start.label('start'), sa.func.max(gen_mix.c.epoch).label('last_epoch'),
+            *[value.label(key) for key, value in aggregates.items()],
+        ).group_by(start).subquery()
+        last_timestamp = (
+            sa.select(latest.c.timestamp).where(latest.c.epoch == grouped.c.last_epoch).limit(1).scalar_subquery()
+        )
+        rows = bind.execute(sa.select(grouped, last_timestamp.label('last_timestamp'))).mappings().all()
+
+        rollup = _rollup_table(table_name, aggregates)
+        bind.execute(rollup.delete())
+        if rows:
+            now = datetime.now(UTC)
+            bind.execute(rollup.insert(), [
+                {
+                    'bucket': datetime.fromtimestamp(row['start'], UTC).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'last_timestamp': row['last_timestamp'],
+                    'created_at': now,
+                    **{key: row[key] for key in aggregates},
+                }
+                for row in rows
+            ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, (_, bucket_length) in ROLLUPS.items():
+        bucket = sa.func.substr(gen_mix.c.timestamp, 1, bucket_length)
+        aggregates = {
+            'bucket': bucket,
+            'last_timestamp': sa.func.max(gen_mix.c.timestamp),
+            'created_at': sa.func.current_timestamp(),
+            **_aggregates(),
+        }
+
+        rollup = _rollup_table(table_name, aggregates)
+        op.execute(rollup.delete())
+        op.execute(rollup.insert().from_select(list(aggregates), sa.select(*aggregates.values()).group_by(bucket)))
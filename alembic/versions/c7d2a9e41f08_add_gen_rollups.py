@@ -0,0 +1,72 @@
+"""Add hourly and daily gen rollups
+
+Revision ID: c7d2a9e41f08
+Revises: 9b1e27d04c3a
+Create Date: 2026-10-18 11:27:15.730114
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2a9e41f08'
+down_revision: Union[str, Sequence[str], None] = '9b1e27d04c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Source columns as of this revision
+SOURCE_NAMES = ['coal', 'hydro', 'natural_gas', 'nuclear', 'other', 'power_storage', 'solar', 'wind']
+ROLLUP_STATS = ['sum', 'min', 'max']
+
+# Table name -> length of the timestamp prefix that identifies a bucket
+ROLLUPS = {'gen_rollup_hourly': 13, 'gen_rollup_daily': 10}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    gen_mix = sa.table('gen_mix', sa.column('timestamp'), sa.column('gen_total'), sa.column('gen_renewables'),
+                       *[sa.column(name) for name in SOURCE_NAMES])
+
+    for table_name, bucket_length in ROLLUPS.items():
+        op.create_table(table_name,
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('last_timestamp', sa.String(), nullable=False),
+        sa.Column('gen_total_sum', sa.Float(), nullable=False),
+        sa.Column('gen_renewables_sum', sa.Float(), nullable=False),
+        *[sa.Column(f'{name}_{stat}', sa.Float(), nullable=False) for name in SOURCE_NAMES for stat in ROLLUP_STATS],
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f(f'ix_{table_name}_id'), table_name, ['id'], unique=False)
+        op.create_index(op.f(f'ix_{table_name}_bucket'), table_name, ['bucket'], unique=True)
+
+        # Backfill from gen_mix
+        bucket = sa.func.substr(gen_mix.c.timestamp, 1, bucket_length)
+        aggregates = {
+            'bucket': bucket,
+            'count': sa.func.count(),
+            'last_timestamp': sa.func.max(gen_mix.c.timestamp),
+            'gen_total_sum': sa.func.sum(gen_mix.c.gen_total),
+            'gen_renewables_sum': sa.func.sum(gen_mix.c.gen_renewables),
+            'created_at': sa.func.current_timestamp(),
+            'updated_at': sa.func.current_timestamp(),
+        }
+        for name in SOURCE_NAMES:
+            for stat in ROLLUP_STATS:
+                aggregates[f'{name}_{stat}'] = getattr(sa.func, stat)(gen_mix.c[name])
+
+        rollup = sa.table(table_name, *[sa.column(key) for key in aggregates])
+        op.execute(rollup.insert().from_select(list(aggregates), sa.select(*aggregates.values()).group_by(bucket)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in reversed(list(ROLLUPS)):
+        op.drop_index(op.f(f'ix_{table_name}_bucket'), table_name=table_name)
+        op.drop_index(op.f(f'ix_{table_name}_id'), table_name=table_name)
+        op.drop_table(table_name)
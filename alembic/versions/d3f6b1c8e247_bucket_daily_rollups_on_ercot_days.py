@@ -0,0 +1,78 @@
+"""Bucket daily gen rollups on ERCOT local days
+
+Revision ID: d3f6b1c8e247
+Revises: b8e4d2a7c915
+Create Date: 2026-10-18 19:12:44.508316
+
+"""
+from datetime import datetime, UTC
+from typing import Sequence, Union
+from zoneinfo import ZoneInfo
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f6b1c8e247'
+down_revision: Union[str, Sequence[str], None] = 'b8e4d2a7c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Source columns as of this revision
+SOURCE_NAMES = ['coal', 'hydro', 'natural_gas', 'nuclear', 'other', 'power_storage', 'solar', 'wind']
+ERCOT_TZ = ZoneInfo('America/Chicago')
+BUCKET_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+COLUMNS = ['bucket', 'count', 'last_timestamp', 'gen_total_sum', 'gen_renewables_sum',
+           *[f'{name}_{stat}' for name in SOURCE_NAMES for stat in ('sum', 'min', 'max')]]
+
+
+def _epoch(value: str) -> int:
+    parsed = datetime.fromisoformat(value)
+    return int((parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)).timestamp())
+
+
+def _local_day(epoch: int) -> int:
+    return int(datetime.fromtimestamp(epoch, ERCOT_TZ).replace(hour=0, minute=0, second=0).timestamp())
+
+
+def _utc_day(epoch: int) -> int:
+    return epoch - epoch % 86400
+
+
+def _rebuild_daily(day_start) -> None:
+    """Fold the hourly rollups, whose buckets are the same in UTC and Central time, into days."""
+    bind = op.get_bind()
+    hourly = sa.table('gen_rollup_hourly', *[sa.column(key) for key in COLUMNS])
+    daily = sa.table('gen_rollup_daily', *[sa.column(key) for key in [*COLUMNS, 'created_at']])
+
+    days: dict[str, dict] = {}
+    for row in bind.execute(sa.select(hourly).order_by(hourly.c.bucket)).mappings():
+        bucket = datetime.fromtimestamp(day_start(_epoch(row['bucket'])), UTC).strftime(BUCKET_FORMAT)
+        day = days.get(bucket)
+        if day is None:
+            days[bucket] = {**row, 'bucket': bucket}
+            continue
+        day['count'] += row['count']
+        if _epoch(row['last_timestamp']) > _epoch(day['last_timestamp']):
+            day['last_timestamp'] = row['last_timestamp']
+        for key in ['gen_total_sum', 'gen_renewables_sum', *[f'{name}_sum' for name in SOURCE_NAMES]]:
+            day[key] += row[key]
+        for name in SOURCE_NAMES:
+            day[f'{name}_min'] = min(day[f'{name}_min'], row[f'{name}_min'])
+            day[f'{name}_max'] = max(day[f'{name}_max'], row[f'{name}_max'])
+
+    bind.execute(daily.delete())
+    if days:
+        now = datetime.now(UTC)
+        bind.execute(daily.insert(), [{**day, 'created_at': now} for day in days.values()])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild_daily(_local_day)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild_daily(_utc_day)
@@ -0,0 +1,55 @@
+"""Add epoch seconds to gen_instant and gen_mix
+
+Revision ID: e5a1f3b8c2d6
+Revises: c7d2a9e41f08
+Create Date: 2026-10-18 12:41:09.518320
+
+"""
+from datetime import datetime, UTC
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1f3b8c2d6'
+down_revision: Union[str, Sequence[str], None] = 'c7d2a9e41f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['gen_instant', 'gen_mix']
+BATCH_SIZE = 5000
+
+
+def _epoch_seconds(timestamp: str) -> int:
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for table_name in TABLES:
+        op.add_column(table_name, sa.Column('epoch', sa.Integer(), nullable=True))
+
+        # Backfill by parsing the stored timestamp strings
+        table = sa.table(table_name, sa.column('id'), sa.column('timestamp'), sa.column('epoch'))
+        update = table.update().where(table.c.id == sa.bindparam('row_id')).values(epoch=sa.bindparam('row_epoch'))
+        rows = bind.execute(sa.select(table.c.id, table.c.timestamp)).all()
+        for start in range(0, len(rows), BATCH_SIZE):
+            bind.execute(update, [
+                {'row_id': row_id, 'row_epoch': _epoch_seconds(timestamp)}
+                for row_id, timestamp in rows[start:start + BATCH_SIZE]
+            ])
+
+        op.create_index(op.f(f'ix_{table_name}_epoch'), table_name, ['epoch'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table_name}_epoch'), table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('epoch')
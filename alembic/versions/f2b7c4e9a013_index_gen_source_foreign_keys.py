@@ -0,0 +1,28 @@
+"""Index gen_source foreign keys
+
+Revision ID: f2b7c4e9a013
+Revises: e5a1f3b8c2d6
+Create Date: 2026-10-18 13:12:44.207851
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c4e9a013'
+down_revision: Union[str, Sequence[str], None] = 'e5a1f3b8c2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_gen_source_gen_instant_id_source_id', 'gen_source', ['gen_instant_id', 'source_id'], unique=True)
+    op.create_index('ix_gen_source_source_id_gen_instant_id', 'gen_source', ['source_id', 'gen_instant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gen_source_source_id_gen_instant_id', table_name='gen_source')
+    op.drop_index('ix_gen_source_gen_instant_id_source_id', table_name='gen_source')
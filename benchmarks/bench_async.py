@@ -0,0 +1,93 @@
+"""
+Compare request latency of the threadpool (sync session) and async session paths.
+
+    python -m benchmarks.bench_async [--clients 100] [--requests 2000] [--days 7]
+
+Both runs serve ``GET /api/v1/mix`` for the last day from the same seeded SQLite file,
+in process through the ASGI app, with the response cache disabled so every request
+queries the database. Reports throughput and p50/p99 latency per path.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from random import random
+
+_workdir = tempfile.TemporaryDirectory()
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{Path(_workdir.name) / 'bench.db'}"
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.db.database import (  # noqa: E402
+    Base, WriterSessionLocal, get_async_db, get_async_engine, get_db, get_request_db, writer_engine
+)
+from src.models.energy import energy_sources  # noqa: E402
+from src.router import app  # noqa: E402
+from src.schema import schema  # noqa: E402
+from src.service.db.gen_instant import create_gen_instances  # noqa: E402
+from src.service.db.source_service import seed  # noqa: E402
+
+INTERVAL_MINUTES = 5
+
+
+def _seed(days: int) -> None:
+    Base.metadata.create_all(bind=writer_engine)
+    end = datetime.now(UTC).replace(second=0, microsecond=0)
+    with WriterSessionLocal() as db:
+        seed(db)
+        create_gen_instances(db, [
+            schema.GenInstantCreate(
+                timestamp=(end - timedelta(minutes=INTERVAL_MINUTES * i)).isoformat(),
+                sources={label: random() * 30000 for label in energy_sources},
+            )
+            for i in range(days * 24 * 60 // INTERVAL_MINUTES)
+        ])
+
+
+async def _run(dependency, clients: int, requests: int) -> tuple[float, np.ndarray]:
+    app.dependency_overrides[get_request_db] = dependency
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def client(http: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await http.get("/api/v1/mix")
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await http.get("/api/v1/mix")  # warm up connections and the watermark
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    app.dependency_overrides.clear()
+    return elapsed, np.array(latencies) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per path")
+    parser.add_argument("--days", type=int, default=7, help="days of 5-minute intervals to seed")
+    args = parser.parse_args()
+
+    _seed(args.days)
+    print(f"{args.requests} requests, {args.clients} concurrent clients")
+    for name, dependency in (("threadpool", get_db), ("async", get_async_db)):
+        elapsed, latencies = asyncio.run(_run(dependency, args.clients, args.requests))
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{name:>10}: {args.requests / elapsed:7.0f} req/s  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms")
+        if dependency is get_async_db:
+            asyncio.run(get_async_engine().dispose())
+    _workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
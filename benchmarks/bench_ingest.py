@@ -0,0 +1,90 @@
+"""
+Compare the per-row and set-based ingest paths for one ERCOT scrape.
+
+    python -m benchmarks.bench_ingest [--days 2]
+
+Each run uses a fresh SQLite database with seeded sources and reports the number of
+statements sent to the database and the wall time of the ingest.
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from random import random
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base
+from src.models.energy import energy_sources
+from src.schema import schema
+from src.service.db.gen_instant import create_gen_instances, create_gen_instant, GenInstantAlreadyExistsError
+from src.service.db.source_service import seed
+
+INTERVAL_MINUTES = 5
+
+
+def _payload(days: int) -> list[schema.GenInstantCreate]:
+    start = datetime(2026, 1, 1)
+    return [
+        schema.GenInstantCreate(
+            timestamp=(start + timedelta(minutes=INTERVAL_MINUTES * i)).strftime("%Y-%m-%d %H:%M:%S-0600"),
+            sources={label: random() * 30000 for label in energy_sources},
+        )
+        for i in range(days * 24 * 60 // INTERVAL_MINUTES)
+    ]
+
+
+def _per_row(db, gen_instants):
+    """The ingest loop as it was before the set-based path."""
+    for gen_instant in gen_instants:
+        try:
+            create_gen_instant(db, gen_instant, commit=False)
+        except GenInstantAlreadyExistsError:
+            continue
+    db.commit()
+
+
+def _bulk(db, gen_instants):
+    create_gen_instances(db, gen_instants)
+
+
+def _measure(ingest, gen_instants, workdir: Path) -> tuple[int, float]:
+    engine = create_engine(f"sqlite:///{workdir / (ingest.__name__ + '.db')}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with session() as db:
+        seed(db)
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    with session() as db:
+        started = time.perf_counter()
+        ingest(db, gen_instants)
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return statements, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=2, help="days of 5-minute intervals in the payload")
+    args = parser.parse_args()
+
+    gen_instants = _payload(args.days)
+    print(f"{len(gen_instants)} intervals x {len(energy_sources)} sources")
+    with tempfile.TemporaryDirectory() as workdir:
+        for ingest in (_per_row, _bulk):
+            statements, elapsed = _measure(ingest, gen_instants, Path(workdir))
+            print(f"{ingest.__name__:>8}: {statements:6d} statements {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
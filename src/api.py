@@ -0,0 +1,139 @@
+import base64
+from datetime import datetime, timedelta, UTC
+from typing import Literal
+
+import numpy as np
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.db.database import get_request_db, run_db
+from src.models.energy import SOURCE_NAMES
+from src.service.coordination import fresh_watermark
+from src.service.conditional import is_not_modified, parse_timestamp_or_none, validators
+from src.service.dashboard_service import DashboardService
+from src.service.response_cache import response_cache
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+ENCODING_JSON = "json"
+ENCODING_FLOAT32 = "float32"
+
+Encoding = Literal["json", "float32"]
+
+# Cache key and ETag value of a query bound left to its default
+DEFAULT_WINDOW = "default"
+
+cache_header = {"Cache-Control": f"max-age={60 * 5}, must-revalidate"}
+
+
+def _encode(values: np.ndarray, encoding: str) -> list[float] | str:
+    """A column as a JSON array, or as base64 of packed little-endian float32."""
+    if encoding == ENCODING_FLOAT32:
+        return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+    return np.asarray(values, dtype=np.float64).tolist()
+
+
+async def _validated(
+    request: Request, db: Session | AsyncSession, route: str, **params
+) -> tuple[dict[str, str], Response | None]:
+    latest = await run_db(db, fresh_watermark)
+    headers = {**cache_header, **validators(route, latest, parse_timestamp_or_none(latest), **params)}
+    if is_not_modified(request, headers):
+        return headers, Response(status_code=304, headers=headers)
+    return headers, None
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+@router.get("/mix")
+async def mix(
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: Literal["raw", "hour", "day"] = DashboardService.RESOLUTION_RAW,
+    encoding: Encoding = ENCODING_JSON,
+    db: Session | AsyncSession = Depends(get_request_db),
+):
+    """
+    Generation mix between ``start`` and ``end`` (default: the last day) as columns:
+    a ``timestamps`` array and one array per source. ``hour``/``day`` resolutions
+    return bucket averages. ``encoding=float32`` packs each source column as base64
+    little-endian float32.
+    """
+    end_time = _as_utc(end) if end else datetime.now(UTC)
+    start_time = _as_utc(start) if start else end_time - timedelta(days=1)
+    # A defaulted bound follows the clock, so it is keyed as "default": the response then only
+    # changes with the watermark (and the cache TTL), instead of on every request
+    params = {
+        "start": start_time.isoformat() if start else DEFAULT_WINDOW,
+        "end": end_time.isoformat() if end else DEFAULT_WINDOW,
+        "resolution": resolution,
+        "encoding": encoding,
+    }
+
+    headers, not_modified = await _validated(request, db, "api.mix", **params)
+    if not_modified:
+        return not_modified
+
+    def payload(labels: list[str], columns: dict[str, np.ndarray]) -> dict:
+        return {
+            "resolution": resolution,
+            "encoding": encoding,
+            "timestamps": labels,
+            "sources": {name: _encode(values, encoding) for name, values in columns.items()},
+        }
+
+    def build(db: Session) -> dict:
+        return payload(*DashboardService.get_mix_columns(db, start_time, end_time, resolution))
+
+    async def build_async(db: AsyncSession) -> dict:
+        labels, columns = await DashboardService.get_mix_columns_async(db, start_time, end_time, resolution)
+        return await run_in_threadpool(payload, labels, columns)
+
+    key = response_cache.key("api.mix", **params)
+    body = await response_cache.get_or_compute_async(key, lambda: run_db(db, build, async_fn=build_async))
+    return JSONResponse(body, headers=headers)
+
+
+@router.get("/daily")
+async def daily(
+    request: Request,
+    days: int = 30,
+    encoding: Encoding = ENCODING_JSON,
+    db: Session | AsyncSession = Depends(get_request_db),
+):
+    """
+    Daily generation per source for the last ``days`` days as columns: a ``dates`` array,
+    one array per source and the ``total_gen``/``renewable_gen``/``renewable_pct``
+    columns shown in the home page table.
+    """
+    headers, not_modified = await _validated(request, db, "api.daily", days=days, encoding=encoding)
+    if not_modified:
+        return not_modified
+
+    def payload(table_data: list[dict]) -> dict:
+        columns = {name: [row["sources"].get(name, 0.0) for row in table_data] for name in SOURCE_NAMES}
+        totals = {key: [row[key] for row in table_data] for key in ("total_gen", "renewable_gen", "renewable_pct")}
+        return {
+            "encoding": encoding,
+            "dates": [row["date"] for row in table_data],
+            "sources": {name: _encode(values, encoding) for name, values in columns.items()},
+            **{key: _encode(values, encoding) for key, values in totals.items()},
+        }
+
+    def build(db: Session) -> dict:
+        _, table_data = DashboardService.get_generation_by_day(db, days)
+        return payload(table_data)
+
+    async def build_async(db: AsyncSession) -> dict:
+        _, table_data = await DashboardService.get_generation_by_day_async(db, days)
+        return await run_in_threadpool(payload, table_data)
+
+    key = response_cache.key("api.daily", days=days, encoding=encoding)
+    body = await response_cache.get_or_compute_async(key, lambda: run_db(db, build, async_fn=build_async))
+    return JSONResponse(body, headers=headers)
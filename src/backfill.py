@@ -0,0 +1,174 @@
+"""
+Load archived ERCOT fuel-mix files into the database.
+
+    python -m src.backfill <directory> [--workers N] [--chunk-size 5000] [--checkpoint PATH]
+
+``*.json`` files are fuel-mix payloads as served by the ERCOT dashboard API. ``*.csv`` files
+have a ``timestamp`` column and one column per source, named by label ("Coal and Lignite")
+or canonical name ("coal"). CSV timestamps may be any ISO 8601 time with a UTC offset and are
+stored in ERCOT's format and local time, like the intervals of the API. Files are parsed in a
+process pool and loaded in order through the set-based ingest path, ``chunk_size`` intervals
+per transaction. Finished files are recorded in the checkpoint, so an interrupted backfill
+resumes where it stopped; intervals that are already stored are skipped either way.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from src.db.database import WriterSessionLocal
+from src.db.profiler import query_profiler
+from src.logger.logger import get_logger
+from src.models.energy import Source, energy_sources
+from src.models.shared import ercot_timestamp
+from src.schema import schema
+from src.service.db.gen_instant import insert_gen_instances
+from src.service.fuel_mix_stream import iter_intervals
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+CHECKPOINT_FILE_NAME = ".backfill-checkpoint.json"
+READ_CHUNK_BYTES = 1 << 20
+
+# Canonical source name -> label, for CSV headers that use names
+_LABELS_BY_NAME = {meta["name"]: label for label, meta in energy_sources.items()}
+
+
+def _parse_json(path: Path) -> list[schema.GenInstantCreate]:
+    with path.open("rb") as file:
+        return [
+            schema.GenInstantCreate(timestamp=timestamp, sources={label: value["gen"] for label, value in mix.items()})
+            for timestamp, mix in iter_intervals(iter(lambda: file.read(READ_CHUNK_BYTES), b""))
+        ]
+
+
+def _storage_timestamp(value: str) -> str:
+    """``value`` as ERCOT reports it, e.g. ``'2026-02-21 18:50:00-0600'``; the offset is required."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError(f"Timestamp without a UTC offset: {value!r}")
+    return ercot_timestamp(int(parsed.timestamp()))
+
+
+def _parse_csv(path: Path) -> list[schema.GenInstantCreate]:
+    with path.open(newline="") as file:
+        reader = csv.DictReader(file)
+        columns = [column for column in reader.fieldnames or [] if column != "timestamp"]
+        labels = {column: _LABELS_BY_NAME.get(column, column) for column in columns}
+        for label in labels.values():
+            Source.metadata_for(label)
+        return [
+            schema.GenInstantCreate(
+                timestamp=_storage_timestamp(row["timestamp"]),
+                sources={labels[column]: row[column] for column in columns if row[column] != ""},
+            )
+            for row in reader
+        ]
+
+
+def parse_file(path: Path) -> list[schema.GenInstantCreate]:
+    """Validated intervals of one archive file; raises ValueError on unknown sources or timestamps without an offset."""
+    if path.suffix == ".csv":
+        return _parse_csv(path)
+    return _parse_json(path)
+
+
+def archive_files(directory: Path) -> list[Path]:
+    """Archive files in name order; hidden files such as the checkpoint are ignored."""
+    return sorted(
+        path for path in directory.iterdir() if path.suffix in (".json", ".csv") and not path.name.startswith(".")
+    )
+
+
+def _read_checkpoint(checkpoint: Path) -> set[str]:
+    if not checkpoint.exists():
+        return set()
+    return set(json.loads(checkpoint.read_text())["done"])
+
+
+def _write_checkpoint(checkpoint: Path, done: set[str]) -> None:
+    # Write then rename, so an interrupted write never leaves a corrupt checkpoint
+    partial = checkpoint.with_name(checkpoint.name + ".tmp")
+    partial.write_text(json.dumps({"done": sorted(done)}))
+    os.replace(partial, checkpoint)
+
+
+def backfill(
+    directory: Path,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint: Path | None = None,
+    session_factory: Callable[[], Session] = WriterSessionLocal,
+) -> dict:
+    """Load every archive file in ``directory`` not yet in the checkpoint. Returns run totals."""
+    checkpoint = checkpoint or directory / CHECKPOINT_FILE_NAME
+    done = _read_checkpoint(checkpoint)
+    pending = [path for path in archive_files(directory) if path.name not in done]
+    logger.info("Backfilling %d files from %s (%d already done)", len(pending), directory, len(done))
+
+    totals = {"files": 0, "parsed": 0, "created": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool, session_factory() as db:
+        # Parse ahead of the loader, but only a few files, so parsed files do not pile up in memory
+        files = iter(pending)
+        parsing = deque((path, pool.submit(parse_file, path)) for path in islice(files, workers * 2))
+        while parsing:
+            path, future = parsing.popleft()
+            next_path = next(files, None)
+            if next_path is not None:
+                parsing.append((next_path, pool.submit(parse_file, next_path)))
+            gen_instants = future.result()
+
+            created = 0
+            with query_profiler.profile(f"backfill {path.name}"):
+                for start in range(0, len(gen_instants), chunk_size):
+                    created += insert_gen_instances(db, gen_instants[start:start + chunk_size])
+                    db.expunge_all()
+
+            done.add(path.name)
+            _write_checkpoint(checkpoint, done)
+
+            totals["files"] += 1
+            totals["parsed"] += len(gen_instants)
+            totals["created"] += created
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "%s: %d intervals, %d new | %d/%d files, %d rows, %.0f rows/sec",
+                path.name, len(gen_instants), created, totals["files"], len(pending), totals["created"],
+                totals["created"] / elapsed if elapsed else 0.0,
+            )
+
+    totals["seconds"] = time.perf_counter() - started
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load archived ERCOT fuel-mix files into the database.")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="intervals per transaction")
+    parser.add_argument("--checkpoint", type=Path, default=None,
+                        help=f"progress file (default: <directory>/{CHECKPOINT_FILE_NAME})")
+    args = parser.parse_args()
+
+    totals = backfill(args.directory, args.workers, args.chunk_size, args.checkpoint)
+    logger.info(
+        "Backfill done: %d files, %d intervals parsed, %d new in %.1fs (%.0f rows/sec)",
+        totals["files"], totals["parsed"], totals["created"], totals["seconds"],
+        totals["created"] / totals["seconds"] if totals["seconds"] else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    main()
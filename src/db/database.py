@@ -1,19 +1,122 @@
 from contextlib import contextmanager
 from os import getenv
 from pathlib import Path
-from typing import Generator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
+
+from src.db.profiler import query_profiler
+from src.metrics import instrument_engine
 
 DEFAULT_DB_PATH = Path("data") / "ercot.db"
 SQLALCHEMY_DATABASE_URL = getenv("SQLALCHEMY_DATABASE_URL", "sqlite:///" + str(DEFAULT_DB_PATH))
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Serve requests through an async engine (aiosqlite for SQLite, asyncpg for PostgreSQL)
+DB_ASYNC = getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Connection pool; SQLite file databases use a QueuePool as well
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", "30"))
+# Seconds to wait to connect (PostgreSQL) or for a lock (SQLite)
+DB_CONNECT_TIMEOUT = float(getenv("DB_CONNECT_TIMEOUT", "15"))
+
+# Per-connection SQLite page cache (negative: KiB) and memory-mapped I/O size (bytes)
+SQLITE_CACHE_SIZE = int(getenv("SQLITE_CACHE_SIZE", str(-64 * 1024)))
+SQLITE_MMAP_SIZE = int(getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Async drivers for the sync URL schemes we support
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+T = TypeVar("T")
+
+
+def _connect_args(url: str) -> dict[str, Any]:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        args = {"timeout": DB_CONNECT_TIMEOUT}
+        if url.get_driver_name() == "pysqlite":
+            args["check_same_thread"] = False
+        return args
+    if url.get_driver_name() == "asyncpg":
+        return {"timeout": DB_CONNECT_TIMEOUT}
+    return {"connect_timeout": int(DB_CONNECT_TIMEOUT)}
+
+
+def _is_sqlite_file(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _pool_args(url: str, writer: bool = False) -> dict[str, Any]:
+    if make_url(url).get_backend_name() == "sqlite" and not _is_sqlite_file(url):
+        # In-memory SQLite uses a single static connection
+        return {}
+    if writer:
+        return {"pool_size": 1, "max_overflow": 0, "pool_timeout": DB_POOL_TIMEOUT}
+    return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+
+
+def configure_sqlite(engine: Engine, query_only: bool = False) -> None:
+    """
+    Set the pragmas of every new connection of a SQLite ``engine``: WAL, so readers and the
+    writer do not block each other, ``synchronous=NORMAL`` (durable at checkpoints under WAL),
+    the page cache, mmap and lock wait settings, and ``query_only`` for reader engines.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.execute(f"PRAGMA busy_timeout={int(DB_CONNECT_TIMEOUT * 1000)}")
+            if query_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str, writer: bool = False) -> Engine:
+    """
+    Engine for ``url``. On a SQLite file, readers get a pooled ``query_only`` engine and the
+    writer a single connection, so writes queue in the pool instead of contending for the lock.
+    """
+    engine = create_engine(url, connect_args=_connect_args(url), **_pool_args(url, writer))
+    if _is_sqlite_file(url):
+        configure_sqlite(engine, query_only=not writer)
+    instrument_engine(engine)
+    if query_profiler.enabled:
+        query_profiler.install(engine)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the async one, e.g. sqlite:// -> sqlite+aiosqlite://."""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+# Request sessions read through ``engine``; ingest, seeding and rebuilds write through ``writer_engine``
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+writer_engine = (
+    create_db_engine(SQLALCHEMY_DATABASE_URL, writer=True) if _is_sqlite_file(SQLALCHEMY_DATABASE_URL) else engine
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=writer_engine)
+
+# Created on first use, so the async driver is only needed in async mode
+_async_engine = None
+_async_session_factory = None
 
 
 class Base(DeclarativeBase):
@@ -37,3 +140,55 @@ def get_db_context() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def get_writer_db_context() -> Generator[Session, None, None]:
+    """Context manager that yields a session of the writer engine and always closes it."""
+    db = WriterSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = async_database_url(SQLALCHEMY_DATABASE_URL)
+        _async_engine = create_async_engine(url, connect_args=_connect_args(url), **_pool_args(url))
+        if _is_sqlite_file(url):
+            configure_sqlite(_async_engine.sync_engine, query_only=True)
+        instrument_engine(_async_engine.sync_engine)
+        if query_profiler.enabled:
+            query_profiler.install(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that yields an async DB session and always closes it."""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+# Session dependency of the request handlers: async sessions in async mode
+get_request_db = get_async_db if DB_ASYNC else get_db
+
+
+async def run_db(
+    db: Session | AsyncSession, fn: Callable[..., T], *args, async_fn: Callable[..., Awaitable[T]] | None = None
+) -> T:
+    """
+    Await ``fn(session, *args)``, where ``fn`` is written against a sync Session; with a sync
+    Session it runs in the threadpool. With an AsyncSession, ``async_fn(session, *args)`` is
+    awaited when given: it awaits its queries and keeps CPU-bound work off the event loop.
+    Otherwise ``fn`` runs on the async connection through ``run_sync``, on the event loop, which
+    only suits small lookups.
+    """
+    if isinstance(db, AsyncSession):
+        if async_fn is not None:
+            return await async_fn(db, *args)
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
@@ -0,0 +1,194 @@
+"""
+Opt-in SQL profiler (``SQL_PROFILE=true``).
+
+Statements are grouped per unit of work, an HTTP request or an ingest cycle, and recorded
+by normalized fingerprint. A unit that runs one fingerprint more than ``SQL_PROFILE_N_PLUS_ONE``
+times is flagged as a likely N+1, and statements slower than ``SQL_SLOW_QUERY_MS`` are
+logged with their ``EXPLAIN`` plan. The last units are kept for ``/debug/queries``.
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+SQL_PROFILE = getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+SQL_PROFILE_N_PLUS_ONE = int(getenv("SQL_PROFILE_N_PLUS_ONE", "10"))
+SQL_SLOW_QUERY_MS = float(getenv("SQL_SLOW_QUERY_MS", "100"))
+SQL_PROFILE_HISTORY = int(getenv("SQL_PROFILE_HISTORY", "50"))
+
+PROFILE_HEADER = "X-SQL-Profile"
+EXPLAIN_SAVEPOINT = "sql_profile_explain"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Bind parameter styles: qmark, pyformat, named (not a :: cast) and numeric
+_BIND = r"(?:\?|%\(\w+\)s|(?<!:):\w+|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_BIND}(?:\s*,\s*{_BIND})*\s*\)")
+_PLACEHOLDER = re.compile(_BIND)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """``statement`` with literals and bind parameters replaced by ``?`` and IN lists collapsed."""
+    statement = _STRING.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?...)", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+class UnitOfWork:
+    """Statements of one request or ingest: count, total time and counts per fingerprint."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.statements = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self.slow: list[dict] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = SQL_PROFILE_N_PLUS_ONE) -> dict[str, int]:
+        """Fingerprints run more than ``threshold`` times: likely N+1 queries."""
+        return {sql: count for sql, count in self.fingerprints.items() if count > threshold}
+
+    def summary(self) -> dict:
+        return {
+            "name": self.name,
+            "statements": self.statements,
+            "ms": round(self.seconds * 1000, 3),
+            "distinct": len(self.fingerprints),
+            "n_plus_one": self.repeated(),
+            "slow": self.slow,
+            "top": [{"sql": sql, "count": count} for sql, count in self.fingerprints.most_common(5)],
+        }
+
+    def header(self) -> str:
+        return f"statements={self.statements}; ms={self.seconds * 1000:.1f}; n_plus_one={len(self.repeated())}"
+
+
+class QueryProfiler:
+    def __init__(
+        self,
+        enabled: bool = SQL_PROFILE,
+        slow_ms: float = SQL_SLOW_QUERY_MS,
+        history: int = SQL_PROFILE_HISTORY,
+    ) -> None:
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self._current: ContextVar[UnitOfWork | None] = ContextVar("sql_profile", default=None)
+        self._lock = threading.Lock()
+        self._history: deque[dict] = deque(maxlen=history)
+
+    def install(self, engine: Engine) -> None:
+        """Profile the statements of ``engine`` run inside a ``profile`` block."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+            if self._current.get() is not None:
+                conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+            unit = self._current.get()
+            if unit is None:
+                return
+            seconds = time.perf_counter() - conn.info["profile_started"].pop()
+            unit.record(statement, seconds)
+            if seconds * 1000 >= self.slow_ms:
+                plan = None if executemany else self._explain(conn, statement, parameters)
+                unit.slow.append({"sql": fingerprint(statement), "ms": round(seconds * 1000, 3), "plan": plan})
+                logger.warning("Slow query (%.1f ms) in %s: %s\n%s", seconds * 1000, unit.name, statement, plan)
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> str | None:
+        """
+        Plan of ``statement``, run on a raw cursor so it is not profiled itself. It runs in a
+        savepoint of the caller's transaction: a failed EXPLAIN is rolled back to it, rather
+        than leaving the transaction aborted on PostgreSQL.
+        """
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                try:
+                    cursor.execute(prefix + statement, parameters)
+                    plan = "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+                except Exception:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                    raise
+                finally:
+                    cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                return plan
+            finally:
+                cursor.close()
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[UnitOfWork | None]:
+        """Group the statements run inside the block; yields None when profiling is off."""
+        if not self.enabled:
+            yield None
+            return
+        unit = UnitOfWork(name)
+        token = self._current.set(unit)
+        try:
+            yield unit
+        finally:
+            self._current.reset(token)
+            self._finish(unit)
+
+    def _finish(self, unit: UnitOfWork) -> None:
+        for sql, count in unit.repeated().items():
+            logger.warning("Possible N+1 in %s: %d x %s", unit.name, count, sql)
+        with self._lock:
+            self._history.append(unit.summary())
+
+    def history(self) -> list[dict]:
+        """Summaries of the last units of work, newest first."""
+        with self._lock:
+            return list(reversed(self._history))
+
+
+class QueryProfileMiddleware:
+    """ASGI middleware profiling each HTTP request and reporting it in the ``X-SQL-Profile`` header."""
+
+    def __init__(self, app, profiler: QueryProfiler = None) -> None:
+        self.app = app
+        self.profiler = profiler or query_profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile(f"{scope['method']} {scope['path']}") as unit:
+
+            async def send_with_header(message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((PROFILE_HEADER.lower().encode(), unit.header().encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_header)
+
+
+query_profiler = QueryProfiler()
@@ -1,44 +1,115 @@
 import os
 import threading
 import time
+from datetime import datetime
 
 import schedule
 import uvicorn
 
+from src.db.database import get_writer_db_context
+from src.db.profiler import query_profiler
 from src.logger.logger import get_logger
+from src.metrics import METRICS_PORT, scheduler_lag_seconds, start_metrics_server
+from src.models.app_state import AppState
 from src.router import app
+from src.service.coordination import ingest_lock
+from src.service.db.source_service import seed as seed_sources
 from src.service.ercot import Ercot
+from src.service.image_store import image_catalog
+from src.service.watermark import gen_watermark
 
 MODE_DEV = "dev"
 MODE_PROD = "prod"
+# Scheduler and ingest only, no web server
+MODE_WORKER = "worker"
+# Web server only, in WEB_WORKERS processes; pair with a worker
+MODE_WEB = "web"
 
 APP_MODE = os.getenv("APP_MODE", MODE_DEV)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "2"))
 
 logger = get_logger(__name__)
 
 SCHEDULE_EVERY_MINUTES = 30
 
 
-def run() -> None:
+def current_cycle() -> int:
+    """Number of the schedule slot of now, the same in every process."""
+    return int(time.time()) // (SCHEDULE_EVERY_MINUTES * 60)
+
+
+def run(cycle: int | None = None) -> None:
+    """
+    One ingest, skipped while another process holds the ingest lock or, given a ``cycle``,
+    once any process has run that cycle.
+    """
+    try:
+        with get_writer_db_context() as db:
+            if not ingest_lock.acquire(db, cycle):
+                logger.info("Ingest lock is held or this cycle already ran; skipping this run.")
+                return
+    except Exception as e:
+        logger.exception("Error taking the ingest lock", exc_info=e)
+        return
 
     try:
-        with Ercot() as ercot:
+        with query_profiler.profile("ingest"), Ercot(lock=ingest_lock) as ercot:
             ercot.create_visualization()
     except Exception as e:
         logger.exception("Error connecting to ERCOT", exc_info=e)
-        return
+    finally:
+        try:
+            with get_writer_db_context() as db:
+                ingest_lock.release(db)
+        except Exception as e:
+            logger.exception("Error releasing the ingest lock", exc_info=e)
+
+
+def run_scheduled() -> None:
+    """The ingest of the current schedule slot."""
+    run(current_cycle())
+
+
+def _ensure_app_state() -> None:
+    """
+    Create the ``app_state`` table of the ingest lock where migrations are not run (dev mode,
+    CI); deployments get it from alembic. Raises if the database cannot be reached.
+    """
+    with get_writer_db_context() as db:
+        AppState.__table__.create(db.get_bind(), checkfirst=True)
+
+
+def _warm_caches() -> None:
+    """
+    Seed and load the source registry, read the ingest high-water mark and index the image
+    directory, once at startup.
+    """
+    try:
+        with get_writer_db_context() as db:
+            seed_sources(db)
+            logger.info("Ingest watermark: %s", gen_watermark.load(db))
+        logger.info("Image catalog: %d images", image_catalog.rebuild())
+    except Exception as e:
+        logger.exception("Error warming caches", exc_info=e)
 
 
 def run_scheduler() -> None:
     """Run the scheduler loop."""
     try:
-        run()  # Run immediately
+        _ensure_app_state()
+        _warm_caches()
+        run_scheduled()  # Run immediately
         tr = list(range(0, 60, SCHEDULE_EVERY_MINUTES))
         for t in tr:
-            schedule.every().hour.at(f":{t:02d}").do(run)
+            schedule.every().hour.at(f":{t:02d}").do(run_scheduled)
 
         logger.info("Running schedule. Will check every %s minutes.", SCHEDULE_EVERY_MINUTES)
         while True:
+            # schedule works in naive local time
+            now = datetime.now()
+            for job in schedule.get_jobs():
+                if job.should_run:
+                    scheduler_lag_seconds.observe((now - job.next_run).total_seconds())
             schedule.run_pending()
             time.sleep(1)
     except Exception as e:
@@ -52,6 +123,7 @@ def _start_scheduler_thread() -> None:
 
 def main() -> None:
     if APP_MODE == MODE_DEV:
+        _ensure_app_state()
         run()
         return
 
@@ -60,7 +132,21 @@ def main() -> None:
         uvicorn.run(app, host="0.0.0.0", port=8000)
         return
 
-    logger.warning("Unknown APP_MODE=%r; expected %r or %r.", APP_MODE, MODE_DEV, MODE_PROD)
+    if APP_MODE == MODE_WORKER:
+        # No web server here, so ingest, fetch and render metrics get their own listener
+        start_metrics_server()
+        logger.info("Serving metrics on :%d/metrics", METRICS_PORT)
+        run_scheduler()
+        return
+
+    if APP_MODE == MODE_WEB:
+        # Workers import the app themselves; caches are invalidated through the database
+        uvicorn.run("src.router:app", host="0.0.0.0", port=8000, workers=WEB_WORKERS)
+        return
+
+    logger.warning(
+        "Unknown APP_MODE=%r; expected one of %r.", APP_MODE, [MODE_DEV, MODE_PROD, MODE_WORKER, MODE_WEB]
+    )
 
 
 # ==== STARTUP ====
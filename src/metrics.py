@@ -0,0 +1,255 @@
+"""
+Process-local metrics, served at ``/metrics`` in the Prometheus text exposition format.
+
+Recording is a dict update under a per-metric lock, cheap enough for every request and
+query. Counters of the existing ``stats()`` objects are exposed as gauges at scrape time.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import getenv
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Port of the standalone /metrics listener of processes that serve no HTTP (APP_MODE=worker)
+METRICS_PORT = int(getenv("METRICS_PORT", "9100"))
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Queries per request
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(tuple(labels[name] for name in self.labelnames))
+            return sum(entry[0]) if entry else 0
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            entry = self._values.get(tuple(labels[name] for name in self.labelnames))
+            return entry[1] if entry else 0.0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, list(counts), total) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._stats: list[tuple[str, Callable[[], dict]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, stats: Callable[[], dict]) -> None:
+        """Expose the numeric values of ``stats()`` as ``<prefix>_<key>`` gauges."""
+        self._stats.append((prefix, stats))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} {metric.type}", *metric.samples()]
+        for prefix, stats in self._stats:
+            for key, value in stats().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines += [f"# TYPE {prefix}_{key} gauge", f"{prefix}_{key} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by route, method and status.",
+                                 ("route", "method", "status"))
+http_request_seconds = registry.histogram("http_request_duration_seconds", "HTTP request latency.", ("route",))
+db_queries = registry.counter("db_queries_total", "SQL statements executed.")
+db_query_seconds = registry.histogram("db_query_duration_seconds", "SQL statement execution time.")
+db_queries_per_request = registry.histogram("http_request_db_queries", "SQL statements per HTTP request.",
+                                            ("route",), COUNT_BUCKETS)
+db_seconds_per_request = registry.histogram("http_request_db_seconds", "SQL time per HTTP request.", ("route",))
+ingest_seconds = registry.histogram("ingest_duration_seconds", "Duration of create_gen_instances.",
+                                    buckets=SLOW_BUCKETS)
+ingest_rows = registry.counter("ingest_rows_total", "Intervals inserted by the ingest.")
+ingest_duplicates = registry.counter("ingest_duplicates_total", "Intervals skipped by the ingest as already stored.")
+fetch_seconds = registry.histogram("ercot_fetch_duration_seconds", "ERCOT API response time (to headers when streamed).",
+                                   buckets=SLOW_BUCKETS)
+fetch_bytes = registry.counter("ercot_fetch_bytes_total", "Bytes downloaded from the ERCOT API.")
+render_seconds = registry.histogram("chart_render_duration_seconds", "Chart render time in the render worker.",
+                                    buckets=SLOW_BUCKETS)
+scheduler_lag_seconds = registry.histogram("scheduler_lag_seconds", "Delay between a job's scheduled and actual start.",
+                                           buckets=SLOW_BUCKETS)
+
+# [statements, seconds] of the request being served, if any
+_request_db: ContextVar[list | None] = ContextVar("request_db", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement executed on ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["metrics_started"].pop()
+        seconds = time.perf_counter() - started
+        db_queries.inc()
+        db_query_seconds.observe(seconds)
+        usage = _request_db.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += seconds
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording count, latency and DB usage of every HTTP request by route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        usage = [0, 0.0]
+        token = _request_db.set(usage)
+        started = time.perf_counter()
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            _request_db.reset(token)
+            # The matched route's template, so paths with parameters share a series
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_requests.inc(route=route, method=scope["method"], status=status)
+            http_request_seconds.observe(seconds, route=route)
+            db_queries_per_request.observe(usage[0], route=route)
+            db_seconds_per_request.observe(usage[1], route=route)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        # Scrapes are not worth a log line each
+        pass
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` of this process on ``port`` from a daemon thread; ``shutdown()`` stops it."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
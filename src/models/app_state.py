@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from src.db.database import Base
+
+
+class AppState(Base):
+    """
+    Named row shared by every process of a deployment: a counter that is bumped on changes
+    and an optional lease (``owner`` until ``expires_at``, in epoch seconds).
+    """
+    __tablename__ = "app_state"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    owner = Column(String, nullable=True)
+    expires_at = Column(Integer, nullable=True)
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Boolean
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 
-from src.models.shared import EntityBase
+from src.models.shared import EntityBase, epoch_seconds, ercot_datetime
 
 energy_sources = {
     "Coal and Lignite": {
@@ -49,6 +49,9 @@ energy_sources = {
     "Wind": {"name": "wind", "display": "Wind", "color": "#4BC0C0", "renewable": True},
 }
 
+# Canonical source names, in energy_sources order. GenMix has one column per name.
+SOURCE_NAMES = [meta["name"] for meta in energy_sources.values()]
+
 
 class Source(EntityBase):
     __tablename__ = "source"
@@ -74,6 +77,12 @@ class Source(EntityBase):
 
 class GenSource(EntityBase):
     __tablename__ = "gen_source"
+    __table_args__ = (
+        # Loading an instant's sources, and one row per source per instant
+        Index("ix_gen_source_gen_instant_id_source_id", "gen_instant_id", "source_id", unique=True),
+        # Per-source history
+        Index("ix_gen_source_source_id_gen_instant_id", "source_id", "gen_instant_id"),
+    )
 
     gen = Column(Float, nullable=False, default=0.0)
 
@@ -93,6 +102,13 @@ class GenInstant(EntityBase):
     __tablename__ = "gen_instant"
 
     timestamp = Column(String, index=True, unique=True)
+    # ``timestamp`` as epoch seconds, for range scans independent of the string's format
+    epoch = Column(Integer, index=True)
+
+    # Derived from gen_sources when the instant is created
+    gen_total = Column(Float, index=True)
+    gen_renewables = Column(Float, index=True)
+    percentage_renewable = Column(Float, index=True)
 
     gen_sources = relationship(
         "GenSource",
@@ -103,6 +119,7 @@ class GenInstant(EntityBase):
     def __init__(self, timestamp: str, gen_sources: list[GenSource]) -> None:
         super().__init__()
         self.timestamp = timestamp
+        self.epoch = epoch_seconds(timestamp)
         self.gen_sources = gen_sources
 
         # Compute derived values
@@ -113,3 +130,103 @@ class GenInstant(EntityBase):
         self.percentage_renewable = (
             self.gen_renewables / self.gen_total * 100 if self.gen_total else 0
         )
+
+    @staticmethod
+    def totals_for(sources: dict[str, float]) -> dict[str, float]:
+        """Derived values for a mix keyed by source label, as computed by ``__init__``."""
+        gen_total = sum(sources.values())
+        gen_renewables = sum(gen for label, gen in sources.items() if Source.metadata_for(label)["renewable"])
+        return {
+            "gen_total": gen_total,
+            "gen_renewables": gen_renewables,
+            "percentage_renewable": gen_renewables / gen_total * 100 if gen_total else 0,
+        }
+
+
+class GenMix(EntityBase):
+    """
+    Denormalized generation mix: one row per timestamp with a column per source in
+    ``SOURCE_NAMES``, kept in sync with gen_instant/gen_source by the ingest path.
+    """
+    __tablename__ = "gen_mix"
+
+    timestamp = Column(String, index=True, unique=True, nullable=False)
+    epoch = Column(Integer, index=True)
+
+    coal = Column(Float, nullable=False, default=0.0)
+    hydro = Column(Float, nullable=False, default=0.0)
+    natural_gas = Column(Float, nullable=False, default=0.0)
+    nuclear = Column(Float, nullable=False, default=0.0)
+    other = Column(Float, nullable=False, default=0.0)
+    power_storage = Column(Float, nullable=False, default=0.0)
+    solar = Column(Float, nullable=False, default=0.0)
+    wind = Column(Float, nullable=False, default=0.0)
+
+    gen_total = Column(Float, nullable=False, default=0.0)
+    gen_renewables = Column(Float, nullable=False, default=0.0)
+
+    @staticmethod
+    def values_for(timestamp: str, sources: dict[str, float]) -> dict:
+        """
+        Build the column values for a row from a mix keyed by source label
+        (e.g. "Coal and Lignite"), as received from ERCOT.
+        """
+        values = {"timestamp": timestamp, "epoch": epoch_seconds(timestamp), **{name: 0.0 for name in SOURCE_NAMES}}
+        for label, gen in sources.items():
+            values[Source.metadata_for(label)["name"]] = gen
+        totals = GenInstant.totals_for(sources)
+        values["gen_total"] = totals["gen_total"]
+        values["gen_renewables"] = totals["gen_renewables"]
+        return values
+
+
+# Statistics kept per source in the rollup tables, as "<source>_<stat>" columns
+ROLLUP_STATS = ("sum", "min", "max")
+
+
+class GenRollupMixin:
+    """
+    Aggregate of the gen_mix rows whose epoch falls in the period starting at ``bucket`` (the
+    ``epoch_label`` of ``bucket_start``): ``count`` intervals, sum/min/max per source and summed
+    totals.
+    """
+
+    bucket = Column(String, index=True, unique=True, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    last_timestamp = Column(String, nullable=False)
+
+    gen_total_sum = Column(Float, nullable=False, default=0.0)
+    gen_renewables_sum = Column(Float, nullable=False, default=0.0)
+
+    @classmethod
+    def bucket_start(cls, epoch: int) -> int:
+        """Epoch at which the bucket containing ``epoch`` starts."""
+        raise NotImplementedError
+
+
+for _name in SOURCE_NAMES:
+    for _stat in ROLLUP_STATS:
+        setattr(GenRollupMixin, f"{_name}_{_stat}", Column(Float, nullable=False, default=0.0))
+
+
+class GenRollupHourly(GenRollupMixin, EntityBase):
+    __tablename__ = "gen_rollup_hourly"
+
+    BUCKET_SECONDS = 3600
+    BUCKETS_PER_DAY = 24
+
+    @classmethod
+    def bucket_start(cls, epoch: int) -> int:
+        # Central time is a whole number of hours off UTC, so UTC and local hours coincide
+        return epoch - epoch % cls.BUCKET_SECONDS
+
+
+class GenRollupDaily(GenRollupMixin, EntityBase):
+    __tablename__ = "gen_rollup_daily"
+
+    BUCKETS_PER_DAY = 1
+
+    @classmethod
+    def bucket_start(cls, epoch: int) -> int:
+        # Days are ERCOT's local days, 23 or 25 hours long when daylight saving time changes
+        return int(ercot_datetime(epoch).replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
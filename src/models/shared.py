@@ -1,9 +1,47 @@
 from datetime import datetime, UTC
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import Column, Integer, DateTime
 
 from src.db.database import Base
 
+# ERCOT reports intervals in Central time, e.g. '2026-02-21 18:50:00-0600'
+ERCOT_TZ = ZoneInfo("America/Chicago")
+ERCOT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
+
+def epoch_seconds(value: str | datetime) -> int:
+    """
+    Seconds since the Unix epoch of a stored timestamp string (ERCOT's
+    ``'2026-02-21 18:50:00-0600'`` or ISO 8601) or a datetime. Naive values are taken as UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+def epoch_label(epoch: int) -> str:
+    """
+    ``epoch`` as a UTC ISO 8601 string, e.g. ``'2026-02-22T00:50:00Z'``: the key of rollup
+    buckets, whatever format the intervals were stored in. Sorts chronologically.
+    """
+    return datetime.fromtimestamp(epoch, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def ercot_datetime(epoch: int) -> datetime:
+    """``epoch`` in ERCOT's local (Central) time."""
+    return datetime.fromtimestamp(epoch, ERCOT_TZ)
+
+
+def ercot_timestamp(epoch: int) -> str:
+    """
+    ``epoch`` in the format ERCOT reports intervals in, e.g. ``'2026-02-21 18:50:00-0600'``:
+    how rollup buckets are labelled in charts, like the raw intervals next to them.
+    """
+    return ercot_datetime(epoch).strftime(ERCOT_TIMESTAMP_FORMAT)
+
 
 class EntityBase(Base):
     __abstract__ = True
@@ -1,15 +1,27 @@
 from pathlib import Path
 
 from fastapi import Depends
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Query, Request
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.db.database import get_db
+from src.api import router as api_router
+from src.db.database import get_db, get_request_db, run_db
+from src.db.profiler import QueryProfileMiddleware, query_profiler
+from src.metrics import CONTENT_TYPE, MetricsMiddleware, registry
 from src.models.energy import energy_sources
 from src.service.dashboard_service import DashboardService
+from src.service.ercot import stored_chart
+from src.service.coordination import fresh_watermark, images_version
+from src.service.conditional import is_not_modified, parse_timestamp_or_none, validators
+from src.service.fetcher import ercot_fetcher
+from src.service.image_store import image_catalog, image_store
+from src.service.renderer import chart_renderer
+from src.service.response_cache import response_cache
 
 # Project root (../ from this file because this file lives in src/)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -20,33 +32,90 @@ TEMPLATES_DIR = PROJECT_ROOT / "templates"
 TEMPLATES_DIR.mkdir(exist_ok=True)
 
 app = FastAPI()
+app.include_router(api_router)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryProfileMiddleware)
+
+registry.register_stats("response_cache", response_cache.stats)
+registry.register_stats("renderer", chart_renderer.stats)
+registry.register_stats("image_store", image_store.stats)
+registry.register_stats("ercot_fetcher", ercot_fetcher.stats)
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
-# Mount the 'out' folder to be served at '/images'
-app.mount("/images", StaticFiles(directory=str(OUT_DIR)), name="images")
+
+class PublicStaticFiles(StaticFiles):
+    """Static files without the hidden ones, such as the image store's digests and partial renders."""
+
+    async def get_response(self, path: str, scope) -> Response:
+        if _is_hidden(path):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return await super().get_response(path, scope)
+
+
+def _is_hidden(path: str) -> bool:
+    return any(part.startswith(".") for part in Path(path).parts)
+
+
+# The 'out' folder, served at '/images' by a mount declared after the routes
+images_static = PublicStaticFiles(directory=str(OUT_DIR))
 
 cache_header = {"Cache-Control": f"max-age={60 * 5}, must-revalidate"}
 
 
+async def _data_validators(db: Session | AsyncSession, route: str, **params) -> dict[str, str]:
+    """Cache headers for a page built from stored data, keyed on the latest ingested timestamp."""
+    latest = await run_db(db, fresh_watermark)
+    return {**cache_header, **validators(route, latest, parse_timestamp_or_none(latest), **params)}
+
+
 # Healthcheck endpoint
 @app.get("/health", response_model=dict)
-def health_check():
-    """Simple health check endpoint returning status OK."""
-    return {"status": "ok"}
+async def health_check():
+    """Simple health check endpoint returning status OK, response cache, chart render and image store counters."""
+    return {
+        "status": "ok",
+        "response_cache": response_cache.stats(),
+        "renderer": chart_renderer.stats(),
+        "image_store": image_store.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, query, ingest, fetch, render and scheduler metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/queries", response_model=list)
+async def debug_queries():
+    """SQL profiles of the last requests and ingests, newest first; only with SQL_PROFILE enabled."""
+    if not query_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return query_profiler.history()
 
 
 @app.get("/", response_class=HTMLResponse)
-def home(
+async def home(
     request: Request,
     days: int = 30,
     view: str = "graph",  # 'graph' or 'table'
-    db: Session = Depends(get_db),
+    db: Session | AsyncSession = Depends(get_request_db),
 ):
     """
     Homepage showing daily generation overview.
     """
-    chart_data, table_data = DashboardService.get_generation_by_day(db, days)
+    headers = await _data_validators(db, "home", days=days, view=view)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    key = response_cache.key("home", days=days)
+    chart_data, table_data = await response_cache.get_or_compute_async(
+        key,
+        lambda: run_db(
+            db, DashboardService.get_generation_by_day, days, async_fn=DashboardService.get_generation_by_day_async
+        ),
+    )
 
     return templates.TemplateResponse(
         request,
@@ -57,31 +126,48 @@ def home(
             "days": days,
             "view": view,
         },
-        headers=cache_header,
+        headers=headers,
     )
 
 
 @app.get("/images", response_class=HTMLResponse)
 def list_images(
-    request: Request, page: int = 1, page_size: int = 20, sort: str = "desc"
+    request: Request,
+    page: int = 1,
+    page_size: int = 20,
+    sort: str = "desc",
+    after: str | None = None,
+    db: Session = Depends(get_db),
 ):
     """
-    Endpoint to list all images in the 'out' folder with paging and sorting.
+    Endpoint to list all images in the 'out' folder with paging and sorting, from the image
+    catalog. ``after`` continues the listing from a file name instead of a page number.
     """
-    files = [
-        f.name
-        for f in OUT_DIR.iterdir()
-        if f.is_file() and f.suffix.lower() in {".png", ".jpg", ".jpeg"}
-    ]
-
-    # Sort files
-    files.sort(reverse=(sort == "desc"))
-
-    # Pagination
-    total = len(files)
-    start = (page - 1) * page_size
-    end = start + page_size
-    paginated_files = files[start:end]
+    # Charts rendered by an ingest in another process show up after a catalog rebuild
+    images_version.refresh(db)
+    total = image_catalog.count()
+
+    # Derived from the listing itself, so every web process answers with the same ETag
+    headers = {
+        **cache_header,
+        **validators(
+            "images",
+            image_catalog.signature(),
+            image_catalog.last_modified,
+            page=page,
+            page_size=page_size,
+            sort=sort,
+            after=after,
+        ),
+    }
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    descending = sort == "desc"
+    if after is not None:
+        paginated_files = image_catalog.after(after, page_size, descending)
+    else:
+        paginated_files = image_catalog.page(page, page_size, descending)
 
     return templates.TemplateResponse(
         request,
@@ -94,20 +180,35 @@ def list_images(
             "total": total,
             "total_pages": (total + page_size - 1) // page_size,
         },
-        headers=cache_header,
+        headers=headers,
     )
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
-def dashboard(
+async def dashboard(
     request: Request,
     timespan: str = "5D",  # 3W, 1M, 3M, 6M, 1Y
-    db: Session = Depends(get_db),
+    points: int = Query(DashboardService.MAX_POINTS, ge=3, le=DashboardService.MAX_POINTS),
+    db: Session | AsyncSession = Depends(get_request_db),
 ):
     """
-    UI dashboard to view the data over time.
+    UI dashboard to view the data over time, downsampled to at most ``points`` per series.
     """
-    labels, datasets = DashboardService.get_dashboard_data(db, timespan)
+    # 1W and 7D share a cache entry
+    delta_days = DashboardService.parse_timespan(timespan)
+
+    headers = await _data_validators(db, "dashboard", days=delta_days, points=points)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    key = response_cache.key("dashboard", days=delta_days, points=points)
+    labels, datasets = await response_cache.get_or_compute_async(
+        key,
+        lambda: run_db(
+            db, DashboardService.get_dashboard_data, f"{delta_days}D", points,
+            async_fn=DashboardService.get_dashboard_data_async,
+        ),
+    )
 
     # Build color mappings from energy_sources for frontend
     source_colors = {}
@@ -120,5 +221,29 @@ def dashboard(
         request,
         "dashboard.html",
         {"labels": labels, "datasets": datasets, "source_colors": source_colors},
-        headers=cache_header,
+        headers=headers,
     )
+
+
+# Sync on purpose: a cache miss waits on the render worker, so this runs in the threadpool
+@app.get("/images/{timestamp}.png")
+def image(request: Request, timestamp: str, db: Session = Depends(get_db)):
+    """
+    Chart of a stored interval, rendered into the image store on first request and
+    validated by the content hash of its mix. Other PNGs in 'out' are served as files.
+    """
+    stored = stored_chart(db, timestamp)
+    if stored is None:
+        path = OUT_DIR / f"{timestamp}.png"
+        if _is_hidden(path.name) or not path.is_file():
+            raise HTTPException(status_code=404, detail="Not Found")
+        return images_static.file_response(str(path), path.stat(), request.scope)
+
+    headers = {**cache_header, "ETag": f'"{stored.digest}"'}
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(stored.path, media_type="image/png", headers=headers)
+
+
+# Mount the 'out' folder to be served at '/images', after the routes so they take precedence
+app.mount("/images", images_static, name="images")
@@ -0,0 +1,46 @@
+import hashlib
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.requests import Request
+
+
+def parse_timestamp_or_none(timestamp: str | None) -> datetime | None:
+    """Parse a stored gen_instant timestamp, returning None if it has no usable offset."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else None
+
+
+def validators(route: str, version: str | None, last_modified: datetime | None = None, **params) -> dict[str, str]:
+    """
+    ``ETag`` (and ``Last-Modified`` when known) for a response that only changes when
+    ``version`` or the query ``params`` change.
+    """
+    digest = hashlib.sha1(repr((route, version, sorted(params.items()))).encode()).hexdigest()[:20]
+    headers = {"ETag": f'"{digest}"'}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified.timestamp(), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Whether the request's conditional headers match ``headers`` (If-None-Match takes precedence)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in headers:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False
+    return False
@@ -0,0 +1,161 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from os import getenv
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.app_state import AppState
+from src.service.image_store import image_catalog
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
+
+INGEST_LOCK_TTL_SECONDS = int(getenv("INGEST_LOCK_TTL_SECONDS", str(20 * 60)))
+DATA_VERSION_POLL_SECONDS = float(getenv("DATA_VERSION_POLL_SECONDS", "5"))
+
+
+def _process_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLock:
+    """
+    Lease on an ``app_state`` row, so exactly one process of a deployment runs a job at a
+    time. The lease expires after ``ttl_seconds``, so a crashed holder cannot keep it forever;
+    a long job keeps it by calling ``renew`` as it makes progress. A scheduled job passes its
+    ``cycle``, recorded in the row's ``version``, so it runs once per cycle rather than once
+    per process whose scheduler fires after the previous holder released the lease.
+    """
+
+    def __init__(self, name: str, ttl_seconds: int = INGEST_LOCK_TTL_SECONDS, owner: str | None = None) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or _process_id()
+
+    def acquire(self, db: Session, cycle: int | None = None) -> bool:
+        """
+        Take (or renew) the lease; False while another live process holds it, or when a
+        ``cycle`` was given and the lease was already taken for it (or a later one).
+        """
+        now = int(time.time())
+        conditions = [
+            AppState.name == self.name,
+            or_(AppState.owner.is_(None), AppState.owner == self.owner, AppState.expires_at < now),
+        ]
+        values = {"owner": self.owner, "expires_at": now + self.ttl_seconds}
+        if cycle is not None:
+            conditions.append(AppState.version < cycle)
+            values["version"] = cycle
+        taken = db.execute(update(AppState).where(*conditions).values(**values)).rowcount
+        if not taken:
+            try:
+                db.execute(insert(AppState).values(**{"name": self.name, "version": 0, **values}))
+            except IntegrityError:
+                # The row exists, and the lease is held or the cycle already ran
+                db.rollback()
+                return False
+        db.commit()
+        return True
+
+    def renew(self, db: Session) -> bool:
+        """Extend a lease this process holds by ``ttl_seconds``; False if it was lost."""
+        renewed = db.execute(
+            update(AppState)
+            .where(AppState.name == self.name, AppState.owner == self.owner)
+            .values(expires_at=int(time.time()) + self.ttl_seconds)
+        ).rowcount
+        db.commit()
+        return bool(renewed)
+
+    def release(self, db: Session) -> None:
+        db.execute(
+            update(AppState)
+            .where(AppState.name == self.name, AppState.owner == self.owner)
+            .values(owner=None, expires_at=None)
+        )
+        db.commit()
+
+
+class DataVersion:
+    """
+    Counter of ingested data shared through the database, so processes that did not run the
+    ingest (web workers) learn that their response cache and watermark are stale. Ingests
+    ``bump`` it in their transaction; readers ``refresh``, which queries the counter at most
+    once every ``poll_seconds``.
+    """
+
+    NAME = "data"
+
+    def __init__(self, poll_seconds: float = DATA_VERSION_POLL_SECONDS) -> None:
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._checked_at = float("-inf")
+
+    def bump(self, db: Session) -> None:
+        """Increment the counter as part of the caller's transaction."""
+        bumped = db.execute(
+            update(AppState).where(AppState.name == self.NAME).values(version=AppState.version + 1)
+        ).rowcount
+        if not bumped:
+            db.execute(insert(AppState).values(name=self.NAME, version=1))
+        version = db.scalar(select(AppState.version).where(AppState.name == self.NAME))
+        # This process invalidates its own caches on ingest
+        with self._lock:
+            self._version = version
+
+    def refresh(self, db: Session) -> bool:
+        """Drop this process's data caches if another process ingested since the last check."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.poll_seconds:
+                return False
+            self._checked_at = now
+            seen = self._version
+
+        version = db.scalar(select(AppState.version).where(AppState.name == self.NAME)) or 0
+        with self._lock:
+            self._version = version
+        if seen is None or version == seen:
+            return False
+
+        self._stale()
+        return True
+
+    def _stale(self) -> None:
+        """Drop what this process derived from the counted data."""
+        response_cache.invalidate()
+        gen_watermark.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._version = None
+            self._checked_at = float("-inf")
+
+
+class ImagesVersion(DataVersion):
+    """
+    Counter of charts written, bumped once the chart file is in place (after the data bump,
+    which commits before rendering), so other processes rebuild their image catalog when the
+    new image is there to be found.
+    """
+
+    NAME = "images"
+
+    def _stale(self) -> None:
+        image_catalog.rebuild()
+
+
+ingest_lock = LeaderLock("ingest")
+data_version = DataVersion()
+images_version = ImagesVersion()
+
+
+def fresh_watermark(db: Session) -> str | None:
+    """The ingest watermark, after picking up ingests by other processes."""
+    data_version.refresh(db)
+    return gen_watermark.get(db)
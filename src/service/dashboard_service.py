@@ -1,10 +1,17 @@
-from collections import defaultdict
 from datetime import datetime, timedelta, UTC
 
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from src.models.energy import GenInstant, energy_sources
-from src.service.db.gen_instant import get_by_dates
+from src.models.energy import GenMix, GenRollupDaily, GenRollupHourly, SOURCE_NAMES, energy_sources
+from src.models.shared import epoch_seconds, ercot_datetime
+from src.service.db.gen_mix import get_mix_series, get_mix_series_async, get_mixes, get_mixes_async
+from src.service.db.rollup import (
+    ROLLUP_MODELS, get_rollup_series, get_rollup_series_async, get_rollups_by_dates, get_rollups_by_dates_async
+)
+from src.service.downsample import bucket_means, lttb_indices
 
 
 class DashboardService:
@@ -21,6 +28,17 @@ class DashboardService:
         "solar",
         "power_storage",
     ]
+    ORDER_INDEX = dict(zip(CUSTOM_ORDER, range(len(CUSTOM_ORDER))))
+
+    # Default number of points sent to the chart per series
+    MAX_POINTS = 1000
+
+    DOWNSAMPLE_LTTB = "lttb"
+    DOWNSAMPLE_MEAN = "mean"
+
+    RESOLUTION_RAW = "raw"
+    RESOLUTION_HOUR = "hour"
+    RESOLUTION_DAY = "day"
 
     @staticmethod
     def parse_timespan(timespan: str) -> int:
@@ -35,7 +53,19 @@ class DashboardService:
         return delta_days if delta_days > 0 else 5
 
     @staticmethod
-    def get_dashboard_data(db: Session, timespan: str):
+    def get_dashboard_data(
+        db: Session,
+        timespan: str,
+        max_points: int | None = MAX_POINTS,
+        method: str = DOWNSAMPLE_LTTB,
+    ):
+        """
+        Build Chart.js labels and datasets for the given timespan.
+
+        :param max_points: Downsample to at most this many points; ``None`` keeps every interval.
+        :param method: ``"lttb"`` keeps the most shape-defining intervals, ``"mean"`` averages
+            equal-width time buckets.
+        """
         delta_days = DashboardService.parse_timespan(timespan)
 
         # Compute start and end timestamps
@@ -46,65 +76,142 @@ class DashboardService:
         end_time = datetime.now(UTC)
         start_time = end_time - timedelta(days=delta_days)
 
-        # Fetch entries
-        instants = get_by_dates(db, start_time, end_time)
+        # (sources x intervals) matrix, ordered by timestamp
+        labels, series = DashboardService._read_series(db, delta_days, max_points, start_time, end_time)
+        return DashboardService._chart_data(labels, series, max_points, method)
 
-        # sort by timestamp
-        instants.sort(key=lambda i: i.timestamp)
+    @staticmethod
+    async def get_dashboard_data_async(
+        db: AsyncSession,
+        timespan: str,
+        max_points: int | None = MAX_POINTS,
+        method: str = DOWNSAMPLE_LTTB,
+    ):
+        """``get_dashboard_data`` on an async session; downsampling runs in the threadpool."""
+        delta_days = DashboardService.parse_timespan(timespan)
+        end_time = datetime.now(UTC)
+        start_time = end_time - timedelta(days=delta_days)
 
-        # Prepare data for Chart.js
-        labels = [i.timestamp for i in instants]
+        labels, series = await DashboardService._read_series_async(db, delta_days, max_points, start_time, end_time)
+        return await run_in_threadpool(DashboardService._chart_data, labels, series, max_points, method)
 
-        # Map source_name -> list of generation values (aligned with instants)
-        source_data_map = DashboardService._build_source_data_map(instants)
+    @staticmethod
+    def _chart_data(labels: list[str], series: np.ndarray, max_points: int | None, method: str):
+        if max_points and len(labels) > max_points:
+            labels, series = DashboardService._downsample(labels, series, max_points, method)
 
-        datasets = DashboardService._build_datasets(source_data_map, len(instants))
+        datasets = DashboardService._build_datasets(SOURCE_NAMES, series)
 
         return labels, datasets
 
     @staticmethod
-    def _build_source_data_map(instants: list[GenInstant]) -> dict[str, list[float]]:
-        source_data_map = {}
-        for i_idx, instant in enumerate(instants):
-            for gs in instant.gen_sources:
-                name = gs.source.name
-                if name not in source_data_map:
-                    source_data_map[name] = [0.0] * len(instants)
-                source_data_map[name][i_idx] = gs.gen
-        return source_data_map
+    def get_mix_columns(
+        db: Session, start_time: datetime, end_time: datetime, resolution: str = RESOLUTION_RAW
+    ) -> tuple[list[str], dict[str, np.ndarray]]:
+        """
+        Generation between two times as columns: the interval (or bucket) labels and one
+        ``float64`` array per source. Hourly and daily resolutions are bucket averages.
+        """
+        if resolution == DashboardService.RESOLUTION_RAW:
+            labels, series = get_mix_series(db, start_time, end_time)
+        else:
+            labels, series = get_rollup_series(db, DashboardService._rollup_model(resolution), start_time, end_time)
+        return labels, dict(zip(SOURCE_NAMES, series))
 
     @staticmethod
-    def _build_datasets(
-        source_data_map: dict[str, list[float]], num_instants: int
-    ) -> list[dict]:
+    async def get_mix_columns_async(
+        db: AsyncSession, start_time: datetime, end_time: datetime, resolution: str = RESOLUTION_RAW
+    ) -> tuple[list[str], dict[str, np.ndarray]]:
+        """``get_mix_columns`` on an async session."""
+        if resolution == DashboardService.RESOLUTION_RAW:
+            labels, series = await get_mix_series_async(db, start_time, end_time)
+        else:
+            model = DashboardService._rollup_model(resolution)
+            labels, series = await get_rollup_series_async(db, model, start_time, end_time)
+        return labels, dict(zip(SOURCE_NAMES, series))
+
+    @staticmethod
+    def _rollup_model(resolution: str):
+        return GenRollupHourly if resolution == DashboardService.RESOLUTION_HOUR else GenRollupDaily
+
+    @staticmethod
+    def _read_series(
+        db: Session, delta_days: int, max_points: int | None, start_time: datetime, end_time: datetime
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Series from the coarsest rollup that still yields ``max_points`` buckets, or raw intervals.
+        A finer resolution is read when the stored data is too sparse to fill the buckets.
+        """
+        if max_points:
+            for model in ROLLUP_MODELS:
+                if delta_days * model.BUCKETS_PER_DAY >= max_points:
+                    labels, series = get_rollup_series(db, model, start_time, end_time)
+                    if len(labels) >= max_points:
+                        return labels, series
+        return get_mix_series(db, start_time, end_time)
+
+    @staticmethod
+    async def _read_series_async(
+        db: AsyncSession, delta_days: int, max_points: int | None, start_time: datetime, end_time: datetime
+    ) -> tuple[list[str], np.ndarray]:
+        """``_read_series`` on an async session."""
+        if max_points:
+            for model in ROLLUP_MODELS:
+                if delta_days * model.BUCKETS_PER_DAY >= max_points:
+                    labels, series = await get_rollup_series_async(db, model, start_time, end_time)
+                    if len(labels) >= max_points:
+                        return labels, series
+        return await get_mix_series_async(db, start_time, end_time)
+
+    @staticmethod
+    def _downsample(
+        labels: list[str], series: np.ndarray, max_points: int, method: str
+    ) -> tuple[list[str], np.ndarray]:
+        """Reduce every series to ``max_points`` shared intervals, keeping labels aligned."""
+        if method == DashboardService.DOWNSAMPLE_MEAN:
+            indices, series = bucket_means(series, max_points)
+        else:
+            indices = lttb_indices(series, max_points)
+            series = series[:, indices]
+
+        return [labels[i] for i in indices], series
+
+    @staticmethod
+    def _build_datasets(source_names: list[str], series: np.ndarray) -> list[dict]:
+        """
+        Chart.js datasets from a (sources x intervals) matrix whose rows follow ``source_names``.
+
+        Sources in CUSTOM_ORDER come first, in that order, followed by any others by name.
+        """
+        if series.size == 0:
+            return []
+
+        rows = {name: index for index, name in enumerate(source_names)}
+        ordered = [name for name in DashboardService.CUSTOM_ORDER if name in rows]
+        remaining = sorted(set(rows) - set(ordered))
+
         datasets = []
-        seen_sources = set(source_data_map.keys())
-
-        for source_name in DashboardService.CUSTOM_ORDER:
-            if source_name in seen_sources:
-                if source_name == "power_storage":
-                    datasets.extend(
-                        DashboardService._handle_power_storage(
-                            source_data_map[source_name]
-                        )
-                    )
-                else:
-                    datasets.append(
-                        {
-                            "label": source_name,
-                            "data": source_data_map[source_name],
-                            "fill": True if len(datasets) == 0 else "-1",
-                            "order": DashboardService.CUSTOM_ORDER.index(source_name),
-                        }
-                    )
-                seen_sources.remove(source_name)
+        for source_name in ordered:
+            if source_name == "power_storage":
+                datasets.extend(
+                    DashboardService._handle_power_storage(series[rows[source_name]])
+                )
+            else:
+                datasets.append(
+                    {
+                        "label": source_name,
+                        "data": series[rows[source_name]].tolist(),
+                        "fill": True if len(datasets) == 0 else "-1",
+                        "order": DashboardService.ORDER_INDEX[source_name],
+                    }
+                )
 
         # Add any remaining sources
-        for source_name in sorted(list(seen_sources)):
+        for source_name in remaining:
             datasets.append(
                 {
                     "label": source_name,
-                    "data": source_data_map[source_name],
+                    "data": series[rows[source_name]].tolist(),
                     "fill": "-1",
                     "order": 99,
                 }
@@ -128,29 +235,39 @@ class DashboardService:
         end_time = datetime.now(UTC)
         start_time = end_time - timedelta(days=days)
 
-        source_metadata = DashboardService._get_source_metadata()
+        rollups = get_rollups_by_dates(db, GenRollupDaily, start_time, end_time)
+        latest_mixes = get_mixes(db, [r.last_timestamp for r in rollups])
+        return DashboardService._generation_by_day(rollups, latest_mixes, days)
+
+    @staticmethod
+    async def get_generation_by_day_async(db: AsyncSession, days: int = 30):
+        """``get_generation_by_day`` on an async session; the chart and table are built in the threadpool."""
+        end_time = datetime.now(UTC)
+        start_time = end_time - timedelta(days=days)
+
+        rollups = await get_rollups_by_dates_async(db, GenRollupDaily, start_time, end_time)
+        latest_mixes = await get_mixes_async(db, [r.last_timestamp for r in rollups])
+        return await run_in_threadpool(DashboardService._generation_by_day, rollups, latest_mixes, days)
 
-        daily_data = defaultdict(lambda: defaultdict(float))
+    @staticmethod
+    def _generation_by_day(rollups: list[GenRollupDaily], latest_mixes: list[GenMix], days: int):
+        source_metadata = DashboardService._get_source_metadata()
 
-        instants = get_by_dates(db, start_time, end_time)
+        daily_data = {}
 
-        for instant in instants:
-            date = instant.timestamp[:10]
-            daily_gen = 0.0
-            daily_renewable = 0.0
+        latest_mixes = {mix.timestamp: mix for mix in latest_mixes}
 
-            for gs in instant.gen_sources:
-                source_name = gs.source.name
-                gen = gs.gen
-                daily_data[date][source_name] += gen
-                daily_gen += gen
-                if gs.source.renewable:
-                    daily_renewable += gen
+        for rollup in rollups:
+            # ERCOT's local day of the bucket, e.g. "2026-01-01"
+            date = ercot_datetime(epoch_seconds(rollup.bucket)).date().isoformat()
+            daily_data[date] = {name: getattr(rollup, f"{name}_sum") for name in SOURCE_NAMES}
 
-            daily_data[date]["total"] = daily_gen
-            daily_data[date]["renewable_gen"] = daily_renewable
+            # Table totals reflect the day's latest interval
+            latest = latest_mixes[rollup.last_timestamp]
+            daily_data[date]["total"] = latest.gen_total
+            daily_data[date]["renewable_gen"] = latest.gen_renewables
             daily_data[date]["renewable_pct"] = (
-                (daily_renewable / daily_gen * 100) if daily_gen > 0 else 0.0
+                (latest.gen_renewables / latest.gen_total * 100) if latest.gen_total > 0 else 0.0
             )
 
         sorted_dates = sorted(daily_data.keys())[-days:]
@@ -184,23 +301,24 @@ class DashboardService:
         return chart_data, table_data
 
     @staticmethod
-    def _handle_power_storage(data: list[float]) -> list[dict]:
+    def _handle_power_storage(data: np.ndarray) -> list[dict]:
         # create two data streams using data with positive or 0 values in one and negative or 0 in the other
-        positive_data = [value if value > 0 else 0 for value in data]
-        negative_data = [value if value < 0 else -0.001 for value in data]
+        data = np.asarray(data, dtype=np.float64)
+        positive_data = np.where(data > 0, data, 0.0)
+        negative_data = np.where(data < 0, data, -0.001)
 
-        order = DashboardService.CUSTOM_ORDER.index("power_storage")
+        order = DashboardService.ORDER_INDEX["power_storage"]
 
         return [
             {
                 "label": "power storage (discharging)",
-                "data": positive_data,
+                "data": positive_data.tolist(),
                 "fill": "-1",
                 "order": order,
             },
             {
                 "label": "power storage (charging)",
-                "data": negative_data,
+                "data": negative_data.tolist(),
                 "fill": True,
                 "order": order + 1,
             },
@@ -1,11 +1,20 @@
+import time
 from datetime import datetime
 
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from src.models.energy import GenInstant, GenSource
+from src.metrics import ingest_duplicates, ingest_rows, ingest_seconds
+from src.models.energy import GenInstant, GenMix, GenSource
+from src.models.shared import epoch_seconds
 from src.schema import schema
-from src.service.db.source_service import get_or_create_source
+from src.service.coordination import data_version
+from src.service.db.rollup import update_rollups
+from src.service.db.source_service import get_or_create_source, source_registry
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
 
 
 class GenInstantAlreadyExistsError(ValueError):
@@ -18,22 +27,34 @@ def get_gen_instant(db: Session, timestamp: str) -> GenInstant | None:
     return db.query(GenInstant).filter(GenInstant.timestamp == timestamp).first()
 
 
-def get_last_x_gen_instants(db: Session, n: int) -> list[GenInstant]:
-    return db.query(GenInstant).order_by(GenInstant.timestamp.desc()).limit(n).all()
+def _last_x_statement(n: int):
+    return select(GenInstant).order_by(GenInstant.epoch.desc()).limit(n)
 
 
-def get_by_dates(db: Session, start_time: datetime, end_time: datetime) -> list[GenInstant]:
+def _by_dates_statement(start_time: datetime, end_time: datetime):
     return (
-        db.query(GenInstant)
+        select(GenInstant)
         .options(joinedload(GenInstant.gen_sources).joinedload(GenSource.source))
-        .filter(
-            GenInstant.timestamp >= start_time.isoformat(),
-            GenInstant.timestamp <= end_time.isoformat(),
-        )
-        .all()
+        .where(GenInstant.epoch.between(epoch_seconds(start_time), epoch_seconds(end_time)))
     )
 
 
+def get_last_x_gen_instants(db: Session, n: int) -> list[GenInstant]:
+    return list(db.scalars(_last_x_statement(n)))
+
+
+def get_by_dates(db: Session, start_time: datetime, end_time: datetime) -> list[GenInstant]:
+    return list(db.scalars(_by_dates_statement(start_time, end_time)).unique())
+
+
+async def get_last_x_gen_instants_async(db: AsyncSession, n: int) -> list[GenInstant]:
+    return list(await db.scalars(_last_x_statement(n)))
+
+
+async def get_by_dates_async(db: AsyncSession, start_time: datetime, end_time: datetime) -> list[GenInstant]:
+    return list((await db.scalars(_by_dates_statement(start_time, end_time))).unique())
+
+
 def create_gen_instant(db: Session, gen_instant: schema.GenInstantCreate, commit: bool = True) -> GenInstant:
     # Friendly early failure (fast path)
     existing = get_gen_instant(db, gen_instant.timestamp)
@@ -47,24 +68,109 @@ def create_gen_instant(db: Session, gen_instant: schema.GenInstantCreate, commit
 
     db_gen_instant = GenInstant(gen_instant.timestamp, gen_sources)
     db.add(db_gen_instant)
+    mix_values = GenMix.values_for(gen_instant.timestamp, gen_instant.sources)
+    db.add(GenMix(**mix_values))
+    update_rollups(db, [mix_values])
 
     if commit:
         try:
+            data_version.bump(db)
             db.commit()
         except IntegrityError:
             # Handles race condition: another transaction inserted the same timestamp.
             db.rollback()
             raise GenInstantAlreadyExistsError(gen_instant.timestamp)
 
+        gen_watermark.advance(gen_instant.timestamp)
+        response_cache.invalidate()
         db.refresh(db_gen_instant)
 
     return db_gen_instant
 
 
+def get_existing_timestamps(db: Session, timestamps: set[str]) -> set[str]:
+    """Return the subset of ``timestamps`` that is already stored, using one IN query."""
+    if not timestamps:
+        return set()
+    return set(db.scalars(select(GenInstant.timestamp).where(GenInstant.timestamp.in_(timestamps))))
+
+
+def _insert_new_instances(db: Session, gen_instants: list[schema.GenInstantCreate]) -> dict[str, int]:
+    """Insert and commit the intervals not stored yet. Returns the new ids by timestamp, in input order."""
+    started = time.perf_counter()
+
+    # Keep the first occurrence of each timestamp, in input order
+    pending: dict[str, schema.GenInstantCreate] = {}
+    for gen_instant in gen_instants:
+        pending.setdefault(gen_instant.timestamp, gen_instant)
+
+    existing = get_existing_timestamps(db, set(pending))
+    new_instants = [gen_instant for timestamp, gen_instant in pending.items() if timestamp not in existing]
+    ingest_duplicates.inc(len(gen_instants) - len(new_instants))
+    if not new_instants:
+        if existing:
+            # Already stored, e.g. by a batch saved before the watermark was rewound
+            gen_watermark.advance(max(existing, key=epoch_seconds))
+        ingest_seconds.observe(time.perf_counter() - started)
+        return {}
+
+    sources = source_registry.resolve(db, {label for gen_instant in new_instants for label in gen_instant.sources})
+
+    db.execute(
+        insert(GenInstant),
+        [
+            {
+                "timestamp": gen_instant.timestamp,
+                "epoch": epoch_seconds(gen_instant.timestamp),
+                **GenInstant.totals_for(gen_instant.sources),
+            }
+            for gen_instant in new_instants
+        ],
+    )
+    instant_ids = dict(
+        db.execute(
+            select(GenInstant.timestamp, GenInstant.id).where(
+                GenInstant.timestamp.in_([gen_instant.timestamp for gen_instant in new_instants])
+            )
+        ).all()
+    )
+    db.execute(
+        insert(GenSource),
+        [
+            {"gen": gen, "source_id": sources[label].id, "gen_instant_id": instant_ids[gen_instant.timestamp]}
+            for gen_instant in new_instants
+            for label, gen in gen_instant.sources.items()
+        ],
+    )
+    mix_values = [GenMix.values_for(gen_instant.timestamp, gen_instant.sources) for gen_instant in new_instants]
+    db.execute(insert(GenMix), mix_values)
+    update_rollups(db, mix_values)
+    data_version.bump(db)
+    db.commit()
+    gen_watermark.advance(max((gen_instant.timestamp for gen_instant in new_instants), key=epoch_seconds))
+    response_cache.invalidate()
+    ingest_rows.inc(len(new_instants))
+    ingest_seconds.observe(time.perf_counter() - started)
+    return {gen_instant.timestamp: instant_ids[gen_instant.timestamp] for gen_instant in new_instants}
+
+
+def insert_gen_instances(db: Session, gen_instants: list[schema.GenInstantCreate]) -> int:
+    """
+    ``create_gen_instances`` without loading the created rows back: returns how many were
+    created. For bulk loads that only need the count.
+    """
+    return len(_insert_new_instances(db, gen_instants))
+
+
 def create_gen_instances(db: Session, gen_instants: list[schema.GenInstantCreate]) -> list[GenInstant]:
     """
     Create multiple gen instant records in a single transaction, while skipping any duplicates.
 
+    Existing timestamps are fetched with one query and every source is resolved once, so the
+    number of round trips no longer grows with the number of rows. New ``gen_instant``,
+    ``gen_source`` and ``gen_mix`` rows are each written with a single executemany, and the
+    rollup buckets they touch are updated in place.
+
     Args:
         db (Session): Database session.
         gen_instants (list[schema.GenInstantCreate]): List of gen instant creation schemas.
@@ -72,14 +178,17 @@ def create_gen_instances(db: Session, gen_instants: list[schema.GenInstantCreate
     Returns:
         list[GenInstant]: List of created gen instant records.
     """
+    instant_ids = _insert_new_instances(db, gen_instants)
+    if not instant_ids:
+        return []
 
-    instants_to_commit = []
-    for gen_instant in gen_instants:
-        try:
-            created_instant = create_gen_instant(db, gen_instant, commit=False)
-            instants_to_commit.append(created_instant)
-        except GenInstantAlreadyExistsError:
-            # Skip duplicates
-            continue
-    db.commit()
-    return instants_to_commit
+    # Sources are not joined: they come from the identity map (or one lookup each) when accessed
+    created = (
+        db.query(GenInstant)
+        .options(selectinload(GenInstant.gen_sources))
+        .filter(GenInstant.id.in_(instant_ids.values()))
+        .all()
+    )
+    order = {timestamp: index for index, timestamp in enumerate(instant_ids)}
+    created.sort(key=lambda instant: order[instant.timestamp])
+    return created
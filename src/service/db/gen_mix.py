@@ -0,0 +1,76 @@
+from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.models.energy import GenMix, SOURCE_NAMES
+from src.models.shared import epoch_seconds
+
+
+def get_gen_mix(db: Session, timestamp: str) -> GenMix | None:
+    return db.query(GenMix).filter(GenMix.timestamp == timestamp).first()
+
+
+def _mix_by_dates_statement(start_time: datetime, end_time: datetime):
+    return (
+        select(GenMix)
+        .where(GenMix.epoch.between(epoch_seconds(start_time), epoch_seconds(end_time)))
+        .order_by(GenMix.epoch)
+    )
+
+
+def _mix_series_statement(start_time: datetime, end_time: datetime):
+    return (
+        select(GenMix.timestamp, *[getattr(GenMix, name) for name in SOURCE_NAMES])
+        .where(GenMix.epoch.between(epoch_seconds(start_time), epoch_seconds(end_time)))
+        .order_by(GenMix.epoch)
+    )
+
+
+def get_mix_by_dates(db: Session, start_time: datetime, end_time: datetime) -> list[GenMix]:
+    return list(db.scalars(_mix_by_dates_statement(start_time, end_time)))
+
+
+async def get_mix_by_dates_async(db: AsyncSession, start_time: datetime, end_time: datetime) -> list[GenMix]:
+    return list(await db.scalars(_mix_by_dates_statement(start_time, end_time)))
+
+
+def get_mixes(db: Session, timestamps: list[str]) -> list[GenMix]:
+    if not timestamps:
+        return []
+    return list(db.scalars(select(GenMix).where(GenMix.timestamp.in_(timestamps))))
+
+
+async def get_mixes_async(db: AsyncSession, timestamps: list[str]) -> list[GenMix]:
+    if not timestamps:
+        return []
+    return list(await db.scalars(select(GenMix).where(GenMix.timestamp.in_(timestamps))))
+
+
+def get_mix_series(db: Session, start_time: datetime, end_time: datetime) -> tuple[list[str], np.ndarray]:
+    """
+    Timestamps and a (len(SOURCE_NAMES) x intervals) ``float64`` matrix of generation,
+    ordered by timestamp, fetched in one pass without building ORM objects.
+    """
+    rows = db.execute(_mix_series_statement(start_time, end_time)).all()
+    return list(map(itemgetter(0), rows)), series_matrix(rows, len(SOURCE_NAMES))
+
+
+async def get_mix_series_async(
+    db: AsyncSession, start_time: datetime, end_time: datetime
+) -> tuple[list[str], np.ndarray]:
+    """``get_mix_series`` on an async session."""
+    rows = (await db.execute(_mix_series_statement(start_time, end_time))).all()
+    return list(map(itemgetter(0), rows)), series_matrix(rows, len(SOURCE_NAMES))
+
+
+def series_matrix(rows, width: int) -> np.ndarray:
+    """Transpose result rows of ``(label, value_1, ..., value_width)`` into a (width x rows) matrix."""
+    values = np.fromiter(
+        chain.from_iterable(map(itemgetter(slice(1, None)), rows)), dtype=np.float64, count=len(rows) * width
+    )
+    return values.reshape(len(rows), width).T
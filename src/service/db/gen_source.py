@@ -11,7 +11,12 @@ def get_source_gens(db: Session, source_name: str) -> List[energy_models.GenSour
     source = get_source(db, source_name)
     if source is None:
         raise ValueError(f"Source '{source_name}' not found")
-    return db.query(energy_models.GenSource).filter(energy_models.GenSource.source.name == source_name).all()
+    return (
+        db.query(energy_models.GenSource)
+        .filter(energy_models.GenSource.source_id == source.id)
+        .order_by(energy_models.GenSource.gen_instant_id)
+        .all()
+    )
 
 
 def create_source_gen(db: Session, gen_source: schema.GenSourceCreate) -> energy_models.GenSource:
@@ -0,0 +1,191 @@
+from datetime import datetime
+from typing import Type
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from src.db.database import get_writer_db_context
+from src.logger.logger import get_logger
+from src.models.energy import GenMix, GenRollupDaily, GenRollupHourly, GenRollupMixin, ROLLUP_STATS, SOURCE_NAMES
+from src.models.shared import epoch_label, epoch_seconds, ercot_timestamp
+from src.service.db.gen_mix import series_matrix
+
+logger = get_logger(__name__)
+
+# Coarsest first
+ROLLUP_MODELS: list[Type[GenRollupMixin]] = [GenRollupDaily, GenRollupHourly]
+
+
+def _bucket_range(model: Type[GenRollupMixin], start_time: datetime, end_time: datetime) -> tuple:
+    """Filter on the buckets overlapping ``start_time`` to ``end_time``."""
+    return (
+        model.bucket >= epoch_label(model.bucket_start(epoch_seconds(start_time))),
+        model.bucket <= epoch_label(model.bucket_start(epoch_seconds(end_time))),
+    )
+
+
+def _interval_values(mix: dict) -> dict:
+    """Rollup values of a single interval."""
+    return {
+        "count": 1,
+        "last_timestamp": mix["timestamp"],
+        "gen_total_sum": mix["gen_total"],
+        "gen_renewables_sum": mix["gen_renewables"],
+        **{f"{name}_{stat}": mix[name] for name in SOURCE_NAMES for stat in ROLLUP_STATS},
+    }
+
+
+def _bucket_values(model: Type[GenRollupMixin], mixes: list[dict]) -> dict[str, dict]:
+    """Aggregate gen_mix column values into rollup rows keyed by bucket."""
+    return _fold(model, ((mix["epoch"], _interval_values(mix)) for mix in mixes))
+
+
+def _fold(model: Type[GenRollupMixin], rows) -> dict[str, dict]:
+    """Merge ``(epoch, rollup values)`` pairs into rollup rows keyed by the bucket of the epoch."""
+    buckets: dict[str, dict] = {}
+    for epoch, values in rows:
+        bucket = epoch_label(model.bucket_start(epoch))
+        if bucket in buckets:
+            _merge(buckets[bucket], values)
+        else:
+            buckets[bucket] = {**values, "bucket": bucket}
+    return buckets
+
+
+def _merge(row: dict, other: dict) -> None:
+    row["count"] += other["count"]
+    # Stored timestamps come in more than one format, so compare instants rather than strings
+    if epoch_seconds(other["last_timestamp"]) > epoch_seconds(row["last_timestamp"]):
+        row["last_timestamp"] = other["last_timestamp"]
+    row["gen_total_sum"] += other["gen_total_sum"]
+    row["gen_renewables_sum"] += other["gen_renewables_sum"]
+    for name in SOURCE_NAMES:
+        row[f"{name}_sum"] += other[f"{name}_sum"]
+        row[f"{name}_min"] = min(row[f"{name}_min"], other[f"{name}_min"])
+        row[f"{name}_max"] = max(row[f"{name}_max"], other[f"{name}_max"])
+
+
+def update_rollups(db: Session, mixes: list[dict]) -> None:
+    """
+    Fold newly inserted intervals into every rollup table.
+
+    ``mixes`` are gen_mix column values (see ``GenMix.values_for``) of intervals that were
+    not stored before. Only the buckets they touch are read and written. Does not commit.
+    """
+    if not mixes:
+        return
+
+    # updated_at is left to its onupdate default
+    columns = [
+        column.key for column in GenRollupHourly.__table__.columns if column.key not in ("id", "created_at", "updated_at")
+    ]
+    for model in ROLLUP_MODELS:
+        buckets = _bucket_values(model, mixes)
+        existing = db.execute(
+            select(model.id, *[getattr(model, key) for key in columns]).where(model.bucket.in_(buckets))
+        ).mappings().all()
+
+        updates = []
+        for row in existing:
+            merged = {key: row[key] for key in columns}
+            _merge(merged, buckets.pop(row["bucket"]))
+            updates.append({"id": row["id"], **merged})
+
+        if updates:
+            db.execute(update(model), updates)
+        if buckets:
+            db.execute(insert(model), list(buckets.values()))
+
+
+def rebuild_rollups(db: Session) -> None:
+    """
+    Recompute every rollup table from gen_mix. Intervals are aggregated per hour in SQL, and
+    the hours folded into the coarser buckets, whose bounds depend on the local time zone.
+    """
+    latest = aliased(GenMix)
+    start = GenMix.epoch - GenMix.epoch % GenRollupHourly.BUCKET_SECONDS
+    aggregates = {
+        "count": func.count(),
+        "last_epoch": func.max(GenMix.epoch),
+        "gen_total_sum": func.sum(GenMix.gen_total),
+        "gen_renewables_sum": func.sum(GenMix.gen_renewables),
+    }
+    for name in SOURCE_NAMES:
+        aggregates[f"{name}_sum"] = func.sum(getattr(GenMix, name))
+        aggregates[f"{name}_min"] = func.min(getattr(GenMix, name))
+        aggregates[f"{name}_max"] = func.max(getattr(GenMix, name))
+
+    grouped = (
+        select(start.label("start"), *[value.label(key) for key, value in aggregates.items()])
+        .group_by(start)
+        .subquery()
+    )
+    last_timestamp = select(latest.timestamp).where(latest.epoch == grouped.c.last_epoch).limit(1).scalar_subquery()
+    keys = [key for key in aggregates if key != "last_epoch"]
+    hours = [
+        (row["start"], {"last_timestamp": row["last_timestamp"], **{key: row[key] for key in keys}})
+        for row in db.execute(select(grouped, last_timestamp.label("last_timestamp"))).mappings()
+    ]
+
+    for model in ROLLUP_MODELS:
+        buckets = _fold(model, hours)
+        db.execute(delete(model))
+        if buckets:
+            db.execute(insert(model), list(buckets.values()))
+    db.commit()
+
+
+def _rollups_statement(model: Type[GenRollupMixin], start_time: datetime, end_time: datetime):
+    return select(model).where(*_bucket_range(model, start_time, end_time)).order_by(model.bucket)
+
+
+def _rollup_series_statement(model: Type[GenRollupMixin], start_time: datetime, end_time: datetime):
+    return (
+        select(model.bucket, *[getattr(model, f"{name}_sum") for name in SOURCE_NAMES], model.count)
+        .where(*_bucket_range(model, start_time, end_time))
+        .order_by(model.bucket)
+    )
+
+
+def _averages(rows) -> tuple[list[str], np.ndarray]:
+    sums = series_matrix(rows, len(SOURCE_NAMES) + 1)
+    return [ercot_timestamp(epoch_seconds(row[0])) for row in rows], sums[:-1] / sums[-1]
+
+
+def get_rollups_by_dates(
+    db: Session, model: Type[GenRollupMixin], start_time: datetime, end_time: datetime
+) -> list[GenRollupMixin]:
+    """Rollup rows of the buckets from ``start_time`` to ``end_time``, ordered by bucket."""
+    return list(db.scalars(_rollups_statement(model, start_time, end_time)))
+
+
+async def get_rollups_by_dates_async(
+    db: AsyncSession, model: Type[GenRollupMixin], start_time: datetime, end_time: datetime
+) -> list[GenRollupMixin]:
+    """``get_rollups_by_dates`` on an async session."""
+    return list(await db.scalars(_rollups_statement(model, start_time, end_time)))
+
+
+def get_rollup_series(
+    db: Session, model: Type[GenRollupMixin], start_time: datetime, end_time: datetime
+) -> tuple[list[str], np.ndarray]:
+    """
+    Bucket starts in local time (see ``ercot_timestamp``) and a (len(SOURCE_NAMES) x buckets)
+    ``float64`` matrix of average generation per bucket, ordered by bucket.
+    """
+    return _averages(db.execute(_rollup_series_statement(model, start_time, end_time)).all())
+
+
+async def get_rollup_series_async(
+    db: AsyncSession, model: Type[GenRollupMixin], start_time: datetime, end_time: datetime
+) -> tuple[list[str], np.ndarray]:
+    """``get_rollup_series`` on an async session."""
+    return _averages((await db.execute(_rollup_series_statement(model, start_time, end_time))).all())
+
+
+if __name__ == "__main__":
+    with get_writer_db_context() as session:
+        rebuild_rollups(session)
+        logger.info("Rebuilt rollups: %s", ", ".join(model.__tablename__ for model in ROLLUP_MODELS))
@@ -1,3 +1,7 @@
+import threading
+from typing import NamedTuple
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.models import energy as energy_models
@@ -5,10 +9,80 @@ from src.models.energy import energy_sources
 from src.schema import schema
 
 
+class SourceEntry(NamedTuple):
+    id: int
+    name: str
+    renewable: bool
+
+
+class SourceRegistry:
+    """
+    Process-wide lookup of persisted sources by label (e.g. "Coal and Lignite") or
+    canonical name (e.g. "coal").
+
+    The source table only holds the rows defined by ``energy_sources``, so it is read once
+    (by ``seed`` at startup, or on first use) and re-read only when an unknown label shows up.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, SourceEntry] = {}
+
+    def load(self, db: Session) -> None:
+        """(Re)read every source from the database."""
+        labels = {meta["name"]: label for label, meta in energy_sources.items()}
+        entries = {}
+        for source_id, name, renewable in db.execute(
+            select(energy_models.Source.id, energy_models.Source.name, energy_models.Source.renewable)
+        ):
+            entry = SourceEntry(source_id, name, renewable)
+            entries[name] = entry
+            if name in labels:
+                entries[labels[name]] = entry
+        with self._lock:
+            self._entries = entries
+
+    def get(self, key: str) -> SourceEntry | None:
+        """The source for a label or canonical name, if it is known."""
+        return self._entries.get(key)
+
+    def resolve(self, db: Session, source_labels: set[str]) -> dict[str, SourceEntry]:
+        """
+        Map labels to sources without querying the database when they are all known.
+        Otherwise the registry is reloaded once and sources that still do not exist are
+        created (and flushed, not committed) in ``db``.
+        """
+        entries = self._entries
+        resolved = {label: entries[label] for label in source_labels if label in entries}
+        missing = source_labels - resolved.keys()
+        if not missing:
+            return resolved
+
+        self.load(db)
+        entries = self._entries
+        resolved.update({label: entries[label] for label in missing if label in entries})
+        missing -= resolved.keys()
+        if missing:
+            # Registered on the next reload, once the transaction that creates them has committed
+            created = get_or_create_sources(db, missing)
+            resolved.update({
+                label: SourceEntry(source.id, source.name, source.renewable) for label, source in created.items()
+            })
+        return resolved
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+
+
+source_registry = SourceRegistry()
+
+
 def seed(db: Session):
     for source in energy_sources.keys():
         get_or_create_source(db, source)
         db.commit()
+    source_registry.load(db)
 
 
 def get_source(db: Session, name: str) -> energy_models.Source | None:
@@ -26,7 +100,8 @@ def get_or_create_source(db: Session, source_label: str) -> energy_models.Source
     """
     source_meta = energy_models.Source.metadata_for(source_label)
     canonical_name = source_meta["name"]
-    existing = get_source(db, canonical_name)
+    entry = source_registry.get(canonical_name)
+    existing = db.get(energy_models.Source, entry.id) if entry else get_source(db, canonical_name)
     if existing is not None:
         return existing
 
@@ -36,6 +111,33 @@ def get_or_create_source(db: Session, source_label: str) -> energy_models.Source
     return db_source
 
 
+def get_or_create_sources(db: Session, source_labels: set[str]) -> dict[str, energy_models.Source]:
+    """
+    Resolve many source labels with a single SELECT.
+
+    Returns a mapping of human label (e.g. "Coal and Lignite") to persisted Source.
+    Missing sources are created and flushed together.
+    """
+    names = {label: energy_models.Source.metadata_for(label)["name"] for label in source_labels}
+    if not names:
+        return {}
+
+    existing = {
+        source.name: source
+        for source in db.query(energy_models.Source).filter(energy_models.Source.name.in_(set(names.values())))
+    }
+
+    resolved = {}
+    for label, name in names.items():
+        if name not in existing:
+            existing[name] = energy_models.Source(label)
+            db.add(existing[name])
+        resolved[label] = existing[name]
+
+    db.flush()
+    return resolved
+
+
 def create_source(db: Session, source: schema.SourceCreate) -> energy_models.Source:
     # Keep this as an explicit "create + commit" API if you want it elsewhere.
     db_source = get_or_create_source(db, source.name)
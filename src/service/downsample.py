@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def lttb_indices(series: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Pick ``threshold`` column indices of ``series`` with Largest-Triangle-Three-Buckets.
+
+    ``series`` is a 2-D array (sources x intervals). All rows share the selected indices,
+    so labels and stacked series stay aligned. Each row is scaled by its range before the
+    triangle areas are summed, so large sources do not drown out small ones.
+
+    :param series: Values to downsample, one row per series.
+    :param threshold: Number of points to keep, including the first and last.
+    :return: Sorted indices into the interval axis.
+    """
+    series = np.atleast_2d(np.asarray(series, dtype=np.float64))
+    n = series.shape[1]
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    scale = np.ptp(series, axis=1)
+    scale[scale == 0] = 1.0
+    y = series / scale[:, None]
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = y[:, next_start:next_end].mean(axis=1)
+
+        xs = np.arange(start, end)
+        area = np.abs(
+            (a - avg_x) * (y[:, start:end] - y[:, a, None])
+            - (a - xs) * (avg_y - y[:, a])[:, None]
+        ).sum(axis=0)
+
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def bucket_means(series: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Average ``series`` (sources x intervals) over ``threshold`` equal-width buckets.
+
+    :return: The index of the first interval of each bucket, and the bucket means.
+    """
+    series = np.atleast_2d(np.asarray(series, dtype=np.float64))
+    n = series.shape[1]
+    if threshold >= n or threshold < 1:
+        return np.arange(n), series
+
+    starts = (np.arange(threshold) * n / threshold).astype(np.int64)
+    counts = np.diff(np.append(starts, n))
+    means = np.add.reduceat(series, starts, axis=1) / counts
+    return starts, means
@@ -1,32 +1,37 @@
-from datetime import datetime
-from typing import Dict, List, Tuple, Any
+import argparse
+import hashlib
+import json
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Any
 
-import numpy as np
-import requests
-from matplotlib import pyplot as plt
+from sqlalchemy.orm import Session
 
-from src.db.database import SessionLocal
+from src.db.database import SessionLocal, WriterSessionLocal
 from src.logger.logger import get_logger
+from src.models.energy import GenMix, energy_sources
+from src.models.shared import epoch_seconds, ercot_datetime
 from src.schema import schema
-from src.service.db.gen_instant import create_gen_instances
+from src.service.coordination import LeaderLock, images_version
+from src.service.db.gen_instant import insert_gen_instances
+from src.service.db.gen_mix import get_gen_mix, get_mix_by_dates
+from src.service.fetcher import ERCOT_API_URL, ErcotFetcher, ercot_fetcher
+from src.service.image_store import ImageStore, StoredImage, image_store
+from src.service.renderer import ChartRenderer, PieChart, chart_renderer
+from src.service.watermark import gen_watermark
 
 logger = get_logger(__name__)
 
-
-def _latest_key(mapping: Dict[str, Any]) -> str:
-    if not mapping:
-        raise ValueError("ERCOT API returned an empty data structure.")
-    return max(mapping.keys())
+# Bump when the way charts are drawn changes, so stored charts are rendered again
+CHART_RENDER_VERSION = 1
 
 
 class Ercot:
-    FIGURE_SIZE = (8, 6)
-    CHART_START_ANGLE = 140
     RENEWABLE_SOURCES = {'Hydro', 'Nuclear', 'Other', 'Power Storage', 'Solar', 'Wind'}
-    DATE_FORMAT = '%Y-%m-%d %H:%M:%S-%f'
     DISPLAY_DATE_FORMAT = '%b %d, %Y %I:%M %p'
-    ERCOT_API_URL = 'https://www.ercot.com/api/1/services/read/dashboards/fuel-mix.json'
-    REQUEST_TIMEOUT_SECONDS = 15
+    ERCOT_API_URL = ERCOT_API_URL
+    # Intervals written per transaction while the payload streams in (a day of 5-minute intervals)
+    INGEST_BATCH_SIZE = 288
 
     FUEL_KEYS = {
         "coal": "Coal and Lignite",
@@ -39,13 +44,28 @@ class Ercot:
         "wind": "Wind",
     }
 
-    def __init__(self, image_file: str = None) -> None:
+    def __init__(
+        self,
+        image_file: str = None,
+        fetcher: ErcotFetcher = None,
+        renderer: ChartRenderer = None,
+        store: ImageStore = None,
+        lock: LeaderLock = None,
+    ) -> None:
         """
         Initialize the FuelMix class.
 
         :param image_file: Path to the image file where the fuel mix chart will be saved.
+        :param fetcher: Client used to download the fuel mix; defaults to the shared pooled one.
+        :param renderer: Chart render worker; defaults to the shared one.
+        :param store: Where charts are kept; defaults to the shared out/ image store.
+        :param lock: Lease held by the caller for the ingest, renewed after every saved batch.
         """
         self.image_file = image_file or 'ercot_mix.png'
+        self.fetcher = fetcher or ercot_fetcher
+        self.renderer = renderer or chart_renderer
+        self.store = store or image_store
+        self.lock = lock
         self.timestamp: str = ""
         self.mix: Dict[str, Dict[str, Any]] = {}
         self.title: str = ""
@@ -100,25 +120,30 @@ class Ercot:
     def _process_gen_data(self) -> None:
         """Process fuel mix data and generate visualization."""
         self._fetch_fuel_mix()
-        self._generate_text()
+        if self.mix:
+            self._generate_text()
 
     def _fetch_fuel_mix(self) -> None:
         """Fetch and extract the current generation mix from ERCOT API."""
         logger.debug('')
-        response = requests.get(self.ERCOT_API_URL, timeout=self.REQUEST_TIMEOUT_SECONDS)
-        response.raise_for_status()
-        data = response.json()['data']
+        intervals = self.fetcher.fetch_intervals()
+        if intervals is None:
+            logger.info("Fuel mix unchanged since the last fetch")
+            return
 
-        self._process_gen_mixes(data)
+        latest = self._process_gen_mixes(intervals)
+        if latest is None:
+            raise ValueError("ERCOT API returned an empty data structure.")
 
-        # Get the most recent day's fuel mix
-        current_day_key = _latest_key(data)
-        current_day_mix = data[current_day_key]
+        # The most recent interval of the payload
+        self._set_mix(*latest)
 
-        # Get the most recent time mix
-        current_mix_key = _latest_key(current_day_mix)
-        self.mix = current_day_mix[current_mix_key]
-        self.timestamp = current_mix_key
+        logger.info(
+            f'{self.renewable_gen:.1f}/{self.total_gen:.1f}MW {self.renewable_pct:.1f}% Renewable ({self.timestamp})')
+
+    def _set_mix(self, timestamp: str, mix: Dict[str, Any]) -> None:
+        self.timestamp = timestamp
+        self.mix = mix
 
         # Populate fields from the response using a single source of truth for keys
         self.coal = float(self.mix[self.FUEL_KEYS["coal"]]['gen'])
@@ -130,26 +155,83 @@ class Ercot:
         self.solar = float(self.mix[self.FUEL_KEYS["solar"]]['gen'])
         self.wind = float(self.mix[self.FUEL_KEYS["wind"]]['gen'])
 
-        logger.info(
-            f'{self.renewable_gen:.1f}/{self.total_gen:.1f}MW {self.renewable_pct:.1f}% Renewable ({self.timestamp})')
-
-    def _process_gen_mixes(self, data: Dict[str, Any]):
-        gen_instants = []
-        for day in data.values():
-            for timestamp, mix_data in day.items():
-                mix = {key: value['gen'] for key, value in mix_data.items()}
-                gen_instants.append(schema.GenInstantCreate(
+    def _process_gen_mixes(self, intervals: Iterable[Tuple[str, Dict[str, Any]]]) -> Tuple[str, Dict[str, Any]] | None:
+        """
+        Store the intervals newer than the ingest watermark as they are parsed, in batches of
+        ``INGEST_BATCH_SIZE``, and return the latest ``(timestamp, interval)`` of the payload.
+        Once a batch fails, the rest are not stored, and the watermark is moved back before
+        the earliest interval left out, so the next ingest stores it even if a later batch
+        with newer intervals was saved first.
+        """
+        latest = None
+        latest_epoch = None
+        batch: List[schema.GenInstantCreate] = []
+        saved = 0
+        # (epoch, timestamp) of the earliest interval left out after a failed batch
+        unsaved: Tuple[int, str] | None = None
+
+        with WriterSessionLocal() as db:
+            watermark = gen_watermark.get(db)
+            watermark_epoch = epoch_seconds(watermark) if watermark is not None else None
+
+            for timestamp, mix_data in intervals:
+                epoch = epoch_seconds(timestamp)
+                if latest_epoch is None or epoch > latest_epoch:
+                    latest, latest_epoch = (timestamp, mix_data), epoch
+                if watermark_epoch is not None and epoch <= watermark_epoch:
+                    continue
+                if unsaved is not None:
+                    unsaved = min(unsaved, (epoch, timestamp))
+                    continue
+
+                batch.append(schema.GenInstantCreate(
                     timestamp=timestamp,
-                    sources=mix
+                    sources={key: value['gen'] for key, value in mix_data.items()}
                 ))
+                if len(batch) >= self.INGEST_BATCH_SIZE:
+                    unsaved = self._save_batch(db, batch)
+                    saved += 0 if unsaved else len(batch)
+                    batch = []
+
+            if batch and unsaved is None:
+                unsaved = self._save_batch(db, batch)
+                saved += 0 if unsaved else len(batch)
+
+            if unsaved is not None:
+                gen_watermark.rewind(db, unsaved[1])
+
+        if saved:
+            logger.info("Saved gen instances for %d timestamps", saved)
+        elif unsaved is None:
+            logger.info("No intervals newer than %s", watermark)
+        return latest
+
+    def _save_batch(self, db: Session, batch: List[schema.GenInstantCreate]) -> Tuple[int, str] | None:
+        """Store ``batch``; returns the ``(epoch, timestamp)`` of its earliest interval if that failed."""
         try:
-            with SessionLocal() as db:
-                created_instances = create_gen_instances(db, gen_instants)
-                logger.info("Saved gen instances for %d timestamps", len(created_instances))
+            insert_gen_instances(db, batch)
         except Exception as e:
+            db.rollback()
+            # Download the full payload again next time rather than trusting a 304
+            self.fetcher.forget()
             # use debug because this is expected
             logger.warning(
-                f"Failed to save gen instances for {len(gen_instants)} timestamps: {e}")
+                f"Failed to save gen instances for {len(batch)} timestamps: {e}")
+            return min((epoch_seconds(gen_instant.timestamp), gen_instant.timestamp) for gen_instant in batch)
+        self._renew_lock(db)
+        return None
+
+    def _renew_lock(self, db: Session) -> None:
+        """Keep the ingest lease while a long payload is being stored."""
+        if self.lock is None:
+            return
+        try:
+            if not self.lock.renew(db):
+                # Saving is idempotent, so the ingest goes on; the next cycle takes turns again
+                logger.warning("Lost the %s lock during the ingest", self.lock.name)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to renew the {self.lock.name} lock: {e}")
 
     def _prepare_chart_data(self) -> Tuple[List[str], List[float], List[str], List[float]]:
         """Prepare data for chart visualization."""
@@ -164,8 +246,8 @@ class Ercot:
         return labels, values, legend_labels, explodes
 
     def _generate_text(self) -> None:
-        """Generate formatted chart title with timestamp."""
-        dt = datetime.strptime(self.timestamp, self.DATE_FORMAT)
+        """Generate formatted chart title with timestamp, in ERCOT's local time whatever format it was stored in."""
+        dt = ercot_datetime(epoch_seconds(self.timestamp))
         formatted_date = dt.strftime(self.DISPLAY_DATE_FORMAT)
         self.title = (
             f"ERCOT Energy Mix | {formatted_date} using {self.total_gen:.1f} MW "
@@ -176,24 +258,102 @@ class Ercot:
             f"#Texas #ERCOT #Renewables"
         )
 
-    def create_visualization(self) -> None:
-        """Generate and save the pie chart visualization."""
+    def chart(self, path: str = None) -> PieChart:
+        """The pie chart of the current mix, as drawn by the render worker."""
         _, values, legend_labels, explodes = self._prepare_chart_data()
+        return PieChart(path or self._output_path(), self.title, values, legend_labels, explodes)
 
-        # remove negative values
-        values = [max(value, 0) for value in values]
+    @property
+    def chart_digest(self) -> str:
+        """Content hash of what the chart is drawn from."""
+        content = {
+            "version": CHART_RENDER_VERSION,
+            "timestamp": self.timestamp,
+            "mix": {label: float(value['gen']) for label, value in self.mix.items()},
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:32]
+
+    def stored_chart(self) -> StoredImage:
+        """The chart from the image store, rendered if it is missing or stale."""
+        return self.store.get_or_render(
+            self.png_file_name, self.chart_digest, lambda path: self.renderer.render(self.chart(str(path)))
+        )
 
-        plt.figure(figsize=self.FIGURE_SIZE)
-        cmap = plt.get_cmap("tab20")
-        colors = cmap(np.linspace(0, 1, 20))  # (20, 4) RGBA array
-        wedges, _ = plt.pie(values, explode=explodes, colors=colors, startangle=self.CHART_START_ANGLE)
+    def create_visualization(self) -> None:
+        """Generate and save the pie chart visualization."""
+        if not self.mix:
+            logger.info("No new fuel mix to visualize")
+            return
+
+        image = self.stored_chart()
+        logger.info(f"Created visualization: {image.path}")
+        # Other processes list the chart from here on
+        with WriterSessionLocal() as db:
+            images_version.bump(db)
+            db.commit()
+
+    @classmethod
+    def from_interval(cls, timestamp: str, mix: Dict[str, Any], **kwargs) -> 'Ercot':
+        """An Ercot for a stored interval, ``mix`` keyed by source label as in the ERCOT payload."""
+        ercot = cls(**kwargs)
+        ercot._set_mix(timestamp, mix)
+        ercot._generate_text()
+        return ercot
+
+    @classmethod
+    def from_gen_mix(cls, mix: GenMix, **kwargs) -> 'Ercot':
+        return cls.from_interval(
+            mix.timestamp,
+            {label: {'gen': getattr(mix, meta["name"])} for label, meta in energy_sources.items()},
+            **kwargs,
+        )
 
-        img_file = self._output_path()
 
-        plt.title(self.title)
-        plt.legend(wedges, legend_labels, loc="center left", bbox_to_anchor=(1, 0.5))
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig(img_file, bbox_inches='tight')
-        plt.close()
-        logger.info(f"Created visualization: {img_file}")
+def stored_chart(db: Session, timestamp: str, store: ImageStore = None, renderer: ChartRenderer = None) -> StoredImage | None:
+    """The chart of a stored interval, rendered on first use; None if there is no such interval."""
+    mix = get_gen_mix(db, timestamp)
+    if mix is None:
+        return None
+    return Ercot.from_gen_mix(mix, store=store, renderer=renderer).stored_chart()
+
+
+def render_archive(
+    db: Session, start_time: datetime, end_time: datetime, renderer: ChartRenderer = None, store: ImageStore = None
+) -> list[str]:
+    """
+    (Re)render the chart of every stored interval between two times; returns the written paths.
+    Intervals whose chart cannot be built are logged and skipped, like charts that fail to render.
+    """
+    store = store or image_store
+    digests = {}
+    charts = []
+    skipped = 0
+    for mix in get_mix_by_dates(db, start_time, end_time):
+        try:
+            ercot = Ercot.from_gen_mix(mix)
+            chart = ercot.chart(str(store.path(ercot.png_file_name)))
+        except Exception as e:
+            skipped += 1
+            logger.warning(f"Skipping the chart of {mix.timestamp}: {e}")
+            continue
+        digests[ercot.png_file_name] = ercot.chart_digest
+        charts.append(chart)
+    if skipped:
+        logger.warning("Skipped %d of %d intervals", skipped, skipped + len(charts))
+
+    rendered = (renderer or chart_renderer).render_many(charts)
+    for path in rendered:
+        store.add(Path(path).name, digests[Path(path).name])
+    return rendered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the out/ chart archive from stored intervals.")
+    parser.add_argument("--days", type=int, default=1, help="render the intervals of the last N days")
+    args = parser.parse_args()
+
+    end = datetime.now(UTC)
+    with SessionLocal() as session:
+        paths = render_archive(session, end - timedelta(days=args.days), end)
+    logger.info("Rendered %d charts: %s", len(paths), chart_renderer.stats())
+    chart_renderer.close()
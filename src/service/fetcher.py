@@ -0,0 +1,192 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.logger.logger import get_logger
+from src.metrics import fetch_bytes, fetch_seconds
+from src.service.fuel_mix_stream import iter_intervals
+
+logger = get_logger(__name__)
+
+ERCOT_API_URL = 'https://www.ercot.com/api/1/services/read/dashboards/fuel-mix.json'
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Responses worth another attempt; anything else is raised straight away
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ErcotFetcher:
+    """
+    Conditional, retrying GET of the ERCOT fuel-mix payload over a pooled keep-alive session.
+
+    The ``ETag``/``Last-Modified`` of the last response read in full are sent back as
+    ``If-None-Match``/``If-Modified-Since``, so an unchanged payload costs a 304 and no
+    parsing. Connection errors, timeouts and ``RETRY_STATUSES`` are retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        url: str = ERCOT_API_URL,
+        timeout: float = 15,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._sleep = sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        # Bumped by ``forget``, so a stream read in full does not restore validators dropped meanwhile
+        self._generation = 0
+        self._stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "retries": 0,
+            "failures": 0,
+            "bytes": 0,
+            "last_latency_ms": 0.0,
+            "total_latency_ms": 0.0,
+        }
+
+    def _conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def _backoff(self, attempt: int) -> float:
+        """Delay before retry ``attempt`` (0-based): exponential, capped, with jitter in [50%, 100%]."""
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def _record(self, started: float, size: int, not_modified: bool = False) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        fetch_seconds.observe(latency_ms / 1000)
+        fetch_bytes.inc(size)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes"] += size
+            self._stats["last_latency_ms"] = latency_ms
+            self._stats["total_latency_ms"] += latency_ms
+            if not_modified:
+                self._stats["not_modified"] += 1
+
+    def get(self, stream: bool = False) -> requests.Response | None:
+        """
+        GET the payload, retrying transient failures. Returns None when the server answers
+        304 Not Modified; raises ``requests.RequestException`` once retries are exhausted.
+        With ``stream`` the body of a successful response is left unread. The validators of
+        the response are not stored: ``_remember`` it once its body has been read.
+        """
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    self.url, headers=self._conditional_headers(), timeout=self.timeout, stream=stream
+                )
+                size = 0 if stream and response.status_code == 200 else len(response.content)
+                self._record(started, size, response.status_code == 304)
+                if response.status_code == 304:
+                    return None
+                if response.status_code not in RETRY_STATUSES:
+                    if not response.ok:
+                        with self._lock:
+                            self._stats["failures"] += 1
+                        response.raise_for_status()
+                    return response
+                error: requests.RequestException = requests.HTTPError(
+                    f"{response.status_code} from {self.url}", response=response
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(started, 0)
+                error = e
+
+            if attempt == self.max_retries:
+                with self._lock:
+                    self._stats["failures"] += 1
+                raise error
+
+            delay = self._backoff(attempt)
+            logger.warning("Fetching %s failed (%s); retrying in %.1fs", self.url, error, delay)
+            with self._lock:
+                self._stats["retries"] += 1
+            self._sleep(delay)
+
+    def fetch(self) -> dict[str, Any] | None:
+        """The ``data`` section of the payload, or None if it has not changed since the last fetch."""
+        response = self.get()
+        if response is None:
+            return None
+        data = response.json()['data']
+        self._remember(response)
+        return data
+
+    def fetch_intervals(self) -> Iterator[tuple[str, dict[str, Any]]] | None:
+        """
+        ``(timestamp, interval)`` pairs parsed from the response stream as it downloads
+        (see ``iter_intervals``), or None if the payload has not changed since the last fetch.
+        The validators are only stored once every interval has been read, so a payload cut
+        short or abandoned is downloaded in full next time.
+        """
+        with self._lock:
+            generation = self._generation
+        response = self.get(stream=True)
+        if response is None:
+            return None
+        return self._remembering(iter_intervals(self._counted(response)), response, generation)
+
+    def _remembering(
+        self, intervals: Iterator[tuple[str, dict[str, Any]]], response: requests.Response, generation: int
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        yield from intervals
+        self._remember(response, generation)
+
+    def _remember(self, response: requests.Response, generation: int | None = None) -> None:
+        """Store the validators of ``response``, unless ``forget`` was called since ``generation``."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+
+    def _counted(self, response: requests.Response) -> Iterator[bytes]:
+        with response:
+            for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                fetch_bytes.inc(len(chunk))
+                with self._lock:
+                    self._stats["bytes"] += len(chunk)
+                yield chunk
+
+    def forget(self) -> None:
+        """Drop the stored validators so the next fetch downloads the full payload."""
+        with self._lock:
+            self._generation += 1
+            self.etag = None
+            self.last_modified = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+ercot_fetcher = ErcotFetcher()
@@ -0,0 +1,102 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+# Consumed text is dropped from the buffer once it grows past this many characters
+_COMPACT_AT = 1 << 16
+
+
+class _Reader:
+    """Text buffer over a stream of chunks, consumed from ``pos`` onwards."""
+
+    def __init__(self, chunks: Iterable[bytes | str]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk; False once the stream is exhausted."""
+        if self.exhausted:
+            return False
+        if self.pos > _COMPACT_AT:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """The next non-whitespace character, without consuming it ("" at end of stream)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the fuel mix payload, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks until it is available."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number that ends with the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Walk an object: yield each key with the reader positioned at its value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def iter_intervals(chunks: Iterable[bytes | str]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Yield ``(timestamp, interval)`` pairs of an ERCOT fuel-mix payload as its chunks arrive.
+
+    The payload looks like ``{"data": {"<day>": {"<timestamp>": {"<label>": {"gen": ...}}}}}``;
+    only one interval is decoded at a time, so memory does not grow with the number of
+    days it covers. Other top-level members are decoded and discarded.
+    """
+    reader = _Reader(chunks)
+    for key in reader.members():
+        if key != "data":
+            reader.value()
+            continue
+        for _day in reader.members():
+            for timestamp in reader.members():
+                yield timestamp, reader.value()
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, UTC
+from pathlib import Path
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+
+class ImageCatalog:
+    """
+    Sorted in-memory index of the image file names in a directory.
+
+    Built from a directory scan on first use (or ``rebuild``) and then kept current by
+    ``add``/``remove`` as images are written and evicted, so listing a page is a slice of
+    the index rather than a scan and sort of the directory. ``version`` changes with
+    every change to the index.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._names: list[str] | None = None
+        self._signature: str | None = None
+        self.version = 0
+        self.last_modified = datetime.now(UTC)
+
+    def _index(self) -> list[str]:
+        """The sorted names, scanning the directory the first time. Call with the lock held."""
+        if self._names is None:
+            self._names = sorted(
+                path.name
+                for path in self.directory.iterdir()
+                if path.suffix.lower() in IMAGE_SUFFIXES and path.is_file()
+            )
+            self._changed()
+        return self._names
+
+    def _changed(self) -> None:
+        self._signature = None
+        self.version += 1
+        self.last_modified = datetime.now(UTC)
+
+    def rebuild(self) -> int:
+        """Re-read the directory; returns the number of images."""
+        with self._lock:
+            self._names = None
+            return len(self._index())
+
+    def add(self, name: str) -> None:
+        if Path(name).suffix.lower() not in IMAGE_SUFFIXES:
+            return
+        with self._lock:
+            names = self._index()
+            i = bisect_left(names, name)
+            if i == len(names) or names[i] != name:
+                insort(names, name, lo=i)
+                self._changed()
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            names = self._index()
+            i = bisect_left(names, name)
+            if i < len(names) and names[i] == name:
+                del names[i]
+                self._changed()
+
+    def signature(self) -> str:
+        """
+        Count and hash of the indexed names, the same in every process that indexes the same
+        listing. Computed once per change to the index.
+        """
+        with self._lock:
+            names = self._index()
+            if self._signature is None:
+                digest = hashlib.sha256("\n".join(names).encode()).hexdigest()[:16]
+                self._signature = f"{len(names)}:{digest}"
+            return self._signature
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._index())
+
+    def page(self, page: int, page_size: int, descending: bool = True) -> list[str]:
+        """Names on a 1-based page, newest (highest sorting) first when ``descending``."""
+        start = max(page - 1, 0) * page_size
+        with self._lock:
+            names = self._index()
+            if not descending:
+                return names[start:start + page_size]
+            end = len(names) - start
+            return names[max(end - page_size, 0):max(end, 0)][::-1]
+
+    def after(self, cursor: str, limit: int, descending: bool = True) -> list[str]:
+        """Up to ``limit`` names following ``cursor`` in listing order."""
+        with self._lock:
+            names = self._index()
+            if not descending:
+                i = bisect_right(names, cursor)
+                return names[i:i + limit]
+            i = bisect_left(names, cursor)
+            return names[max(i - limit, 0):i][::-1]
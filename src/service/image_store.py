@@ -0,0 +1,173 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from os import getenv
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from src.service.image_catalog import ImageCatalog
+
+# Project root (../../ from this file because this file lives in src/service/)
+IMAGE_DIR = Path(__file__).resolve().parents[2] / "out"
+DEFAULT_MAX_BYTES = int(getenv("IMAGE_STORE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Renders are written here first and moved into place once complete
+_PARTIAL_DIR_NAME = ".partial"
+# Digest of each image, one file per image name, so it survives a restart
+_DIGEST_DIR_NAME = ".digests"
+
+
+class StoredImage(NamedTuple):
+    path: Path
+    # Content hash of what was rendered; None for files found on disk without a recorded digest
+    digest: str | None
+
+
+class _Entry(NamedTuple):
+    size: int
+    digest: str | None
+
+
+class ImageStore:
+    """
+    Size-bounded directory of rendered images, evicted least recently used first.
+
+    Images are addressed by file name and validated by a ``digest`` of their inputs, kept
+    next to the images: a request whose digest differs from the stored one, or finds no
+    stored digest, renders the image again. Concurrent requests for an image that is being
+    rendered wait for that render instead of starting their own. Files already in the
+    directory are indexed on first use, oldest first. Writes and evictions are reflected in
+    ``catalog``, if given.
+
+    The budget is kept per process: each store counts the files it found on first use and
+    the ones it wrote since, so processes sharing a directory (web workers) can together
+    take up to their number times ``max_bytes`` until they restart.
+    """
+
+    def __init__(
+        self, directory: Path = IMAGE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, catalog: ImageCatalog | None = None
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] | None = None
+        self._rendering: dict[str, Future] = {}
+        self.total_bytes = 0
+        self._stats = {"hits": 0, "renders": 0, "coalesced": 0, "evictions": 0}
+
+    def _scan(self) -> OrderedDict[str, _Entry]:
+        """Index the images on disk, least recently modified first. Call with the lock held."""
+        if self._entries is None:
+            files = sorted(
+                (path.stat().st_mtime, path.name, path.stat().st_size)
+                for path in self.directory.glob("*.png")
+                if path.is_file()
+            )
+            self._entries = OrderedDict((name, _Entry(size, self._read_digest(name))) for _, name, size in files)
+            self.total_bytes = sum(entry.size for entry in self._entries.values())
+        return self._entries
+
+    def path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _digest_path(self, name: str) -> Path:
+        return self.directory / _DIGEST_DIR_NAME / name
+
+    def _read_digest(self, name: str) -> str | None:
+        try:
+            return self._digest_path(name).read_text()
+        except FileNotFoundError:
+            return None
+
+    def _write_digest(self, name: str, digest: str | None) -> None:
+        path = self._digest_path(name)
+        if digest is None:
+            path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(digest)
+
+    def get_or_render(self, name: str, digest: str, render: Callable[[Path], None]) -> StoredImage:
+        """
+        The stored image ``name`` if it was rendered from ``digest``; otherwise ``render``
+        is called with a temporary path to write it to, once, however many callers ask.
+        """
+        with self._lock:
+            entries = self._scan()
+            entry = entries.get(name)
+            if entry is not None and entry.digest == digest and self.path(name).is_file():
+                entries.move_to_end(name)
+                self._stats["hits"] += 1
+                return StoredImage(self.path(name), digest)
+
+            future = self._rendering.get(name)
+            owner = future is None
+            if owner:
+                future = self._rendering[name] = Future()
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            partial = self.directory / _PARTIAL_DIR_NAME / f"{uuid.uuid4().hex}-{name}"
+            partial.parent.mkdir(parents=True, exist_ok=True)
+            render(partial)
+            # Until ``add`` records the new digest, the image must not pass for the old one
+            self._write_digest(name, None)
+            os.replace(partial, self.path(name))
+            with self._lock:
+                self._stats["renders"] += 1
+            image = self.add(name, digest)
+            future.set_result(image)
+            return image
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._rendering[name]
+
+    def add(self, name: str, digest: str | None) -> StoredImage:
+        """Index an image that was written to ``path(name)``, evicting older ones to make room."""
+        size = self.path(name).stat().st_size
+        self._write_digest(name, digest)
+        with self._lock:
+            entries = self._scan()
+            previous = entries.pop(name, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            entries[name] = _Entry(size, digest)
+            self.total_bytes += size
+            if self.catalog is not None and previous is None:
+                self.catalog.add(name)
+            self._evict()
+        return StoredImage(self.path(name), digest)
+
+    def _evict(self) -> None:
+        """Drop least recently used images until the store fits. Call with the lock held."""
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            self.path(name).unlink(missing_ok=True)
+            self._write_digest(name, None)
+            if self.catalog is not None:
+                self.catalog.remove(name)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "images": len(self._entries or ()),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats,
+            }
+
+
+image_catalog = ImageCatalog(IMAGE_DIR)
+image_store = ImageStore(catalog=image_catalog)
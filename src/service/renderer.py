@@ -0,0 +1,162 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.metrics import render_seconds
+
+FIGURE_SIZE = (8, 6)
+CHART_START_ANGLE = 140
+COLORS = colormaps["tab20"](np.linspace(0, 1, 20))  # (20, 4) RGBA array
+
+RENDER_WORKERS = 1
+# Charts submitted to the worker ahead of the one being collected
+MAX_IN_FLIGHT = RENDER_WORKERS * 2
+
+
+class PieChart(NamedTuple):
+    """Everything needed to draw one fuel-mix pie chart, picklable for the render worker."""
+    path: str
+    title: str
+    values: list[float]
+    legend_labels: list[str]
+    explodes: list[float]
+
+
+# Figure and axes of the worker process, created once and redrawn for every chart
+_figure: Figure | None = None
+_axes = None
+
+
+def _template():
+    global _figure, _axes
+    if _figure is None:
+        _figure = Figure(figsize=FIGURE_SIZE)
+        FigureCanvasAgg(_figure)
+        _axes = _figure.add_subplot()
+    return _figure, _axes
+
+
+def draw(chart: PieChart) -> float:
+    """Draw ``chart`` on the reused figure and save it; returns the render time in seconds."""
+    started = time.perf_counter()
+    figure, axes = _template()
+    axes.clear()
+
+    # remove negative values
+    values = [max(value, 0) for value in chart.values]
+    wedges, _ = axes.pie(values, explode=chart.explodes, colors=COLORS, startangle=CHART_START_ANGLE)
+    axes.set_title(chart.title)
+    axes.legend(wedges, chart.legend_labels, loc="center left", bbox_to_anchor=(1, 0.5))
+    axes.axis('equal')
+    figure.savefig(chart.path, bbox_inches='tight')
+    return time.perf_counter() - started
+
+
+class ChartRenderer:
+    """
+    Renders charts in a dedicated worker process, so drawing does not hold the GIL of the
+    process serving web requests. The worker keeps one Agg figure and redraws it per chart.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._stats = {"renders": 0, "failures": 0, "last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs threads (scheduler, web server)
+                self._pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a pool whose worker died, so the next render starts a new one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def _record(self, seconds: float) -> None:
+        render_seconds.observe(seconds)
+        ms = seconds * 1000
+        with self._lock:
+            self._stats["renders"] += 1
+            self._stats["last_ms"] = ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], ms)
+            self._stats["total_ms"] += ms
+
+    def _failed(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+
+    def _submit(self, chart: PieChart) -> tuple[PieChart, ProcessPoolExecutor, Future]:
+        """Queue ``chart`` on the worker, on a new one if the pool was found broken."""
+        executor = self._executor()
+        try:
+            return chart, executor, executor.submit(draw, chart)
+        except BrokenProcessPool:
+            self._discard(executor)
+            executor = self._executor()
+            return chart, executor, executor.submit(draw, chart)
+
+    def render(self, chart: PieChart) -> str:
+        """Render one chart and wait for it; returns its path."""
+        _, executor, future = self._submit(chart)
+        try:
+            self._record(future.result())
+        except Exception as e:
+            self._failed()
+            if isinstance(e, BrokenProcessPool):
+                self._discard(executor)
+            raise
+        return chart.path
+
+    def render_many(self, charts: Iterable[PieChart]) -> list[str]:
+        """
+        Render charts back to back in the worker; returns the paths that were written.
+        A worker crash fails the charts in flight, not the rest of the batch. At most
+        ``MAX_IN_FLIGHT`` charts are queued at a time, so a long batch does not pile up
+        pickled charts in the executor.
+        """
+        charts = iter(charts)
+        in_flight = deque(self._submit(chart) for chart in islice(charts, MAX_IN_FLIGHT))
+        rendered = []
+        while in_flight:
+            chart, executor, future = in_flight.popleft()
+            try:
+                self._record(future.result())
+                rendered.append(chart.path)
+            except Exception as e:
+                self._failed()
+                if isinstance(e, BrokenProcessPool):
+                    self._discard(executor)
+            next_chart = next(charts, None)
+            if next_chart is not None:
+                in_flight.append(self._submit(next_chart))
+        return rendered
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_ms"] = stats["total_ms"] / stats["renders"] if stats["renders"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+chart_renderer = ChartRenderer()
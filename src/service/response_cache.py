@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+from typing import Any, Awaitable, Callable, Hashable
+
+DEFAULT_MAX_ENTRIES = int(getenv("RESPONSE_CACHE_SIZE", "128"))
+DEFAULT_TTL_SECONDS = 60 * 5
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of computed route payloads.
+
+    Entries expire after ``ttl_seconds`` and are dropped as soon as the ingest bumps the
+    generation counter through ``invalidate``, so cached pages never outlive the data
+    they were built from.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[int, float, Any]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(route: str, **params) -> tuple:
+        """Cache key for a route and its (already normalized) query params."""
+        return route, tuple(sorted(params.items()))
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        hit, value, generation, now = self._lookup(key)
+        if hit:
+            return value
+        # Compute outside the lock; a concurrent invalidate makes this result stale on arrival
+        value = compute()
+        self._store(key, value, generation, now)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """``get_or_compute`` with a coroutine function computing the value on a miss."""
+        hit, value, generation, now = self._lookup(key)
+        if hit:
+            return value
+        value = await compute()
+        self._store(key, value, generation, now)
+        return value
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any, int, float]:
+        """Whether ``key`` is cached, its value, and the generation and time a miss is computed at."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, stored_at, value = entry
+                if generation == self.generation and now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value, generation, now
+                del self._entries[key]
+            self.misses += 1
+            return False, None, self.generation, now
+
+    def _store(self, key: Hashable, value: Any, generation: int, now: float) -> None:
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (generation, now, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Start a new generation, dropping every cached entry."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,66 @@
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models.energy import GenInstant
+from src.models.shared import epoch_seconds
+
+
+class Watermark:
+    """
+    High-water mark of ingested data: the latest stored ``gen_instant.timestamp``.
+
+    The value is read from the database once and then advanced in-process by the ingest,
+    so checking which intervals are new does not need a query per run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value: str | None = None
+
+    def load(self, db: Session) -> str | None:
+        """(Re)read the watermark from the database."""
+        latest = db.scalar(select(GenInstant.timestamp).order_by(GenInstant.epoch.desc()).limit(1))
+        with self._lock:
+            self._value = latest
+            self._loaded = True
+        return latest
+
+    def get(self, db: Session) -> str | None:
+        """Return the cached watermark, loading it from the database on first use."""
+        if not self._loaded:
+            return self.load(db)
+        return self._value
+
+    def advance(self, timestamp: str) -> None:
+        """Move the watermark forward; older timestamps are ignored."""
+        with self._lock:
+            if self._value is None or epoch_seconds(timestamp) > epoch_seconds(self._value):
+                self._value = timestamp
+
+    def rewind(self, db: Session, timestamp: str) -> str | None:
+        """
+        Move the watermark back to the latest stored interval before ``timestamp``, so the
+        next ingest does not take ``timestamp`` as stored. Returns the new watermark.
+        """
+        latest = db.scalar(
+            select(GenInstant.timestamp)
+            .where(GenInstant.epoch < epoch_seconds(timestamp))
+            .order_by(GenInstant.epoch.desc())
+            .limit(1)
+        )
+        with self._lock:
+            self._value = latest
+            self._loaded = True
+        return latest
+
+    def reset(self) -> None:
+        """Forget the cached value so the next ``get`` reads the database again."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+
+gen_watermark = Watermark()
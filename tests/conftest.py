@@ -6,7 +6,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from src.db.database import Base
-from src.service.db.source_service import seed as db_seed_sources
+from src.service.coordination import data_version, images_version
+from src.service.db.source_service import seed as db_seed_sources, source_registry
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
 from tests.fixtures.gen_instants import seed as db_seed_gen_instants
 
 
@@ -35,6 +38,11 @@ def db_session(engine) -> Generator[Session, None, None]:
             db.execute(table.delete())
         db.commit()
         db.close()
+        gen_watermark.reset()
+        data_version.reset()
+        images_version.reset()
+        source_registry.clear()
+        response_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,100 @@
+import threading
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.db.database import Base, create_db_engine
+from src.models.energy import energy_sources
+from src.schema import schema
+from src.service.dashboard_service import DashboardService
+from src.service.db.gen_instant import create_gen_instances
+from src.service.db.source_service import seed, source_registry
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ercot.db'}"
+    writer = create_db_engine(url, writer=True)
+    Base.metadata.create_all(bind=writer)
+    reader = create_db_engine(url)
+    try:
+        yield reader, writer
+    finally:
+        reader.dispose()
+        writer.dispose()
+        gen_watermark.reset()
+        source_registry.clear()
+        response_cache.clear()
+
+
+def test_sqlite_connections_get_pragmas(engines):
+    reader, writer = engines
+
+    with reader.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            connection.execute(text("DELETE FROM source"))
+    with writer.connect() as connection:
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 0
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() > 0
+
+    assert writer.pool.size() == 1
+
+
+def _ingest(Writer: sessionmaker, start: datetime, errors: list, done: threading.Event) -> None:
+    """Write 20 batches of 24 intervals from ``start``, then set ``done``."""
+    try:
+        with Writer() as db:
+            for batch in range(20):
+                create_gen_instances(db, [
+                    schema.GenInstantCreate(
+                        timestamp=(start + timedelta(minutes=5 * (batch * 24 + i))).isoformat(),
+                        sources={label: 10.0 for label in energy_sources},
+                    )
+                    for i in range(24)
+                ])
+    except BaseException as e:
+        errors.append(e)
+    finally:
+        done.set()
+
+
+def _read(Reader: sessionmaker, errors: list, done: threading.Event) -> None:
+    """Build the dashboard and home page data until ``done`` is set."""
+    try:
+        while not done.is_set():
+            with Reader() as db:
+                DashboardService.get_dashboard_data(db, "5D")
+                DashboardService.get_generation_by_day(db, 5)
+    except BaseException as e:
+        errors.append(e)
+
+
+def test_concurrent_ingest_and_reads_do_not_lock(engines):
+    reader, writer = engines
+    Writer = sessionmaker(autocommit=False, autoflush=False, bind=writer)
+    Reader = sessionmaker(autocommit=False, autoflush=False, bind=reader)
+    with Writer() as db:
+        seed(db)
+
+    start = datetime.now(UTC).replace(microsecond=0) - timedelta(days=2)
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    threads = [threading.Thread(target=_ingest, args=(Writer, start, errors, done))]
+    threads += [threading.Thread(target=_read, args=(Reader, errors, done)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    with Reader() as db:
+        assert len(DashboardService.get_dashboard_data(db, "5D", max_points=None)[0]) == 20 * 24
@@ -0,0 +1,108 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import src.router
+from src.db.database import Base
+from src.db.profiler import QueryProfiler, fingerprint, query_profiler
+from src.service.coordination import data_version
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
+
+
+def _engine(profiler: QueryProfiler, url: str = "sqlite://"):
+    engine = create_engine(url)
+    profiler.install(engine)
+    return engine
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    assert fingerprint("SELECT a FROM t\n WHERE id IN (?, ?, ?) AND x = 'o''k' LIMIT 10") == (
+        "SELECT a FROM t WHERE id IN (?...) AND x = ? LIMIT ?"
+    )
+    assert fingerprint("SELECT anon_1.x FROM t WHERE id IN (%(id_1)s, %(id_2)s) AND y::INTEGER = :y") == (
+        "SELECT anon_1.x FROM t WHERE id IN (?...) AND y::INTEGER = ?"
+    )
+
+
+def test_profile_flags_repeated_statements(caplog):
+    profiler = QueryProfiler(enabled=True, slow_ms=float("inf"))
+    engine = _engine(profiler)
+
+    with caplog.at_level(logging.WARNING), profiler.profile("loop") as unit, engine.connect() as connection:
+        for i in range(12):
+            connection.execute(text("SELECT :value"), {"value": i})
+        connection.execute(text("SELECT 1, 2"))
+
+    assert unit.statements == 13
+    assert unit.repeated() == {"SELECT ?": 12}
+    assert profiler.history()[0]["n_plus_one"] == {"SELECT ?": 12}
+    assert "Possible N+1 in loop" in caplog.text
+
+
+def test_statements_outside_a_profile_are_not_recorded():
+    profiler = QueryProfiler(enabled=True)
+    engine = _engine(profiler)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert profiler.history() == []
+
+
+def test_slow_statements_are_logged_with_their_plan(tmp_path):
+    profiler = QueryProfiler(enabled=True, slow_ms=0)
+    engine = _engine(profiler, f"sqlite:///{tmp_path / 'profile.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    with profiler.profile("slow") as unit, engine.connect() as connection:
+        connection.execute(text("SELECT timestamp FROM gen_instant WHERE epoch > :epoch"), {"epoch": 0})
+
+    assert unit.slow[0]["sql"] == "SELECT timestamp FROM gen_instant WHERE epoch > ?"
+    assert "ix_gen_instant_epoch" in unit.slow[0]["plan"]
+
+
+def test_failed_explain_leaves_the_transaction_usable():
+    profiler = QueryProfiler(enabled=True, slow_ms=0)
+    engine = _engine(profiler)
+    traced = []
+
+    with profiler.profile("explain") as unit, engine.begin() as connection:
+        connection.connection.dbapi_connection.set_trace_callback(traced.append)
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+        # Runs, but cannot be explained itself
+        connection.execute(text("EXPLAIN QUERY PLAN SELECT x FROM t"))
+        count = connection.execute(text("SELECT count(*) FROM t")).scalar()
+
+    assert unit.slow[2]["plan"].startswith("EXPLAIN failed")
+    assert "ROLLBACK TO SAVEPOINT sql_profile_explain" in traced
+    assert count == 1
+
+
+def test_requests_report_their_profile(monkeypatch, tmp_path):
+    monkeypatch.setattr(query_profiler, "enabled", True)
+    engine = _engine(query_profiler, f"sqlite:///{tmp_path / 'profile.db'}")
+    Base.metadata.create_all(bind=engine)
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: Session(engine)
+    try:
+        client = TestClient(src.router.app)
+        response = client.get("/api/v1/daily")
+        history = client.get("/debug/queries").json()
+    finally:
+        src.router.app.dependency_overrides.clear()
+        response_cache.clear()
+        gen_watermark.reset()
+        data_version.reset()
+        engine.dispose()
+
+    assert response.headers["x-sql-profile"].startswith("statements=")
+    assert not response.headers["x-sql-profile"].startswith("statements=0;")
+    assert history[0]["name"] == "GET /api/v1/daily"
+    assert history[0]["statements"] > 0
+
+
+def test_debug_endpoint_is_hidden_when_profiling_is_off():
+    assert TestClient(src.router.app).get("/debug/queries").status_code == 404
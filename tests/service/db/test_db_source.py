@@ -1,7 +1,13 @@
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from src.models.energy import energy_sources, Source
+from src.schema import schema
 from src.service.db import source_service
+from src.service.db.gen_instant import create_gen_instances
 
 
 def test_get_source(db_session: Session, seed_sources: None):
@@ -17,3 +23,55 @@ def test_get_source(db_session: Session, seed_sources: None):
 def test_get_sources(db_session: Session, seed_sources: None):
     expected_length = len(energy_sources)
     assert len(source_service.get_sources(db_session)) == expected_length
+
+
+# The source table itself, not gen_source or source_id
+_SOURCE_TABLE = re.compile(r"\bsource\b")
+
+
+@contextmanager
+def _source_queries(db_session: Session):
+    """Record the statements that reference the source table inside the block (reads and joins)."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if _SOURCE_TABLE.search(statement):
+            statements.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", capture)
+
+
+def test_registry_is_warmed_by_seed(db_session: Session, seed_sources: None):
+    coal = source_service.source_registry.get("Coal and Lignite")
+
+    assert coal is not None
+    assert source_service.source_registry.get("coal") == coal
+    assert coal.id == source_service.get_source(db_session, "coal").id
+    assert coal.renewable is False
+
+
+def test_registry_resolves_known_labels_without_queries(db_session: Session, seed_sources: None):
+    with _source_queries(db_session) as statements:
+        resolved = source_service.source_registry.resolve(db_session, set(energy_sources))
+        create_gen_instances(db_session, [
+            schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources={"Solar": 1.0, "Wind": 2.0}),
+        ])
+
+    assert statements == []
+    assert {entry.name for entry in resolved.values()} == {meta["name"] for meta in energy_sources.values()}
+
+
+def test_registry_reloads_on_unknown_label(db_session: Session):
+    source_service.get_or_create_source(db_session, "Solar")
+    db_session.commit()
+
+    with _source_queries(db_session) as statements:
+        resolved = source_service.source_registry.resolve(db_session, {"Solar"})
+        source_service.source_registry.resolve(db_session, {"Solar"})
+
+    assert len(statements) == 1
+    assert resolved["Solar"].name == "solar"
@@ -1,10 +1,18 @@
+import asyncio
 from datetime import datetime, UTC
 
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
-from src.models.energy import energy_sources
+from src.db.database import async_database_url
+from src.models.energy import energy_sources, SOURCE_NAMES
 from src.schema import schema
-from src.service.db.gen_instant import create_gen_instant
+from src.service.db.gen_instant import (
+    create_gen_instant, create_gen_instances, get_by_dates, get_by_dates_async, get_gen_instant,
+    get_last_x_gen_instants, get_last_x_gen_instants_async, insert_gen_instances
+)
+from src.service.db.gen_mix import get_gen_mix, get_mix_series, get_mix_series_async
 
 valid_data = {key: 10 for key in energy_sources}
 
@@ -25,3 +33,90 @@ def test_create_valid_instant(db_session: Session):
     assert db_gen_instant.gen_renewables == 60.0
     assert db_gen_instant.gen_total == 80.0
     assert db_gen_instant.percentage_renewable == 75.0
+
+
+def test_create_gen_instances_skips_duplicates(db_session: Session):
+    first = schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources=valid_data)
+    second = schema.GenInstantCreate(timestamp="2026-01-01 00:05:00-0600", sources=valid_data)
+
+    created = create_gen_instances(db_session, [first, first])
+    assert [instant.timestamp for instant in created] == [first.timestamp]
+
+    created = create_gen_instances(db_session, [second, first])
+    assert [instant.timestamp for instant in created] == [second.timestamp]
+    assert len(created[0].gen_sources) == len(valid_data)
+    assert {gs.source.name for gs in created[0].gen_sources} == {meta["name"] for meta in energy_sources.values()}
+
+
+def test_insert_gen_instances_counts_created_rows(db_session: Session):
+    first = schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources=valid_data)
+    second = schema.GenInstantCreate(timestamp="2026-01-01 00:05:00-0600", sources=valid_data)
+
+    assert insert_gen_instances(db_session, [first, first]) == 1
+    assert insert_gen_instances(db_session, [second, first]) == 1
+    assert len(get_gen_instant(db_session, second.timestamp).gen_sources) == len(valid_data)
+
+
+def test_create_gen_instances_writes_gen_mix(db_session: Session):
+    gen_instant = schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources=valid_data)
+    create_gen_instances(db_session, [gen_instant])
+
+    gen_mix = get_gen_mix(db_session, gen_instant.timestamp)
+    assert gen_mix is not None
+    assert all(getattr(gen_mix, name) == 10 for name in SOURCE_NAMES)
+    assert gen_mix.gen_total == 80.0
+    assert gen_mix.gen_renewables == 60.0
+
+
+def test_create_gen_instances_persists_totals(db_session: Session):
+    gen_instant = schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources=valid_data)
+    create_gen_instances(db_session, [gen_instant])
+    db_session.expire_all()
+
+    db_gen_instant = get_gen_instant(db_session, gen_instant.timestamp)
+    assert db_gen_instant.gen_total == 80.0
+    assert db_gen_instant.gen_renewables == 60.0
+    assert db_gen_instant.percentage_renewable == 75.0
+
+
+def test_get_by_dates_ranges_on_epoch_across_formats(db_session: Session):
+    # 00:50Z and 00:55Z written in ERCOT's local format and in ISO 8601
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp="2026-02-21 18:50:00-0600", sources=valid_data),
+        schema.GenInstantCreate(timestamp="2026-02-22T00:55:00Z", sources=valid_data),
+        schema.GenInstantCreate(timestamp="2026-02-21 19:05:00-0600", sources=valid_data),
+    ])
+
+    found = get_by_dates(db_session, datetime(2026, 2, 22, 0, 45, tzinfo=UTC), datetime(2026, 2, 22, 1, 0, tzinfo=UTC))
+
+    assert sorted(instant.timestamp for instant in found) == ["2026-02-21 18:50:00-0600", "2026-02-22T00:55:00Z"]
+    assert [instant.timestamp for instant in get_last_x_gen_instants(db_session, 1)] == ["2026-02-21 19:05:00-0600"]
+
+
+def test_async_queries_match_sync(db_session: Session):
+    pytest.importorskip("aiosqlite")
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp="2026-02-22T00:50:00Z", sources=valid_data),
+        schema.GenInstantCreate(timestamp="2026-02-22T00:55:00Z", sources=valid_data),
+    ])
+    start, end = datetime(2026, 2, 22, 0, 45, tzinfo=UTC), datetime(2026, 2, 22, 1, 0, tzinfo=UTC)
+
+    async def query():
+        engine = create_async_engine(async_database_url(str(db_session.get_bind().url)))
+        try:
+            async with AsyncSession(engine) as db:
+                instants = await get_by_dates_async(db, start, end)
+                sources = {len(instant.gen_sources) for instant in instants}
+                last = await get_last_x_gen_instants_async(db, 1)
+                return instants, sources, last, await get_mix_series_async(db, start, end)
+        finally:
+            await engine.dispose()
+
+    instants, sources, last, (labels, series) = asyncio.run(query())
+
+    assert sorted(instant.timestamp for instant in instants) == ["2026-02-22T00:50:00Z", "2026-02-22T00:55:00Z"]
+    assert sources == {len(valid_data)}
+    assert [instant.timestamp for instant in last] == ["2026-02-22T00:55:00Z"]
+    sync_labels, sync_series = get_mix_series(db_session, start, end)
+    assert labels == sync_labels
+    assert (series == sync_series).all()
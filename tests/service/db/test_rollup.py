@@ -0,0 +1,65 @@
+from sqlalchemy.orm import Session
+
+from src.models.energy import energy_sources, GenRollupDaily, GenRollupHourly, SOURCE_NAMES
+from src.schema import schema
+from src.service.db.gen_instant import create_gen_instances
+from src.service.db.rollup import rebuild_rollups, ROLLUP_MODELS
+
+
+def _instant(timestamp: str, gen: float) -> schema.GenInstantCreate:
+    return schema.GenInstantCreate(timestamp=timestamp, sources={label: gen for label in energy_sources})
+
+
+def _snapshot(db: Session) -> dict:
+    columns = [c.key for c in GenRollupHourly.__table__.columns if c.key not in ("id", "created_at", "updated_at")]
+    return {
+        model.__tablename__: {
+            row.bucket: {key: getattr(row, key) for key in columns} for row in db.query(model)
+        }
+        for model in ROLLUP_MODELS
+    }
+
+
+def test_rollups_are_updated_incrementally(db_session: Session):
+    create_gen_instances(db_session, [_instant("2026-01-01 10:00:00-0600", 10.0)])
+    create_gen_instances(db_session, [
+        _instant("2026-01-01 10:05:00-0600", 30.0),
+        _instant("2026-01-01 11:00:00-0600", 5.0),
+    ])
+
+    hourly = db_session.query(GenRollupHourly).filter(GenRollupHourly.bucket == "2026-01-01T16:00:00Z").one()
+    assert hourly.count == 2
+    assert hourly.last_timestamp == "2026-01-01 10:05:00-0600"
+    assert all(getattr(hourly, f"{name}_sum") == 40.0 for name in SOURCE_NAMES)
+    assert all(getattr(hourly, f"{name}_min") == 10.0 for name in SOURCE_NAMES)
+    assert all(getattr(hourly, f"{name}_max") == 30.0 for name in SOURCE_NAMES)
+    assert hourly.gen_total_sum == 320.0
+    assert hourly.gen_renewables_sum == 240.0
+
+    # Days start at ERCOT's local midnight
+    daily = db_session.query(GenRollupDaily).one()
+    assert daily.bucket == "2026-01-01T06:00:00Z"
+    assert daily.count == 3
+    assert daily.last_timestamp == "2026-01-01 11:00:00-0600"
+
+
+def test_updated_rollups_are_stamped(db_session: Session):
+    create_gen_instances(db_session, [_instant("2026-01-01 10:00:00-0600", 10.0)])
+    created = db_session.query(GenRollupHourly).one().updated_at
+
+    create_gen_instances(db_session, [_instant("2026-01-01 10:05:00-0600", 30.0)])
+    db_session.expire_all()
+
+    assert db_session.query(GenRollupHourly).one().updated_at > created
+
+
+def test_rebuild_matches_incremental(db_session: Session):
+    create_gen_instances(db_session, [_instant("2026-01-01 10:00:00-0600", 10.0)])
+    create_gen_instances(db_session, [_instant("2026-01-01 10:05:00-0600", -3.0), _instant("2026-01-02 00:00:00-0600", 7.0)])
+    # Same hour and local day as the first two, stored in the other format and sorting after them as strings
+    create_gen_instances(db_session, [_instant("2026-01-01T16:02:30Z", 1.0)])
+    incremental = _snapshot(db_session)
+
+    rebuild_rollups(db_session)
+
+    assert _snapshot(db_session) == incremental
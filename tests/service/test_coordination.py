@@ -0,0 +1,102 @@
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+import src.service.coordination
+from src.models.app_state import AppState
+from src.service.coordination import DataVersion, ImagesVersion, LeaderLock
+from src.service.image_catalog import ImageCatalog
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
+
+
+def test_leader_lock_admits_one_holder(db_session: Session):
+    first, second = LeaderLock("ingest", owner="a"), LeaderLock("ingest", owner="b")
+
+    assert first.acquire(db_session)
+    assert not second.acquire(db_session)
+    assert first.acquire(db_session)  # renewing is fine
+
+    first.release(db_session)
+    assert second.acquire(db_session)
+
+
+def test_leader_lock_admits_one_run_per_cycle(db_session: Session):
+    first, second = LeaderLock("ingest", owner="a"), LeaderLock("ingest", owner="b")
+
+    assert first.acquire(db_session, cycle=5)
+    first.release(db_session)
+
+    # Another scheduler firing later in the same cycle
+    assert not second.acquire(db_session, cycle=5)
+    assert not first.acquire(db_session, cycle=5)
+    assert second.acquire(db_session, cycle=6)
+
+
+def test_leader_lock_takes_over_expired_lease(db_session: Session):
+    first, second = LeaderLock("ingest", owner="a"), LeaderLock("ingest", owner="b")
+    assert first.acquire(db_session)
+
+    db_session.execute(update(AppState).values(expires_at=int(time.time()) - 1))
+    db_session.commit()
+
+    assert second.acquire(db_session)
+    assert not first.acquire(db_session)
+
+
+def test_leader_lock_renews_only_its_own_lease(db_session: Session):
+    first, second = LeaderLock("ingest", ttl_seconds=60, owner="a"), LeaderLock("ingest", owner="b")
+    assert first.acquire(db_session)
+    db_session.execute(update(AppState).values(expires_at=int(time.time()) + 1))
+    db_session.commit()
+
+    assert first.renew(db_session)
+    assert db_session.scalar(select(AppState.expires_at)) >= int(time.time()) + 59
+    assert not second.renew(db_session)
+
+
+def test_data_version_invalidates_caches_after_another_ingest(db_session: Session):
+    web, ingest = DataVersion(poll_seconds=0), DataVersion(poll_seconds=0)
+    gen_watermark.advance("2026-01-01 00:00:00-0600")
+
+    assert not web.refresh(db_session)  # first look only records the version
+    ingest.bump(db_session)
+    db_session.commit()
+    generation = response_cache.generation
+
+    assert web.refresh(db_session)
+    assert response_cache.generation == generation + 1
+    assert gen_watermark.get(db_session) is None  # reloaded from the (empty) database
+    assert not web.refresh(db_session)
+
+
+def test_data_version_polls_at_most_once_per_interval(db_session: Session):
+    web, ingest = DataVersion(poll_seconds=60), DataVersion(poll_seconds=0)
+    web.refresh(db_session)
+
+    ingest.bump(db_session)
+    db_session.commit()
+
+    assert not web.refresh(db_session)
+
+
+def test_images_version_rebuilds_the_catalog_once_the_chart_is_written(db_session: Session, monkeypatch, tmp_path):
+    catalog = ImageCatalog(tmp_path)
+    monkeypatch.setattr(src.service.coordination, "image_catalog", catalog)
+    web, ingest = ImagesVersion(poll_seconds=0), ImagesVersion(poll_seconds=0)
+    web.refresh(db_session)
+    assert catalog.count() == 0
+
+    # The data version moving alone does not rebuild the catalog
+    DataVersion(poll_seconds=0).bump(db_session)
+    db_session.commit()
+    (tmp_path / "a.png").touch()
+    assert not web.refresh(db_session)
+    assert catalog.count() == 0
+
+    ingest.bump(db_session)
+    db_session.commit()
+
+    assert web.refresh(db_session)
+    assert catalog.page(1, 10) == ["a.png"]
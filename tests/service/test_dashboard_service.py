@@ -1,6 +1,18 @@
+import asyncio
+from datetime import datetime, timedelta, timezone, UTC
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
+from src.db.database import async_database_url
+
+from src.models.energy import energy_sources
+from src.models.shared import ERCOT_TIMESTAMP_FORMAT, ERCOT_TZ
+from src.schema import schema
 from src.service.dashboard_service import DashboardService
+from src.service.db.gen_instant import create_gen_instances
 from tests.fixtures.gen_instants import in_order_days
 
 
@@ -8,3 +20,167 @@ def test_get_dashboard_data(db_session: Session, seed_sources: None, seed_gen_in
 
     labels, datasets = DashboardService().get_dashboard_data(db_session, '1W')
     assert labels == in_order_days
+
+
+def test_get_generation_by_day(db_session: Session, seed_sources: None):
+    day = (datetime.now(UTC) - timedelta(days=1)).strftime("%Y-%m-%d")
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp=f"{day} 10:00:00-0600", sources={label: 10.0 for label in energy_sources}),
+        schema.GenInstantCreate(timestamp=f"{day} 10:05:00-0600", sources={label: 20.0 for label in energy_sources}),
+    ])
+
+    chart_data, table_data = DashboardService.get_generation_by_day(db_session, 7)
+
+    assert chart_data["labels"] == [day]
+    assert len(chart_data["datasets"]) == len(energy_sources)
+    assert all(dataset["data"] == [30.0] for dataset in chart_data["datasets"])
+
+    # Table totals reflect the day's latest interval
+    assert table_data[0]["date"] == day
+    assert table_data[0]["total_gen"] == 160.0
+    assert table_data[0]["renewable_gen"] == 120.0
+    assert table_data[0]["renewable_pct"] == 75.0
+
+
+def test_get_generation_by_day_groups_on_ercot_days(db_session: Session, seed_sources: None):
+    # Four local days of 5-minute intervals, each crossing UTC midnight
+    today = datetime.now(ERCOT_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+    days = [today - timedelta(days=n) for n in (4, 3, 2, 1)]
+    timestamps = [(day + timedelta(minutes=5 * i)).strftime(ERCOT_TIMESTAMP_FORMAT) for day in days for i in range(288)]
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp=timestamp, sources={label: float(i % 12) for label in energy_sources})
+        for i, timestamp in enumerate(timestamps)
+    ])
+
+    chart_data, table_data = DashboardService.get_generation_by_day(db_session, 7)
+
+    # As summed per stored date, e.g. "2026-10-14" of "2026-10-14 23:55:00-0500"
+    dates = sorted({timestamp[:10] for timestamp in timestamps})
+    sums = {date: sum(float(i % 12) for i, timestamp in enumerate(timestamps) if timestamp[:10] == date) for date in dates}
+    assert chart_data["labels"] == dates == [day.date().isoformat() for day in days]
+    assert all(dataset["data"] == [sums[date] for date in dates] for dataset in chart_data["datasets"])
+    # Each day's latest interval is its 23:55
+    assert [row["total_gen"] for row in table_data] == [11.0 * len(energy_sources)] * 4
+
+
+def test_get_dashboard_data_downsamples(db_session: Session, seed_sources: None):
+    start = datetime.now(UTC) - timedelta(days=1)
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(
+            timestamp=(start + timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            sources={label: float(i % 7) - 3 for label in energy_sources},
+        )
+        for i in range(100)
+    ])
+
+    labels, datasets = DashboardService.get_dashboard_data(db_session, "1W", max_points=20)
+
+    assert len(labels) == 20
+    assert labels == sorted(labels)
+    assert all(len(dataset["data"]) == 20 for dataset in datasets)
+
+    # Power storage is still split into discharging and charging series
+    discharging, charging = datasets[-2:]
+    assert discharging["label"] == "power storage (discharging)"
+    assert all(value >= 0 for value in discharging["data"])
+    assert charging["label"] == "power storage (charging)"
+    assert all(value < 0 for value in charging["data"])
+
+
+def _hour(days_ago: int, hour: int) -> datetime:
+    return (datetime.now(UTC) - timedelta(days=days_ago)).replace(hour=hour, minute=0, second=0, microsecond=0)
+
+
+def test_get_dashboard_data_reads_rollups_for_long_spans(db_session: Session, seed_sources: None):
+    hours = [_hour(days_ago, hour) for days_ago in (3, 2, 1) for hour in (10, 11)]
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp=hour.isoformat(), sources={label: float(hour.hour) for label in energy_sources})
+        for hour in hours
+    ])
+
+    # 1W has 7 daily buckets, enough for 3 points, labelled with ERCOT's local midnight
+    labels, datasets = DashboardService.get_dashboard_data(db_session, "1W", max_points=3)
+    assert labels == [hour.astimezone(ERCOT_TZ).strftime("%Y-%m-%d 00:00:00%z") for hour in hours[::2]]
+    assert datasets[0]["data"] == [10.5] * 3
+
+    # ... but not for 6, so hourly buckets are used
+    labels, datasets = DashboardService.get_dashboard_data(db_session, "1W", max_points=6)
+    assert labels == [hour.astimezone(ERCOT_TZ).strftime(ERCOT_TIMESTAMP_FORMAT) for hour in hours]
+    assert datasets[0]["data"] == [10.0, 11.0] * 3
+
+    # ... and raw intervals, labelled as stored, when there are fewer stored hours than points
+    labels, datasets = DashboardService.get_dashboard_data(db_session, "1W", max_points=100)
+    assert labels == [hour.isoformat() for hour in hours]
+
+
+def test_rollup_buckets_ignore_the_timestamp_format(db_session: Session, seed_sources: None):
+    hour = _hour(1, 16)
+    create_gen_instances(db_session, [
+        # The same UTC hour as stored by ERCOT and by the ISO backfill
+        schema.GenInstantCreate(timestamp=hour.astimezone(timezone(timedelta(hours=-6))).strftime("%Y-%m-%d %H:%M:%S%z"),
+                                sources={label: 10.0 for label in energy_sources}),
+        schema.GenInstantCreate(timestamp=(hour + timedelta(minutes=5)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                sources={label: 20.0 for label in energy_sources}),
+    ])
+
+    labels, datasets = DashboardService.get_mix_columns(db_session, hour - timedelta(hours=1), hour + timedelta(hours=1),
+                                                        DashboardService.RESOLUTION_HOUR)
+    assert labels == [hour.astimezone(ERCOT_TZ).strftime(ERCOT_TIMESTAMP_FORMAT)]
+    assert datasets["wind"].tolist() == [15.0]
+
+    # Rollup buckets are labelled like the ERCOT intervals they start with
+    raw_labels, _ = DashboardService.get_mix_columns(db_session, hour, hour + timedelta(hours=1))
+    assert datetime.fromisoformat(raw_labels[0]) == datetime.fromisoformat(labels[0])
+
+
+def test_async_variants_match_sync(db_session: Session, seed_sources: None):
+    pytest.importorskip("aiosqlite")
+    hours = [_hour(days_ago, hour) for days_ago in (3, 2, 1) for hour in (10, 11)]
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp=hour.isoformat(), sources={label: float(hour.hour) for label in energy_sources})
+        for hour in hours
+    ])
+    start, end = hours[0], hours[-1]
+
+    async def query():
+        engine = create_async_engine(async_database_url(str(db_session.get_bind().url)))
+        try:
+            async with AsyncSession(engine) as db:
+                return (
+                    await DashboardService.get_dashboard_data_async(db, "1W", max_points=3),
+                    await DashboardService.get_dashboard_data_async(db, "1W", max_points=100),
+                    await DashboardService.get_generation_by_day_async(db, 7),
+                    await DashboardService.get_mix_columns_async(db, start, end, DashboardService.RESOLUTION_HOUR),
+                )
+        finally:
+            await engine.dispose()
+
+    daily, raw, by_day, (labels, columns) = asyncio.run(query())
+
+    assert daily == DashboardService.get_dashboard_data(db_session, "1W", max_points=3)
+    assert raw == DashboardService.get_dashboard_data(db_session, "1W", max_points=100)
+    assert by_day == DashboardService.get_generation_by_day(db_session, 7)
+    sync_labels, sync_columns = DashboardService.get_mix_columns(db_session, start, end, DashboardService.RESOLUTION_HOUR)
+    assert labels == sync_labels
+    assert all((columns[name] == sync_columns[name]).all() for name in columns)
+
+
+def test_build_datasets_orders_sources_and_splits_storage():
+    names = ["wind", "power_storage", "nuclear", "unknown"]
+    series = np.array([
+        [1.0, 2.0],
+        [5.0, -4.0],
+        [3.0, 3.0],
+        [9.0, 9.0],
+    ])
+
+    datasets = DashboardService._build_datasets(names, series)
+
+    assert [d["label"] for d in datasets] == [
+        "nuclear", "wind", "power storage (discharging)", "power storage (charging)", "unknown"
+    ]
+    assert datasets[0] == {"label": "nuclear", "data": [3.0, 3.0], "fill": True, "order": 0}
+    assert datasets[1]["fill"] == "-1"
+    assert datasets[2]["data"] == [5.0, 0.0]
+    assert datasets[3]["data"] == [-0.001, -4.0]
+    assert datasets[4]["order"] == 99
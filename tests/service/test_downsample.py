@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.service.downsample import bucket_means, lttb_indices
+
+
+def test_lttb_keeps_short_series():
+    assert lttb_indices(np.arange(10), 20).tolist() == list(range(10))
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    series = np.zeros((2, 1000))
+    series[0, 400] = 100.0
+    series[1, 700] = -50.0
+
+    indices = lttb_indices(series, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 400 in indices
+    assert 700 in indices
+
+
+def test_bucket_means():
+    series = np.array([[1.0, 3.0, 5.0, 7.0, 9.0, 11.0]])
+
+    starts, means = bucket_means(series, 3)
+
+    assert starts.tolist() == [0, 2, 4]
+    assert means.tolist() == [[2.0, 6.0, 10.0]]
@@ -0,0 +1,199 @@
+from datetime import datetime, UTC
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+import src.service.ercot
+from src.models.app_state import AppState
+from src.models.energy import energy_sources, GenInstant
+from src.service.coordination import ImagesVersion, LeaderLock
+from src.service.ercot import Ercot, render_archive, stored_chart
+from src.service.image_store import ImageStore
+from src.service.watermark import gen_watermark
+
+
+def _payload(*timestamps: str) -> list[tuple[str, dict]]:
+    return [(timestamp, {label: {"gen": 10.0} for label in energy_sources}) for timestamp in timestamps]
+
+
+@pytest.fixture
+def ercot_session(monkeypatch, engine, db_session: Session):
+    monkeypatch.setattr(src.service.ercot, "WriterSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    return db_session
+
+
+def test_process_gen_mixes_advances_watermark(ercot_session: Session):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600", "2026-01-02 00:00:00-0600"))
+
+    assert gen_watermark.get(ercot_session) == "2026-01-02 00:00:00-0600"
+    assert ercot_session.query(GenInstant).count() == 2
+
+
+def test_process_gen_mixes_only_builds_new_intervals(ercot_session: Session, monkeypatch):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600"))
+
+    received = []
+    original = src.service.ercot.insert_gen_instances
+    monkeypatch.setattr(
+        src.service.ercot, "insert_gen_instances",
+        lambda db, gen_instants: received.extend(gen_instants) or original(db, gen_instants),
+    )
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:50:00-0600", "2026-01-01 23:55:00-0600", "2026-01-02 00:00:00-0600"))
+
+    assert [gen_instant.timestamp for gen_instant in received] == ["2026-01-02 00:00:00-0600"]
+    assert ercot_session.query(GenInstant).count() == 2
+
+
+def test_watermark_is_read_back_from_db(ercot_session: Session):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600"))
+    gen_watermark.reset()
+
+    assert gen_watermark.get(ercot_session) == "2026-01-01 23:55:00-0600"
+
+
+class UnchangedFetcher:
+    def fetch_intervals(self):
+        return None
+
+
+def test_unchanged_payload_is_skipped(ercot_session: Session):
+    with Ercot(fetcher=UnchangedFetcher()) as ercot:
+        ercot.create_visualization()
+
+    assert ercot.mix == {}
+    assert ercot_session.query(GenInstant).count() == 0
+
+
+def test_process_gen_mixes_writes_in_batches(ercot_session: Session, monkeypatch):
+    batches = []
+    original = src.service.ercot.insert_gen_instances
+    monkeypatch.setattr(
+        src.service.ercot, "insert_gen_instances",
+        lambda db, gen_instants: batches.append(len(gen_instants)) or original(db, gen_instants),
+    )
+    monkeypatch.setattr(Ercot, "INGEST_BATCH_SIZE", 2)
+
+    Ercot()._process_gen_mixes(iter(_payload(*[f"2026-01-01 10:{minute:02d}:00-0600" for minute in range(0, 25, 5)])))
+
+    assert batches == [2, 2, 1]
+    assert ercot_session.query(GenInstant).count() == 5
+
+
+def test_process_gen_mixes_retries_intervals_of_a_failed_batch(ercot_session: Session, monkeypatch):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 09:55:00-0600"))
+    newer = [f"2026-01-01 11:{minute:02d}:00-0600" for minute in (0, 5)]
+    older = [f"2026-01-01 10:{minute:02d}:00-0600" for minute in (0, 5)]
+    original = src.service.ercot.insert_gen_instances
+
+    def fail_older(db, gen_instants):
+        if gen_instants[0].timestamp in older:
+            raise RuntimeError("database is locked")
+        return original(db, gen_instants)
+
+    monkeypatch.setattr(src.service.ercot, "insert_gen_instances", fail_older)
+    monkeypatch.setattr(Ercot, "INGEST_BATCH_SIZE", 2)
+
+    Ercot()._process_gen_mixes(_payload(*newer, *older))
+
+    assert gen_watermark.get(ercot_session) == "2026-01-01 09:55:00-0600"
+
+    monkeypatch.setattr(src.service.ercot, "insert_gen_instances", original)
+    Ercot()._process_gen_mixes(_payload(*newer, *older))
+
+    stored = set(ercot_session.scalars(select(GenInstant.timestamp)))
+    assert stored == {"2026-01-01 09:55:00-0600", *newer, *older}
+    assert gen_watermark.get(ercot_session) == newer[-1]
+
+
+def test_process_gen_mixes_renews_the_lock_after_each_batch(ercot_session: Session, monkeypatch):
+    lock = LeaderLock("ingest", owner="ingest")
+    assert lock.acquire(ercot_session)
+    renewals = []
+    original = lock.renew
+    monkeypatch.setattr(lock, "renew", lambda db: renewals.append(1) or original(db))
+    monkeypatch.setattr(Ercot, "INGEST_BATCH_SIZE", 2)
+
+    Ercot(lock=lock)._process_gen_mixes(_payload(*[f"2026-01-01 10:{minute:02d}:00-0600" for minute in range(0, 25, 5)]))
+
+    assert len(renewals) == 3
+
+
+def test_process_gen_mixes_returns_latest_interval(ercot_session: Session):
+    # 01:55 CDT is before 01:05 CST on the day daylight saving time ends
+    latest = Ercot()._process_gen_mixes(_payload("2026-11-01 01:05:00-0600", "2026-11-01 01:55:00-0500"))
+
+    assert latest[0] == "2026-11-01 01:05:00-0600"
+
+
+class RecordingRenderer:
+    def __init__(self):
+        self.charts = []
+
+    def render(self, chart):
+        self.charts.append(chart)
+        Path(chart.path).write_bytes(b"png")
+        return chart.path
+
+    def render_many(self, charts):
+        return [self.render(chart) for chart in charts]
+
+
+def test_render_archive_renders_stored_intervals(ercot_session: Session, tmp_path: Path):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600", "2026-01-02 00:00:00-0600"))
+    renderer = RecordingRenderer()
+    store = ImageStore(tmp_path)
+
+    paths = render_archive(
+        ercot_session, datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 3, tzinfo=UTC), renderer, store
+    )
+
+    assert paths == [str(tmp_path / "2026-01-01 23:55:00-0600.png"), str(tmp_path / "2026-01-02 00:00:00-0600.png")]
+    assert store.stats()["images"] == 2
+    assert renderer.charts[0].title.startswith("ERCOT Energy Mix | Jan 01, 2026 11:55 PM using 80.0 MW")
+    assert renderer.charts[0].values == [10.0] * len(energy_sources)
+
+
+def test_render_archive_skips_intervals_it_cannot_chart(ercot_session: Session, tmp_path: Path, monkeypatch):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600", "2026-01-02T06:05:00Z", "2026-01-02 00:10:00-0600"))
+    original = Ercot.from_gen_mix.__func__
+
+    def from_gen_mix(cls, mix, **kwargs):
+        if mix.timestamp == "2026-01-01 23:55:00-0600":
+            raise ValueError("broken interval")
+        return original(cls, mix, **kwargs)
+
+    monkeypatch.setattr(Ercot, "from_gen_mix", classmethod(from_gen_mix))
+
+    paths = render_archive(
+        ercot_session, datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 3, tzinfo=UTC), RecordingRenderer(),
+        ImageStore(tmp_path),
+    )
+
+    # The ISO-stamped interval is charted too
+    assert paths == [str(tmp_path / "2026-01-02T06:05:00Z.png"), str(tmp_path / "2026-01-02 00:10:00-0600.png")]
+
+
+def test_stored_chart_renders_once(ercot_session: Session, tmp_path: Path):
+    Ercot()._process_gen_mixes(_payload("2026-01-01 23:55:00-0600"))
+    renderer = RecordingRenderer()
+    store = ImageStore(tmp_path)
+
+    first = stored_chart(ercot_session, "2026-01-01 23:55:00-0600", store, renderer)
+    second = stored_chart(ercot_session, "2026-01-01 23:55:00-0600", store, renderer)
+
+    assert first == second
+    assert first.path == tmp_path / "2026-01-01 23:55:00-0600.png"
+    assert len(renderer.charts) == 1
+    assert stored_chart(ercot_session, "2026-01-02 00:00:00-0600", store, renderer) is None
+
+
+def test_create_visualization_bumps_images_version_after_writing(ercot_session: Session, tmp_path: Path):
+    store = ImageStore(tmp_path)
+    ercot = Ercot.from_interval("2026-01-01 23:55:00-0600", _payload("x")[0][1], renderer=RecordingRenderer(), store=store)
+
+    ercot.create_visualization()
+
+    assert (tmp_path / "2026-01-01 23:55:00-0600.png").is_file()
+    assert ercot_session.scalar(select(AppState.version).where(AppState.name == ImagesVersion.NAME)) == 1
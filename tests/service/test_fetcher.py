@@ -0,0 +1,144 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.service.fetcher import ErcotFetcher
+
+PAYLOAD = {"data": {"2026-01-01": {"2026-01-01 00:00:00-0600": {"Solar": {"gen": 1.0}}}}}
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Statuses to answer with before serving the payload, shared with the test
+    failures: list[int] = []
+    requests_seen: list[dict] = []
+    # Bytes of the body to send before closing the connection, None for all of it
+    truncate_at: int | None = None
+
+    def do_GET(self):
+        StubHandler.requests_seen.append(dict(self.headers))
+        if StubHandler.failures:
+            self.send_response(StubHandler.failures.pop(0))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(PAYLOAD).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body[:StubHandler.truncate_at])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.failures = []
+    StubHandler.requests_seen = []
+    StubHandler.truncate_at = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/fuel-mix.json"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_then_not_modified(stub_url):
+    fetcher = ErcotFetcher(stub_url)
+
+    assert fetcher.fetch() == PAYLOAD["data"]
+    assert fetcher.fetch() is None
+
+    assert StubHandler.requests_seen[1]["If-None-Match"] == ETAG
+    stats = fetcher.stats()
+    assert stats["requests"] == 2
+    assert stats["not_modified"] == 1
+    assert stats["bytes"] == len(json.dumps(PAYLOAD))
+
+
+def test_forget_downloads_again(stub_url):
+    fetcher = ErcotFetcher(stub_url)
+    fetcher.fetch()
+
+    fetcher.forget()
+
+    assert fetcher.fetch() == PAYLOAD["data"]
+
+
+def test_retries_transient_errors_with_backoff(stub_url):
+    StubHandler.failures = [503, 502]
+    delays = []
+    fetcher = ErcotFetcher(stub_url, backoff_seconds=1.0, sleep=delays.append)
+
+    assert fetcher.fetch() == PAYLOAD["data"]
+
+    assert len(delays) == 2
+    assert 0.5 <= delays[0] <= 1.0
+    assert 1.0 <= delays[1] <= 2.0
+    assert fetcher.stats()["retries"] == 2
+
+
+def test_gives_up_after_max_retries(stub_url):
+    StubHandler.failures = [503] * 3
+    fetcher = ErcotFetcher(stub_url, max_retries=2, sleep=lambda delay: None)
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch()
+
+    assert fetcher.stats()["failures"] == 1
+    assert len(StubHandler.requests_seen) == 3
+
+
+def test_client_errors_are_not_retried(stub_url):
+    StubHandler.failures = [404]
+    fetcher = ErcotFetcher(stub_url, sleep=lambda delay: pytest.fail("should not retry"))
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch()
+
+
+def test_fetch_intervals_streams_payload(stub_url):
+    fetcher = ErcotFetcher(stub_url)
+
+    intervals = list(fetcher.fetch_intervals())
+
+    assert intervals == [("2026-01-01 00:00:00-0600", {"Solar": {"gen": 1.0}})]
+    assert fetcher.stats()["bytes"] == len(json.dumps(PAYLOAD))
+    assert fetcher.fetch_intervals() is None
+
+
+def test_truncated_stream_downloads_again(stub_url):
+    fetcher = ErcotFetcher(stub_url)
+    StubHandler.truncate_at = len(json.dumps(PAYLOAD)) // 2
+
+    with pytest.raises(requests.RequestException):
+        list(fetcher.fetch_intervals())
+
+    StubHandler.truncate_at = None
+    assert fetcher.etag is None
+    assert list(fetcher.fetch_intervals()) == [("2026-01-01 00:00:00-0600", {"Solar": {"gen": 1.0}})]
+    assert "If-None-Match" not in StubHandler.requests_seen[-1]
+    assert fetcher.etag == ETAG
+
+
+def test_forget_while_streaming_is_kept(stub_url):
+    fetcher = ErcotFetcher(stub_url)
+
+    for _ in fetcher.fetch_intervals():
+        fetcher.forget()
+
+    assert fetcher.etag is None
+    assert fetcher.fetch_intervals() is not None
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from src.service.fuel_mix_stream import iter_intervals
+
+PAYLOAD = {
+    "lastUpdated": "2026-01-02 00:00:27-0600",
+    "monthlyCapacity": {"2026-01": [1, 2.5, -3e2]},
+    "data": {
+        "2026-01-01": {
+            "2026-01-01 23:55:00-0600": {"Coal and Lignite": {"gen": 7123.45}, "Solar": {"gen": 0}},
+        },
+        "2026-01-02": {
+            "2026-01-02 00:00:00-0600": {"Coal and Lignite": {"gen": 7100}, "Solar": {"gen": -1.5}},
+            "2026-01-02 00:05:00-0600": {"Coal and Lignite": {"gen": 7098.1}, "Solar": {"gen": 0.25}},
+        },
+    },
+    "isFinal": True,
+    "count": 12345,
+}
+
+
+def _expected():
+    return [(timestamp, mix) for day in PAYLOAD["data"].values() for timestamp, mix in day.items()]
+
+
+def _chunks(text: str, size: int):
+    encoded = text.encode()
+    return [encoded[i:i + size] for i in range(0, len(encoded), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_iter_intervals_matches_json_loads(size):
+    assert list(iter_intervals(_chunks(json.dumps(PAYLOAD), size))) == _expected()
+
+
+def test_iter_intervals_handles_whitespace_and_text_chunks():
+    text = json.dumps(PAYLOAD, indent=4)
+    assert list(iter_intervals(text[i:i + 5] for i in range(0, len(text), 5))) == _expected()
+
+
+def test_iter_intervals_splits_multibyte_characters():
+    payload = {"note": "Température ✓", "data": {"d": {"t": {"Solar": {"gen": 1}}}}}
+    assert list(iter_intervals(_chunks(json.dumps(payload, ensure_ascii=False), 1))) == [("t", {"Solar": {"gen": 1}})]
+
+
+def test_iter_intervals_empty_data():
+    assert list(iter_intervals([b'{"data": {}}'])) == []
+
+
+def test_iter_intervals_rejects_truncated_payload():
+    with pytest.raises(ValueError):
+        list(iter_intervals(_chunks(json.dumps(PAYLOAD)[:-40], 16)))
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from src.service.image_catalog import ImageCatalog
+from src.service.image_store import ImageStore
+
+
+def _catalog(tmp_path: Path, *names: str) -> ImageCatalog:
+    for name in names:
+        (tmp_path / name).touch()
+    return ImageCatalog(tmp_path)
+
+
+def test_builds_from_directory(tmp_path: Path):
+    (tmp_path / "notes.txt").touch()
+    (tmp_path / ".partial").mkdir()
+    catalog = _catalog(tmp_path, "b.png", "a.jpg", "c.jpeg")
+
+    assert catalog.count() == 3
+    assert catalog.page(1, 10, descending=False) == ["a.jpg", "b.png", "c.jpeg"]
+
+
+def test_pages_and_cursors(tmp_path: Path):
+    catalog = _catalog(tmp_path, *[f"{i}.png" for i in range(5)])
+
+    assert catalog.page(1, 2) == ["4.png", "3.png"]
+    assert catalog.page(3, 2) == ["0.png"]
+    assert catalog.page(4, 2) == []
+    assert catalog.page(2, 2, descending=False) == ["2.png", "3.png"]
+    assert catalog.after("3.png", 2) == ["2.png", "1.png"]
+    assert catalog.after("3.png", 2, descending=False) == ["4.png"]
+
+
+def test_add_and_remove_track_count_and_version(tmp_path: Path):
+    catalog = _catalog(tmp_path, "a.png")
+    catalog.count()
+    version = catalog.version
+
+    catalog.add("b.png")
+    catalog.add("b.png")
+    catalog.add("ignored.txt")
+    catalog.remove("a.png")
+
+    assert catalog.page(1, 10) == ["b.png"]
+    assert catalog.version == version + 2
+
+
+def test_signature_identifies_the_listing(tmp_path: Path):
+    catalog = _catalog(tmp_path, "a.png", "b.png", "c.png")
+    signature = catalog.signature()
+
+    assert signature.startswith("3:")
+    assert _catalog(tmp_path).signature() == signature  # another process, same directory
+
+    # Evicting one name from the middle and rendering another keeps count, first and last
+    catalog.remove("b.png")
+    catalog.add("bb.png")
+    assert catalog.signature() != signature
+    catalog.remove("bb.png")
+    catalog.add("b.png")
+    assert catalog.signature() == signature
+
+
+def test_store_updates_catalog(tmp_path: Path):
+    catalog = ImageCatalog(tmp_path)
+    store = ImageStore(tmp_path, max_bytes=4, catalog=catalog)
+
+    store.get_or_render("a.png", "a", lambda path: path.write_bytes(b"aaaa"))
+    store.get_or_render("b.png", "b", lambda path: path.write_bytes(b"bbbb"))
+
+    assert catalog.page(1, 10) == ["b.png"]
@@ -0,0 +1,97 @@
+import threading
+import time
+from pathlib import Path
+
+from src.service.image_store import ImageStore
+
+
+def _writer(content: bytes, calls: list | None = None, delay: float = 0.0):
+    def render(path: Path) -> None:
+        if calls is not None:
+            calls.append(path)
+        time.sleep(delay)
+        path.write_bytes(content)
+    return render
+
+
+def test_renders_once_then_hits(tmp_path: Path):
+    store = ImageStore(tmp_path)
+    calls = []
+
+    first = store.get_or_render("a.png", "d1", _writer(b"aaaa", calls))
+    second = store.get_or_render("a.png", "d1", _writer(b"aaaa", calls))
+
+    assert first == second
+    assert first.path.read_bytes() == b"aaaa"
+    assert len(calls) == 1
+    assert store.stats()["hits"] == 1
+    assert not any((tmp_path / ".partial").iterdir())
+
+
+def test_changed_digest_renders_again(tmp_path: Path):
+    store = ImageStore(tmp_path)
+    store.get_or_render("a.png", "d1", _writer(b"old"))
+
+    image = store.get_or_render("a.png", "d2", _writer(b"new!"))
+
+    assert image.digest == "d2"
+    assert image.path.read_bytes() == b"new!"
+    assert store.stats()["bytes"] == 4
+
+
+def test_concurrent_requests_share_one_render(tmp_path: Path):
+    store = ImageStore(tmp_path)
+    calls = []
+    results = []
+
+    def request():
+        results.append(store.get_or_render("a.png", "d1", _writer(b"aaaa", calls, delay=0.2)))
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+    assert store.stats()["coalesced"] == 4
+
+
+def test_evicts_least_recently_used(tmp_path: Path):
+    store = ImageStore(tmp_path, max_bytes=10)
+    store.get_or_render("a.png", "a", _writer(b"aaaa"))
+    store.get_or_render("b.png", "b", _writer(b"bbbb"))
+    store.get_or_render("a.png", "a", _writer(b"aaaa"))  # "b" is now least recently used
+
+    store.get_or_render("c.png", "c", _writer(b"cccc"))
+
+    assert sorted(path.name for path in tmp_path.glob("*.png")) == ["a.png", "c.png"]
+    assert store.stats()["bytes"] == 8
+    assert store.stats()["evictions"] == 1
+
+
+def test_digests_survive_a_restart(tmp_path: Path):
+    ImageStore(tmp_path).get_or_render("a.png", "d1", _writer(b"aaaa"))
+    store = ImageStore(tmp_path)
+    calls = []
+
+    image = store.get_or_render("a.png", "d1", _writer(b"never", calls))
+
+    assert image.path.read_bytes() == b"aaaa"
+    assert calls == []
+    assert store.stats()["bytes"] == 4
+
+    # ... and a changed digest still renders again
+    assert store.get_or_render("a.png", "d2", _writer(b"new!")).path.read_bytes() == b"new!"
+
+
+def test_files_without_digest_are_rendered_again(tmp_path: Path):
+    (tmp_path / "a.png").write_bytes(b"old")
+    store = ImageStore(tmp_path)
+
+    image = store.get_or_render("a.png", "d1", _writer(b"aaaa"))
+
+    assert image.path.read_bytes() == b"aaaa"
+    assert store.stats()["bytes"] == 4
+    assert ImageStore(tmp_path).get_or_render("a.png", "d1", _writer(b"never")).path.read_bytes() == b"aaaa"
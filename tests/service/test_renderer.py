@@ -0,0 +1,104 @@
+import os
+import signal
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from src.service.renderer import ChartRenderer, MAX_IN_FLIGHT, PieChart, draw
+
+
+def _chart(path: Path, title: str = "ERCOT Energy Mix") -> PieChart:
+    return PieChart(str(path), title, [10.0, 5.0, -1.0], ["Coal: 66.7%", "Solar: 33.3%", "Storage: 0.0%"], [0.1, 0, 0])
+
+
+def test_draw_reuses_the_figure(tmp_path: Path):
+    draw(_chart(tmp_path / "first.png", "first"))
+    draw(_chart(tmp_path / "second.png", "second"))
+
+    from src.service import renderer
+    assert len(renderer._figure.axes) == 1
+    assert renderer._axes.get_title() == "second"
+    assert (tmp_path / "second.png").read_bytes().startswith(b"\x89PNG")
+
+
+@pytest.fixture
+def chart_renderer():
+    renderer = ChartRenderer()
+    try:
+        yield renderer
+    finally:
+        renderer.close()
+
+
+def test_renders_in_worker_process(tmp_path: Path, chart_renderer: ChartRenderer):
+    assert chart_renderer.render(_chart(tmp_path / "one.png")) == str(tmp_path / "one.png")
+    rendered = chart_renderer.render_many([_chart(tmp_path / f"{i}.png") for i in range(3)])
+
+    assert rendered == [str(tmp_path / f"{i}.png") for i in range(3)]
+    assert all(Path(path).stat().st_size > 0 for path in rendered)
+    stats = chart_renderer.stats()
+    assert stats["renders"] == 4
+    assert stats["failures"] == 0
+    assert 0 < stats["avg_ms"] <= stats["max_ms"]
+
+
+def test_render_many_skips_failures(tmp_path: Path, chart_renderer: ChartRenderer):
+    rendered = chart_renderer.render_many([_chart(tmp_path / "missing" / "a.png"), _chart(tmp_path / "b.png")])
+
+    assert rendered == [str(tmp_path / "b.png")]
+    assert chart_renderer.stats()["failures"] == 1
+
+
+def _kill_worker(renderer: ChartRenderer) -> None:
+    for pid in list(renderer._executor()._processes):
+        os.kill(pid, signal.SIGKILL)
+
+
+def test_renderer_recovers_from_a_worker_crash(tmp_path: Path, chart_renderer: ChartRenderer):
+    chart_renderer.render(_chart(tmp_path / "before.png"))
+    _kill_worker(chart_renderer)
+
+    with pytest.raises(BrokenProcessPool):
+        chart_renderer.render(_chart(tmp_path / "crashed.png"))
+
+    assert chart_renderer.render(_chart(tmp_path / "after.png")) == str(tmp_path / "after.png")
+    # A crash during a batch fails at most the charts in flight
+    _kill_worker(chart_renderer)
+    charts = [_chart(tmp_path / f"{i}.png") for i in range(MAX_IN_FLIGHT + 2)]
+    rendered = chart_renderer.render_many(charts)
+    assert rendered[-2:] == [chart.path for chart in charts[-2:]]
+    assert chart_renderer.stats()["failures"] == 1 + len(charts) - len(rendered)
+
+
+class CountingExecutor:
+    """Runs nothing; records the most charts submitted but not yet collected."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit(self, fn, chart):
+        executor = self
+
+        class Collected(Future):
+            def result(self, timeout=None):
+                executor.in_flight -= 1
+                return super().result(timeout)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        future = Collected()
+        future.set_result(0.001)
+        return future
+
+
+def test_render_many_bounds_charts_in_flight(tmp_path: Path, chart_renderer: ChartRenderer, monkeypatch):
+    executor = CountingExecutor()
+    monkeypatch.setattr(chart_renderer, "_executor", lambda: executor)
+
+    rendered = chart_renderer.render_many(_chart(tmp_path / f"{i}.png") for i in range(10))
+
+    assert rendered == [str(tmp_path / f"{i}.png") for i in range(10)]
+    assert executor.max_in_flight == MAX_IN_FLIGHT
@@ -0,0 +1,61 @@
+from src.service.response_cache import ResponseCache
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    key = cache.key("dashboard", days=5)
+    assert cache.get_or_compute(key, compute) == "value"
+    assert cache.get_or_compute(key, compute) == "value"
+
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_ignores_param_order():
+    assert ResponseCache.key("images", page=1, sort="desc") == ResponseCache.key("images", sort="desc", page=1)
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)  # "b" is now least recently used
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.stats()["size"] == 2
+    assert cache.get_or_compute("a", lambda: -1) == 1
+    assert cache.get_or_compute("b", lambda: -2) == -2
+
+
+def test_invalidate_drops_entries():
+    cache = ResponseCache()
+    cache.get_or_compute("a", lambda: 1)
+    cache.invalidate()
+
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    assert cache.stats()["generation"] == 1
+
+
+def test_value_computed_across_invalidate_is_not_stored():
+    cache = ResponseCache()
+
+    def compute():
+        cache.invalidate()  # e.g. an ingest finishing while the page is being built
+        return "stale"
+
+    assert cache.get_or_compute("a", compute) == "stale"
+    assert cache.stats()["size"] == 0
+
+
+def test_entries_expire():
+    cache = ResponseCache(ttl_seconds=0)
+    cache.get_or_compute("a", lambda: 1)
+
+    assert cache.get_or_compute("a", lambda: 2) == 2
@@ -0,0 +1,118 @@
+import base64
+from datetime import datetime, timedelta, UTC
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+import src.router
+from src.db.database import async_database_url
+from src.models.energy import SOURCE_NAMES
+from src.schema import schema
+from src.service.db.gen_instant import create_gen_instances
+from src.service.response_cache import response_cache
+
+
+@pytest.fixture
+def client(db_session: Session, seed_sources: None):
+    now = datetime.now(UTC).replace(microsecond=0)
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(
+            timestamp=(now - timedelta(minutes=5 * i)).isoformat(),
+            sources={"Solar": float(i), "Wind": 10.0 + i, "Nuclear": 5.0},
+        )
+        for i in range(3)
+    ])
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        yield TestClient(src.router.app)
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_mix_returns_columns(client: TestClient):
+    response = client.get("/api/v1/mix")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resolution"] == "raw"
+    assert len(body["timestamps"]) == 3
+    assert set(body["sources"]) == set(SOURCE_NAMES)
+    assert body["sources"]["solar"] == [2.0, 1.0, 0.0]
+    assert body["sources"]["nuclear"] == [5.0, 5.0, 5.0]
+
+
+def test_mix_float32_encoding_matches_json(client: TestClient):
+    plain = client.get("/api/v1/mix").json()
+    packed = client.get("/api/v1/mix", params={"encoding": "float32"}).json()
+
+    assert packed["timestamps"] == plain["timestamps"]
+    for name in SOURCE_NAMES:
+        decoded = np.frombuffer(base64.b64decode(packed["sources"][name]), dtype="<f4")
+        np.testing.assert_allclose(decoded, plain["sources"][name])
+
+
+def test_mix_daily_resolution_averages(client: TestClient):
+    body = client.get("/api/v1/mix", params={"resolution": "day", "start": "2000-01-01T00:00:00"}).json()
+
+    assert body["resolution"] == "day"
+    assert len(body["sources"]["wind"]) == len(body["timestamps"])
+    # Each day's value is the average of that day's intervals
+    assert all(10.0 <= value <= 12.0 for value in body["sources"]["wind"])
+
+
+def test_mix_rejects_unknown_resolution(client: TestClient):
+    assert client.get("/api/v1/mix", params={"resolution": "minute"}).status_code == 422
+
+
+def test_daily_returns_columns(client: TestClient):
+    response = client.get("/api/v1/daily", params={"days": 7})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["dates"]) in (1, 2)
+    assert len(body["total_gen"]) == len(body["dates"])
+    assert sum(body["sources"]["nuclear"]) == 15.0
+
+
+def test_api_answers_revalidation(client: TestClient):
+    first = client.get("/api/v1/daily")
+
+    second = client.get("/api/v1/daily", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+
+
+def test_mix_answers_revalidation_of_the_default_window(client: TestClient):
+    first = client.get("/api/v1/mix")
+    hits = response_cache.hits
+
+    second = client.get("/api/v1/mix")
+    third = client.get("/api/v1/mix", headers={"If-None-Match": first.headers["ETag"]})
+
+    # "The last day" keys on the watermark, not on the moment of the request
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert response_cache.hits == hits + 1
+    assert third.status_code == 304
+
+
+def test_api_serves_from_async_session(client: TestClient, db_session: Session):
+    pytest.importorskip("aiosqlite")
+    # NullPool: each request of the TestClient runs on its own event loop
+    engine = create_async_engine(async_database_url(str(db_session.get_bind().url)), poolclass=NullPool)
+
+    async def async_db():
+        async with AsyncSession(engine) as db:
+            yield db
+
+    plain = {path: client.get(path).json() for path in ("/api/v1/mix", "/api/v1/daily")}
+    response_cache.clear()
+    src.router.app.dependency_overrides[src.router.get_request_db] = async_db
+
+    for path, body in plain.items():
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.json() == body
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.backfill import CHECKPOINT_FILE_NAME, backfill, parse_file
+from src.models.energy import GenInstant, GenMix, energy_sources
+
+
+def _write_json(path: Path, *timestamps: str) -> None:
+    data = {}
+    for timestamp in timestamps:
+        data.setdefault(timestamp[:10], {})[timestamp] = {label: {"gen": 10.0} for label in energy_sources}
+    path.write_text(json.dumps({"lastUpdated": timestamps[-1], "data": data}))
+
+
+@pytest.fixture
+def session_factory(engine, db_session: Session):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_parse_csv_accepts_labels_and_names(tmp_path: Path):
+    path = tmp_path / "mix.csv"
+    path.write_text("timestamp,coal,Solar\n2026-01-01 00:00:00-0600,1.5,2\n")
+
+    [gen_instant] = parse_file(path)
+
+    assert gen_instant.timestamp == "2026-01-01 00:00:00-0600"
+    assert gen_instant.sources == {"Coal and Lignite": 1.5, "Solar": 2.0}
+
+
+def test_parse_csv_rejects_unknown_sources(tmp_path: Path):
+    path = tmp_path / "mix.csv"
+    path.write_text("timestamp,peat\n2026-01-01 00:00:00-0600,1\n")
+
+    with pytest.raises(ValueError):
+        parse_file(path)
+
+
+def test_parse_csv_stores_timestamps_in_ercot_format(tmp_path: Path):
+    path = tmp_path / "mix.csv"
+    path.write_text("timestamp,coal\n2026-01-01 00:00:00-0600,1\n2026-01-01T06:05:00Z,1\n2026-07-01T05:10:00+00:00,1\n")
+
+    assert [gen_instant.timestamp for gen_instant in parse_file(path)] == [
+        "2026-01-01 00:00:00-0600", "2026-01-01 00:05:00-0600", "2026-07-01 00:10:00-0500",
+    ]
+
+    path.write_text("timestamp,coal\n2026-01-01 00:00:00,1\n")
+    with pytest.raises(ValueError):
+        parse_file(path)
+
+
+def test_backfill_dedupes_instants_stored_in_other_formats(tmp_path: Path, db_session: Session, session_factory):
+    (tmp_path / "mixed.csv").write_text(
+        "timestamp,coal\n2026-01-01 00:00:00-0600,1\n2026-01-01T06:00:00Z,1\n2026-01-01T06:05:00.000+00:00,1\n"
+    )
+
+    totals = backfill(tmp_path, workers=1, session_factory=session_factory)
+
+    assert totals["created"] == 2
+    assert sorted(mix.timestamp for mix in db_session.query(GenMix)) == [
+        "2026-01-01 00:00:00-0600", "2026-01-01 00:05:00-0600",
+    ]
+
+
+def test_backfill_loads_in_chunks_and_resumes(tmp_path: Path, db_session: Session, session_factory):
+    _write_json(tmp_path / "2026-01-01.json", "2026-01-01 00:00:00-0600", "2026-01-01 00:05:00-0600",
+                "2026-01-01 00:10:00-0600")
+    (tmp_path / "2026-01-02.csv").write_text(
+        "timestamp,coal,solar\n2026-01-02 00:00:00-0600,1,2\n2026-01-01 00:10:00-0600,1,2\n"
+    )
+
+    totals = backfill(tmp_path, workers=2, chunk_size=2, session_factory=session_factory)
+
+    assert totals["files"] == 2
+    assert totals["parsed"] == 5
+    assert totals["created"] == 4
+    assert db_session.query(GenInstant).count() == 4
+    assert db_session.query(GenMix).count() == 4
+    assert json.loads((tmp_path / CHECKPOINT_FILE_NAME).read_text())["done"] == ["2026-01-01.json", "2026-01-02.csv"]
+
+    _write_json(tmp_path / "2026-01-03.json", "2026-01-03 00:00:00-0600")
+    totals = backfill(tmp_path, workers=1, session_factory=session_factory)
+
+    assert totals["files"] == 1
+    assert db_session.query(GenInstant).count() == 5
@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+import src.main
+from src.service.coordination import LeaderLock
+
+
+class FailingErcot:
+    """Stands in for Ercot; entering it fails like an unreachable ERCOT API."""
+
+    instances = 0
+
+    def __init__(self, **kwargs):
+        FailingErcot.instances += 1
+
+    def __enter__(self):
+        raise ConnectionError("ERCOT is down")
+
+    def __exit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def lock(monkeypatch, db_session: Session) -> LeaderLock:
+    @contextmanager
+    def writer_db_context():
+        yield db_session
+
+    lock = LeaderLock("ingest", owner="this-process")
+    monkeypatch.setattr(src.main, "get_writer_db_context", writer_db_context)
+    monkeypatch.setattr(src.main, "ingest_lock", lock)
+    monkeypatch.setattr(src.main, "Ercot", FailingErcot)
+    FailingErcot.instances = 0
+    return lock
+
+
+def test_run_skips_while_another_process_holds_the_lock(lock: LeaderLock, db_session: Session):
+    assert LeaderLock("ingest", owner="other-process").acquire(db_session)
+
+    src.main.run()
+
+    assert FailingErcot.instances == 0
+
+
+def test_run_releases_the_lock_when_the_ingest_fails(lock: LeaderLock, db_session: Session):
+    src.main.run()
+
+    assert FailingErcot.instances == 1
+    assert LeaderLock("ingest", owner="other-process").acquire(db_session)
+
+
+def test_run_once_per_cycle(lock: LeaderLock, db_session: Session):
+    src.main.run(cycle=7)
+    # Another process's scheduler, firing after the first run released the lock
+    other = LeaderLock("ingest", owner="other-process")
+    assert not other.acquire(db_session, cycle=7)
+
+    src.main.run(cycle=7)
+    assert FailingErcot.instances == 1
+
+    src.main.run(cycle=8)
+    assert FailingErcot.instances == 2
+
+
+def test_ensure_app_state_creates_the_lock_table(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    @contextmanager
+    def writer_db_context():
+        with Session(engine) as db:
+            yield db
+
+    monkeypatch.setattr(src.main, "get_writer_db_context", writer_db_context)
+    try:
+        src.main._ensure_app_state()
+
+        assert "app_state" in inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
@@ -0,0 +1,128 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import src.router
+from src.db.database import Base
+from src.metrics import (
+    CONTENT_TYPE, Histogram, Registry, db_queries, db_queries_per_request, http_requests, ingest_duplicates, ingest_rows,
+    instrument_engine, registry, start_metrics_server,
+)
+from src.schema import schema
+from src.service.coordination import data_version
+from src.service.db.gen_instant import create_gen_instances
+from src.service.response_cache import response_cache
+from src.service.watermark import gen_watermark
+
+
+def test_counter_renders_labelled_samples():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind='b"c')
+
+    assert registry.render() == (
+        "# HELP jobs_total Jobs.\n"
+        "# TYPE jobs_total counter\n"
+        'jobs_total{kind="a"} 1\n'
+        'jobs_total{kind="b\\"c"} 2\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("wait_seconds", "Wait.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.samples() == [
+        'wait_seconds_bucket{le="0.1"} 2',
+        'wait_seconds_bucket{le="1"} 3',
+        'wait_seconds_bucket{le="+Inf"} 4',
+        "wait_seconds_sum 3.65",
+        "wait_seconds_count 4",
+    ]
+
+
+def test_registry_exposes_numeric_stats_as_gauges():
+    registry = Registry()
+    registry.register_stats("cache", lambda: {"hits": 3, "ratio": 0.5, "enabled": True, "name": "x"})
+
+    assert registry.render() == "# TYPE cache_hits gauge\ncache_hits 3\n# TYPE cache_ratio gauge\ncache_ratio 0.5\n"
+
+
+def test_instrumented_engine_counts_statements():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    before = db_queries.value()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+
+    assert db_queries.value() == before + 2
+
+
+def test_ingest_counts_rows_and_duplicates(db_session: Session, seed_sources: None):
+    rows, duplicates = ingest_rows.value(), ingest_duplicates.value()
+    gen_instant = schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources={"Solar": 1.0})
+
+    create_gen_instances(db_session, [gen_instant])
+    create_gen_instances(db_session, [gen_instant])
+
+    assert ingest_rows.value() == rows + 1
+    assert ingest_duplicates.value() == duplicates + 1
+
+
+def test_metrics_endpoint_reports_requests_by_route():
+    client = TestClient(src.router.app)
+    before = http_requests.value(route="/health", method="GET", status=200)
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert http_requests.value(route="/health", method="GET", status=200) == before + 1
+    assert 'http_request_duration_seconds_count{route="/health"}' in response.text
+    assert db_queries_per_request.count(route="/health") >= 1
+    assert "response_cache_hits " in response.text
+
+
+def test_db_usage_is_attributed_to_the_request(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: Session(engine)
+    requests, queries = db_queries_per_request.count(route="/api/v1/daily"), db_queries_per_request.sum(route="/api/v1/daily")
+    try:
+        TestClient(src.router.app).get("/api/v1/daily")
+    finally:
+        src.router.app.dependency_overrides.clear()
+        response_cache.clear()
+        gen_watermark.reset()
+        data_version.reset()
+        engine.dispose()
+
+    # The handler's queries run in the threadpool and are still counted for the request
+    assert db_queries_per_request.count(route="/api/v1/daily") == requests + 1
+    assert db_queries_per_request.sum(route="/api/v1/daily") > queries
+    assert 'http_request_db_queries_bucket{route="/api/v1/daily",le="0"}' in registry.render()
+
+
+def test_metrics_server_serves_the_registry():
+    server = start_metrics_server(port=0, host="127.0.0.1")
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{base}/metrics") as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "# TYPE ingest_rows_total counter" in response.read().decode()
+        with pytest.raises(HTTPError) as missing:
+            urlopen(f"{base}/other")
+        assert missing.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
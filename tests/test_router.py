@@ -1,7 +1,28 @@
+from datetime import datetime, UTC
+from pathlib import Path
+
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 import src.router
+import src.service.ercot
+from src.schema import schema
+from src.service.db.gen_instant import create_gen_instances
+from src.service.image_catalog import ImageCatalog
+from src.service.image_store import ImageStore
+from src.service.response_cache import response_cache
+
+
+@pytest.fixture
+def images_client(monkeypatch, tmp_path, db_session: Session):
+    """Client listing an image catalog of ``tmp_path``, which is scanned on the first request."""
+    monkeypatch.setattr(src.router, "image_catalog", ImageCatalog(tmp_path))
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        yield TestClient(src.router.app)
+    finally:
+        src.router.app.dependency_overrides.clear()
 
 
 class FakeOutDir:
@@ -12,26 +33,20 @@ class FakeOutDir:
         return self._entries
 
 
-def test_list_images_with_no_files(monkeypatch, tmp_path):
-    monkeypatch.setattr(src.router, "OUT_DIR", tmp_path)
-
-    client = TestClient(src.router.app)
-    response = client.get("/images")
+def test_list_images_with_no_files(images_client: TestClient, tmp_path):
+    response = images_client.get("/images")
 
     assert response.status_code == 200
     assert '<a href="/" class="nav-brand">🔌 ERCOT</a>' in response.text
 
 
-def test_list_images_with_files(monkeypatch, tmp_path):
+def test_list_images_with_files(images_client: TestClient, tmp_path):
     # Create real files in tmp_path
     (tmp_path / "image1.png").touch()
     (tmp_path / "image2.jpg").touch()
     (tmp_path / "image3.jpeg").touch()
 
-    monkeypatch.setattr(src.router, "OUT_DIR", tmp_path)
-
-    client = TestClient(src.router.app)
-    response = client.get("/images")
+    response = images_client.get("/images")
 
     assert response.status_code == 200
     assert '/images/image1.png' in response.text
@@ -39,16 +54,13 @@ def test_list_images_with_files(monkeypatch, tmp_path):
     assert '/images/image3.jpeg' in response.text
 
 
-def test_list_images_sorts_files_in_reverse_order(monkeypatch, tmp_path):
+def test_list_images_sorts_files_in_reverse_order(images_client: TestClient, tmp_path):
     # Create files in an order that isn't reverse-sorted
     (tmp_path / "image2.jpg").touch()
     (tmp_path / "image3.png").touch()
     (tmp_path / "image1.jpeg").touch()
 
-    monkeypatch.setattr(src.router, "OUT_DIR", tmp_path)
-
-    client = TestClient(src.router.app)
-    response = client.get("/images")
+    response = images_client.get("/images")
 
     assert response.status_code == 200
 
@@ -76,3 +88,186 @@ def test_dashboard(db_session: Session):
     finally:
         # Clean up overrides to avoid affecting other tests
         src.router.app.dependency_overrides.clear()
+
+
+def test_dashboard_is_served_from_cache(db_session: Session):
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+
+    try:
+        client = TestClient(src.router.app)
+        client.get("/dashboard?timespan=1W")
+        misses = response_cache.stats()["misses"]
+
+        # 7D normalizes to the same entry as 1W
+        response = client.get("/dashboard?timespan=7D")
+        assert response.status_code == 200
+        assert response_cache.stats()["misses"] == misses
+        assert response_cache.stats()["hits"] == 1
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_dashboard_rejects_points_outside_downsampling_range(db_session: Session):
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        client = TestClient(src.router.app)
+        # Fewer than 3 points would skip downsampling and serve every raw interval
+        for points in (0, 2, -5, 1001):
+            assert client.get(f"/dashboard?points={points}").status_code == 422
+        assert client.get("/dashboard?points=3").status_code == 200
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_dashboard_answers_revalidation(db_session: Session, seed_sources: None, seed_gen_instants: None):
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+
+    try:
+        client = TestClient(src.router.app)
+        response = client.get("/dashboard")
+        etag = response.headers["etag"]
+        assert "last-modified" in response.headers
+
+        response = client.get("/dashboard", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+        response = client.get("/dashboard", headers={"If-Modified-Since": response.headers["last-modified"]})
+        assert response.status_code == 304
+
+        # Different params, different validator
+        response = client.get("/dashboard?timespan=1M", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+        # A new ingest changes the validator
+        create_gen_instances(db_session, [
+            schema.GenInstantCreate(timestamp=datetime.now(UTC).isoformat(), sources={"Solar": 1.0}),
+        ])
+        response = client.get("/dashboard", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_list_images_answers_revalidation(images_client: TestClient, tmp_path):
+    (tmp_path / "image1.png").touch()
+    etag = images_client.get("/images").headers["etag"]
+
+    assert images_client.get("/images", headers={"If-None-Match": etag}).status_code == 304
+    assert images_client.get("/images?page=2", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_images_etag_is_shared_by_processes(images_client: TestClient, monkeypatch, tmp_path):
+    (tmp_path / "image1.png").touch()
+    etag = images_client.get("/images").headers["etag"]
+
+    # Another web process, whose catalog went through more versions
+    other = ImageCatalog(tmp_path)
+    other.add("image2.png")
+    other.remove("image2.png")
+    monkeypatch.setattr(src.router, "image_catalog", other)
+
+    assert images_client.get("/images", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_static_images_answer_revalidation(monkeypatch, tmp_path):
+    (tmp_path / "image1.jpg").write_bytes(b"jpeg")
+    monkeypatch.setattr(src.router.images_static, "all_directories", [str(tmp_path)])
+    client = TestClient(src.router.app)
+
+    response = client.get("/images/image1.jpg")
+    assert response.status_code == 200
+    assert "last-modified" in response.headers
+
+    response = client.get("/images/image1.jpg", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_hidden_files_in_out_are_not_served(monkeypatch, tmp_path, db_session: Session):
+    (tmp_path / ".digests").mkdir()
+    (tmp_path / ".digests" / "image1.png").write_text("digest")
+    (tmp_path / ".hidden.png").write_bytes(b"hidden")
+    monkeypatch.setattr(src.router, "OUT_DIR", tmp_path)
+    monkeypatch.setattr(src.router.images_static, "all_directories", [str(tmp_path)])
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        client = TestClient(src.router.app)
+
+        assert client.get("/images/.digests/image1.png").status_code == 404
+        assert client.get("/images/.hidden.png").status_code == 404
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.charts = []
+
+    def render(self, chart):
+        self.charts.append(chart)
+        Path(chart.path).write_bytes(b"\x89PNG chart")
+        return chart.path
+
+
+def test_image_is_rendered_on_demand(monkeypatch, tmp_path, db_session: Session, seed_sources: None):
+    renderer = FakeRenderer()
+    monkeypatch.setattr(src.service.ercot, "image_store", ImageStore(tmp_path))
+    monkeypatch.setattr(src.service.ercot, "chart_renderer", renderer)
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp="2026-01-01 00:00:00-0600", sources={"Solar": 1.0, "Wind": 2.0}),
+    ])
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        client = TestClient(src.router.app)
+        response = client.get("/images/2026-01-01 00:00:00-0600.png")
+
+        assert response.status_code == 200
+        assert response.content == b"\x89PNG chart"
+        assert response.headers["content-type"] == "image/png"
+
+        revalidated = client.get("/images/2026-01-01 00:00:00-0600.png", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert len(renderer.charts) == 1
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_image_of_an_iso_stamped_interval(monkeypatch, tmp_path, db_session: Session, seed_sources: None):
+    renderer = FakeRenderer()
+    monkeypatch.setattr(src.service.ercot, "image_store", ImageStore(tmp_path))
+    monkeypatch.setattr(src.service.ercot, "chart_renderer", renderer)
+    create_gen_instances(db_session, [
+        schema.GenInstantCreate(timestamp="2026-02-22T00:55:00Z", sources={"Solar": 1.0, "Wind": 2.0}),
+    ])
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        response = TestClient(src.router.app).get("/images/2026-02-22T00:55:00Z.png")
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    # Titled in ERCOT's local time, like the intervals ERCOT reports
+    assert "Feb 21, 2026 06:55 PM" in renderer.charts[0].title
+
+
+def test_image_without_interval_is_served_from_out(monkeypatch, tmp_path, db_session: Session):
+    (tmp_path / "image1.png").write_bytes(b"legacy")
+    monkeypatch.setattr(src.router, "OUT_DIR", tmp_path)
+    src.router.app.dependency_overrides[src.router.get_db] = lambda: db_session
+    try:
+        client = TestClient(src.router.app)
+
+        assert client.get("/images/image1.png").content == b"legacy"
+        assert client.get("/images/missing.png").status_code == 404
+    finally:
+        src.router.app.dependency_overrides.clear()
+
+
+def test_list_images_continues_from_cursor(images_client: TestClient, tmp_path):
+    for name in ("image1.png", "image2.png", "image3.png"):
+        (tmp_path / name).touch()
+    response = images_client.get("/images?after=image3.png&page_size=1")
+
+    assert '/images/image2.png' in response.text
+    assert '/images/image1.png' not in response.text